@@ -5,4 +5,5 @@
 """Common data, functions and classes."""
 
 from .utils_os import get_app_dir, get_res_dir, img, run_cmd, realpath   # noqa
+from .utils_os import write_atomic                                       # noqa
 from .config import ConfigHelper, SimpleConfig                           # noqa
@@ -6,10 +6,12 @@
 
 import os
 import sys
+import tempfile
 from shutil import rmtree
 import unittest
 
-from ligm.core.common import get_app_dir, img, run_cmd, realpath, get_res_dir
+from ligm.core.common import (get_app_dir, img, run_cmd, realpath, get_res_dir,
+                              write_atomic)
 from ligm.core.qt import QTestHelper
 
 
@@ -100,3 +102,23 @@ class UtilsOSTest(unittest.TestCase):
     def test_realpath(self):
         self.assertEqual("HH", realpath("HH"))
         self.assertEqual("", realpath("////"))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_write_atomic")
+    def test_write_atomic(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "test.txt")
+            write_atomic(path, "first")
+            os.chmod(path, 0o600)
+            write_atomic(path, "second")
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(file.read(), "second")
+            if sys.platform == "linux":  # the mode is kept
+                self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+
+            # the file is not changed by the failed write
+            with self.assertRaises(UnicodeEncodeError):
+                write_atomic(path, "third \udc00")
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(file.read(), "second")
+            self.assertEqual(os.listdir(folder), ["test.txt"])
@@ -7,6 +7,7 @@
 import os
 import sys
 import subprocess
+import tempfile
 from functools import lru_cache
 
 
@@ -137,3 +138,26 @@ def run_cmd(cmd, cmd_cur_dir=None, wait=False, test=False):
     os.chdir(cur_dir)
 
     return True, "OK"
+
+
+# =============================================================================
+def write_atomic(file_path, text, encoding="utf-8"):
+    """
+    Write the text to the temporary file near the file, then replace the
+    file with it (the file is old or new, never written partially).
+    """
+    folder, name = os.path.split(os.path.abspath(file_path))
+    handle, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp",
+                                        dir=folder)
+    try:
+        with os.fdopen(handle, "w", encoding=encoding) as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        if os.path.exists(file_path):
+            os.chmod(tmp_path, os.stat(file_path).st_mode & 0o7777)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -20,6 +20,16 @@ class IEditor(metaclass=ABCMeta):
     def load(self):
         pass
 
+    # -------------------------------------------------------------------------
+    @abstractmethod
+    def save_async(self):
+        pass
+
+    # -------------------------------------------------------------------------
+    @abstractmethod
+    def load_async(self):
+        pass
+
     # -------------------------------------------------------------------------
     @abstractmethod
     def set_option(self, **options):
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Automatic saving of the modified document ("TextEditor/AutoSave").
+
+The document is saved when the typing is paused for
+"TextEditor/AutoSaveDelay" (msec), but not later than
+"TextEditor/AutoSaveMaxDelay" after the first unsaved modification. The
+text is serialized in the GUI thread (QTextDocument is not reentrant) and
+written by the "write" function in the worker thread; the text with the
+same hash as the last written one is not written again.
+
+The "write" function returns None if the text is written, False if it can
+not be written in the background (then the document is saved by "save" in
+the GUI thread, e.g. with the dialog of the file name) or the error.
+Without "write" the document is saved by "save".
+"""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.Qt import QObject, QTimer, pyqtSignal
+
+
+_executor = ThreadPoolExecutor(max_workers=1)
+
+
+# =============================================================================
+class AutoSave(QObject):
+
+    saved = pyqtSignal(bool)            # the result of the background write
+    _written = pyqtSignal(int, object)  # job, result of write
+
+    # -------------------------------------------------------------------------
+    def __init__(self, doc, config, write, save):
+        super(AutoSave, self).__init__()
+        self._doc = doc
+        self._cfg = config
+        self._write = write
+        self._save = save
+
+        self._job = 0           # number of the last write
+        self._future = None     # the last write
+        self._digest = None     # hash of the last written text
+
+        self._idle = QTimer(self)
+        self._idle.setSingleShot(True)
+        self._idle.timeout.connect(self.flush)
+        self._latest = QTimer(self)
+        self._latest.setSingleShot(True)
+        self._latest.timeout.connect(self.flush)
+        self._written.connect(self._finish)
+
+    # -------------------------------------------------------------------------
+    def touch(self):
+        """Called with the modification of the document."""
+        self._idle.start(self._cfg.get("TextEditor/AutoSaveDelay", 0))
+        if not self._latest.isActive():
+            self._latest.start(
+                self._cfg.get("TextEditor/AutoSaveMaxDelay", 0))
+
+    # -------------------------------------------------------------------------
+    def is_pending(self):
+        """The document is waiting for the saving or is written now."""
+        return (self._idle.isActive() or self._latest.isActive() or
+                self._future is not None)
+
+    # -------------------------------------------------------------------------
+    def flush(self):
+        """Saves the modified document now."""
+        self._idle.stop()
+        self._latest.stop()
+        if not self._doc.is_modified():
+            return
+        if self._write is None:
+            self._save()
+            return
+
+        text = self._doc.serialize()
+        self._doc.text.setModified(False)
+        self._job += 1
+        job = self._job
+        self._future = _executor.submit(self._write_text, text)
+        self._future.add_done_callback(lambda f: self._done(job, f))
+
+    # -------------------------------------------------------------------------
+    def wait(self):
+        """
+        Stops the timers and waits for the write (before the document is
+        saved or loaded in the GUI thread), the next text is written anyway.
+        """
+        self._idle.stop()
+        self._latest.stop()
+        if self._future is not None:
+            self._future.result()
+            self._job += 1  # its result is not needed
+            self._future = None
+        self._digest = None
+
+    # -------------------------------------------------------------------------
+    def _write_text(self, text):
+        """Called in the worker thread."""
+        digest = hashlib.sha1(text.encode("utf-8", "surrogatepass")).digest()
+        if digest == self._digest:
+            return None  # the same text is in the file
+        try:
+            result = self._write(text)
+        except OSError as err:
+            return err
+        if result is None:
+            self._digest = digest
+        return result
+
+    # -------------------------------------------------------------------------
+    def _done(self, job, future):
+        """Called in the worker thread."""
+        try:
+            self._written.emit(job, future.result())
+        except RuntimeError:  # pragma: no cover
+            pass  # the editor is already deleted
+
+    # -------------------------------------------------------------------------
+    def _finish(self, job, result):
+        if job != self._job:
+            return  # the result is waited by wait()
+        self._future = None
+        if result is None:
+            self._doc.change()  # the status and the button "Save"
+            self.saved.emit(True)
+            return
+        self._doc.text.setModified(True)
+        if result is False:
+            self._save()  # the document is saved in the GUI thread
+        else:
+            self._doc.change()
+            self.saved.emit(False)
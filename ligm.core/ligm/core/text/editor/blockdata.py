@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Caches kept in the user data of the text blocks."""
+
+from PyQt5.Qt import QTextBlockUserData
+
+
+# =============================================================================
+class BlockData(QTextBlockUserData):
+    """
+    The caches of the block (folding, brackets), they are valid while the
+    text of the block is the same. ``folded`` is the state of the block and
+    ``hidden`` is the count of the blocks hidden by it, they survive the
+    changes of the text.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, key, folded=False, hidden=0):
+        QTextBlockUserData.__init__(self)
+        self.key = key
+        self.folded = folded
+        self.hidden = hidden
+        self.fold = None
+        self.brackets = None
+
+
+# =============================================================================
+def block_data(block, text=None):
+    """Returns BlockData of the block, new one if the text was changed."""
+    data = block.userData()
+    key = hash(block.text() if text is None else text)
+    if not isinstance(data, BlockData):
+        data = BlockData(key)
+        block.setUserData(data)
+    elif data.key != key:
+        data = BlockData(key, data.folded, data.hidden)
+        block.setUserData(data)
+    return data
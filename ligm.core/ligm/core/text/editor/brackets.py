@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Matching of brackets and keyword pairs (e.g. BEGIN/END) in the plain text
+mode.
+
+Every block caches (see blockdata.py) the list of its brackets outside of
+strings and comments and, for every kind of pair, the summary of nesting:
+the change of the depth and the minimum of the depth going forward and
+backward. The search of the partner skips the blocks where the depth can
+not reach zero without looking at their brackets.
+"""
+
+import re
+from PyQt5.Qt import QObject
+from .blockdata import block_data
+
+
+# kinds of brackets by the closing one
+CLOSE = {")": "(", "]": "[", "}": "{"}
+
+# the brackets in these styles of the highlighter are ignored
+SKIP_STYLES = ("comment", "string", "string2")
+
+
+# =============================================================================
+class Brackets:
+    """Cached brackets of the block."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, key, tokens):
+        self.key = key
+        self.tokens = tokens  # [(start, length, kind, is opening)]
+
+        # {kind: (delta, minimum forward, minimum backward)}
+        self.summary = {}
+        for kind in {token[2] for token in tokens}:
+            depth = forward = 0
+            for _, _, knd, opening in tokens:
+                if knd == kind:
+                    depth += 1 if opening else -1
+                    forward = min(forward, depth)
+            delta, depth, backward = depth, 0, 0
+            for _, _, knd, opening in reversed(tokens):
+                if knd == kind:
+                    depth += -1 if opening else 1
+                    backward = min(backward, depth)
+            self.summary[kind] = delta, forward, backward
+
+
+# =============================================================================
+class BracketMatcher(QObject):
+    """Finds the pair of the bracket at the cursor of the QTextEdit."""
+
+    # the search stops after this count of blocks
+    max_blocks = 10000
+
+    # -------------------------------------------------------------------------
+    def __init__(self, textedit):
+        super(BracketMatcher, self).__init__(textedit)
+        self._textedit = textedit
+        self._highlighter = None
+        self._enabled = False
+        self._version = 0
+        self._tokens = None
+
+    # -------------------------------------------------------------------------
+    def set_rules(self, highlighter=None, rules=None):
+        """
+        Enables the matching. The highlighter (LexerHighlighter) finds the
+        strings and comments, rules are {"begin", "end"} patterns of the
+        keyword pairs (as the rules of folding). No highlighter disables it.
+        """
+        self._highlighter = highlighter
+        self._enabled = highlighter is not None
+        self._version += 1
+        pattern = r"([()\[\]{}])"
+        rules = rules or {}
+        if rules.get("begin"):
+            pattern += rf"|({rules['begin']})|({rules['end']})"
+        self._tokens = re.compile(pattern, re.IGNORECASE)
+
+    # -------------------------------------------------------------------------
+    def enabled(self):
+        return self._enabled
+
+    # -------------------------------------------------------------------------
+    def data(self, block):
+        """Returns the Brackets of the block (computes it if need)."""
+        text = block.text()
+        data = block_data(block, text)
+        # strings and comments depend on the state of the previous block
+        key = block.previous().userState(), self._version
+        if data.brackets is None or data.brackets.key != key:
+            data.brackets = Brackets(key, self._find(block, text))
+        return data.brackets
+
+    # -------------------------------------------------------------------------
+    def _find(self, block, text):
+        skip = []
+        if self._highlighter is not None:
+            skip = [(start, start + length) for start, length, style in
+                    self._highlighter.block_spans(block)
+                    if style in SKIP_STYLES]
+
+        tokens = []
+        for match in self._tokens.finditer(text):
+            start = match.start()
+            if any(begin <= start < end for begin, end in skip):
+                continue
+            bracket, begin, _ = (match.groups() + (None, None))[:3]
+            if bracket:
+                kind = CLOSE.get(bracket, bracket)
+                tokens.append((start, 1, kind, bracket not in CLOSE))
+            else:
+                tokens.append((start, match.end() - start, "begin",
+                               begin is not None))
+        return tokens
+
+    # -------------------------------------------------------------------------
+    def match(self, position):
+        """
+        Returns None if there is no bracket at the position, else
+        ((start, length), partner) where partner is (start, length) or None
+        if it is not found.
+        """
+        if not self._enabled:
+            return None
+        block = self._textedit.document().findBlock(position)
+        if not block.isValid():
+            return None
+        tokens = self.data(block).tokens
+        pos = position - block.position()
+
+        # the bracket after the cursor, then before it
+        found = [i for i, (start, length, _, _) in enumerate(tokens)
+                 if start <= pos < start + length]
+        found = found or [i for i, (start, length, _, _) in enumerate(tokens)
+                          if start < pos <= start + length]
+        if not found:
+            return None
+
+        index = found[0]
+        start, length, kind, opening = tokens[index]
+        partner = (self._forward(block, index, kind) if opening else
+                   self._backward(block, index, kind))
+        return (block.position() + start, length), partner
+
+    # -------------------------------------------------------------------------
+    def _forward(self, block, index, kind):
+        depth = 1
+        tokens = self.data(block).tokens[index + 1:]
+        for _ in range(self.max_blocks):
+            for start, length, knd, opening in tokens:
+                if knd == kind:
+                    depth += 1 if opening else -1
+                    if not depth:
+                        return block.position() + start, length
+            block = block.next()
+            # skip the blocks where the depth does not reach zero
+            while block.isValid():
+                delta, forward, _ = self.data(block).summary.get(
+                    kind, (0, 0, 0))
+                if depth + forward > 0:
+                    depth += delta
+                    block = block.next()
+                else:
+                    break
+            if not block.isValid():
+                return None
+            tokens = self.data(block).tokens
+        return None
+
+    # -------------------------------------------------------------------------
+    def _backward(self, block, index, kind):
+        depth = 1
+        tokens = self.data(block).tokens[:index]
+        for _ in range(self.max_blocks):
+            for start, length, knd, opening in reversed(tokens):
+                if knd == kind:
+                    depth += -1 if opening else 1
+                    if not depth:
+                        return block.position() + start, length
+            block = block.previous()
+            while block.isValid():
+                delta, _, backward = self.data(block).summary.get(
+                    kind, (0, 0, 0))
+                if depth + backward > 0:
+                    depth -= delta
+                    block = block.previous()
+                else:
+                    break
+            if not block.isValid():
+                return None
+            tokens = self.data(block).tokens
+        return None
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Construction of the large HTML document in the worker thread.
+
+QTextDocument.setHtml holds the GIL all the time of the parsing, so the
+GUI thread is blocked by it even in the worker thread. The HTML made by
+Qt (see QRICHTEXT) is split into the pieces at the top level paragraphs,
+each piece is parsed into its own document and appended to the new one,
+the GUI thread runs between the pieces. The built document is moved to
+the GUI thread, the editor replaces its document with it at once.
+
+Other HTML is parsed at once (the pieces of it may be parsed in another
+way than the whole HTML).
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.Qt import QTextDocument, QTextCursor, QTextDocumentFragment
+
+
+_executor = ThreadPoolExecutor(max_workers=1)
+
+PIECE_SIZE = 100_000   # characters of the HTML parsed at once
+
+# the tag of the HTML made by QTextDocument.toHtml
+QRICHTEXT = '<meta name="qrichtext" content="1" />'
+
+_BODY = re.compile(r"<body\b[^>]*>", re.I)
+_BODY_END = re.compile(r"</body\s*>", re.I)
+# the blocks with the nested blocks, they are not split
+_NESTED = re.compile(r"<(/?)(table|ul|ol|dl|pre|blockquote|div)\b", re.I)
+# the paragraph at the start of the line starts the piece
+_BLOCK = re.compile(r"<(p|h[1-6])[\s>]", re.I)
+
+
+# =============================================================================
+def split_html(html, size=PIECE_SIZE):
+    """
+    Returns (head, pieces): the HTML up to the end of the tag "body" and the
+    pieces of the body of about the size (or ("", [html]) if the HTML is
+    not made by Qt).
+    """
+    start = _BODY.search(html)
+    if start is None or QRICHTEXT not in html[:start.start()]:
+        return "", [html]
+    end = _BODY_END.search(html, start.end())
+    body = html[start.end():end.start() if end else len(html)]
+
+    tags = [(tag.start(), tag.group(1) == "/")
+            for tag in _NESTED.finditer(body)]
+    cuts, depth, idx = [0], 0, 0
+    while cuts[-1] + size < len(body):
+        line = body.find("\n", cuts[-1] + size)
+        while line >= 0:
+            while idx < len(tags) and tags[idx][0] < line:
+                depth = max(0, depth - 1) if tags[idx][1] else depth + 1
+                idx += 1
+            if not depth and _BLOCK.match(body, line + 1):
+                break
+            line = body.find("\n", line + 1)
+        if line < 0:
+            break
+        cuts.append(line + 1)
+    cuts.append(len(body))
+    return html[:start.end()], [body[a:b] for a, b in zip(cuts, cuts[1:])]
+
+
+# =============================================================================
+def build_document(html, font, indent_width, thread, progress=None,
+                   size=PIECE_SIZE):
+    """
+    Called in the worker thread: the document with the HTML (as after
+    setHtml) moved to the thread or None if progress(percent) returns
+    False (the building is cancelled).
+    """
+    head, pieces = split_html(html, size)
+
+    def parse(piece):
+        document = QTextDocument()
+        document.setDefaultFont(font)
+        document.setIndentWidth(indent_width)
+        document.setHtml(head + piece + "</body></html>" if head else piece)
+        return document
+
+    document = parse(pieces[0])
+    document.setUndoRedoEnabled(False)
+    cursor = QTextCursor(document)
+    for number, piece in enumerate(pieces[1:], 1):
+        if progress and not progress(100 * number // len(pieces)):
+            return None
+        part = parse(piece)
+        first = part.begin()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertBlock(first.blockFormat(), first.charFormat())
+        cursor.insertFragment(QTextDocumentFragment(part))
+    document.setUndoRedoEnabled(True)
+    document.setModified(False)
+    document.moveToThread(thread)
+    return document
+
+
+# =============================================================================
+def build_async(html, font, indent_width, thread, progress=None):
+    """Builds the document in the worker thread, returns the future."""
+    return _executor.submit(build_document, html, font, indent_width, thread,
+                            progress)
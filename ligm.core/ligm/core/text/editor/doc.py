@@ -8,7 +8,7 @@ import datetime
 from PyQt5.Qt import (pyqtSignal, QTextDocument, QFont, QTextCursor, QObject,
                       QTextOption, QTextListFormat, Qt, QBrush, QPixmap,
                       QTextBlockFormat, QTextTableFormat, QByteArray, QColor,
-                      QTextCharFormat, QBuffer, QIODevice)
+                      QTextCharFormat, QBuffer, QIODevice, QTimer)
 
 
 # =============================================================================
@@ -18,6 +18,14 @@ class Doc(QObject):
     changed_bold = pyqtSignal(bool)     # for update button "Bold"
     enabled_save = pyqtSignal(bool)     # for update button "Save"
 
+    # the status is updated at most once per this interval (msec) while the
+    # text is typed or the cursor is moved (see schedule_change)
+    status_delay = 50
+
+    # the plain text with more replaced spans is replaced at once (see
+    # replace_spans)
+    plain_spans = 1000
+
     # -------------------------------------------------------------------------
     def __init__(self, config):
         super(Doc, self).__init__()
@@ -25,6 +33,20 @@ class Doc(QObject):
         self._cfg = config
         self._text_edit_cursor = QTextCursor(self._text)
         self._text.setIndentWidth(self._cfg.get("TextEditor/IndentWidth", 24))
+        # lineCount() needs the layout of the whole document, the large one
+        # shows the count of blocks (see policy.py)
+        self.count_lines = True
+        # running count of lines (None - to count), it is changed with the
+        # count of blocks (the blocks laid out by QTextEdit are single lines
+        # for lineCount(), the wrapped lines are not counted)
+        self._lines = None
+        self._blocks = self._text.blockCount()
+        self._text.blockCountChanged.connect(self._blocks_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.status_delay)
+        self._timer.timeout.connect(self.change)
 
         self.set_default_font()
 
@@ -58,10 +80,11 @@ class Doc(QObject):
         """
         if text_cursor:
             self._text_edit_cursor = text_cursor
+        self._timer.stop()
 
         # refresh data on statusbar
         y = self._text_edit_cursor.blockNumber() + 1
-        cnt = self._text.lineCount()
+        cnt = self._line_count()
         x = self._text_edit_cursor.columnNumber() + 1
         chg = (self.tr("The document is not saved")
                if self._text.isModified() else "")
@@ -69,6 +92,32 @@ class Doc(QObject):
         self.changed_status.emit({"left": chg, "right": xy})
         self.enabled_save.emit(self.is_modified())
 
+    # -------------------------------------------------------------------------
+    def schedule_change(self, text_cursor: QTextCursor = None):
+        """
+        The same as change(), but the status is updated later: the changes of
+        the text and moves of the cursor between the updates are coalesced.
+        """
+        if text_cursor:
+            self._text_edit_cursor = text_cursor
+        if not self._timer.isActive():
+            self._timer.start()
+
+    # -------------------------------------------------------------------------
+    def _blocks_changed(self, count):
+        if self._lines is not None:
+            self._lines += count - self._blocks
+        self._blocks = count
+
+    # -------------------------------------------------------------------------
+    def _line_count(self):
+        """The lines are counted once, then the count is kept up to date."""
+        if not self.count_lines:
+            return self._text.blockCount()
+        if self._lines is None:
+            self._lines = self._text.lineCount()
+        return self._lines
+
     # -------------------------------------------------------------------------
     def bold(self):
         """
@@ -255,6 +304,41 @@ class Doc(QObject):
     def replace(self, replace_text):
         self._text_edit_cursor.insertText(replace_text)
 
+    # -------------------------------------------------------------------------
+    def replace_spans(self, spans, replace_text, plain=False):
+        """
+        Replaces the spans (start, end) of the document sorted by position
+        with the text (or the list of texts of the spans) as one step of
+        undo. The spans are replaced from the
+        end, so the positions of the previous spans are not changed.
+        The plain text with many spans is replaced at once by the new text of
+        the document (the formats of the characters are not kept).
+        """
+        if not spans:
+            return
+        texts = replace_text
+        if isinstance(replace_text, str):
+            texts = [replace_text] * len(spans)
+
+        cursor = QTextCursor(self._text)
+        cursor.beginEditBlock()
+        if plain and len(spans) > self.plain_spans:
+            text, parts, pos = self._text.toPlainText(), [], 0
+            for (start, end), new_text in zip(spans, texts):
+                parts.append(text[pos:start])
+                parts.append(new_text)
+                pos = end
+            parts.append(text[pos:])
+            cursor.select(QTextCursor.Document)
+            cursor.insertText("".join(parts))
+        else:
+            for (start, end), new_text in zip(reversed(spans),
+                                              reversed(texts)):
+                cursor.setPosition(start)
+                cursor.setPosition(end, QTextCursor.KeepAnchor)
+                cursor.insertText(new_text)
+        cursor.endEditBlock()
+
     # -------------------------------------------------------------------------
     def ins_date(self):
         self._text_edit_cursor.insertText(
@@ -307,18 +391,22 @@ class Doc(QObject):
                     height = int(raw[i + 1])
         return image, width, height, fmt
 
+    # -------------------------------------------------------------------------
+    def serialize(self):
+        """The text to save (plain or HTML)."""
+        if self._cfg.get("TextEditor/PlainText", 0):
+            txt = str(self._text.toPlainText())
+            if self._cfg.get("TextEditor/ReplaceTabWithSpace", 0):
+                cnt = self._cfg.get("TextEditor/CountSpaceInTab", 1)
+                txt = txt.replace("\t", " " * cnt)
+            return txt
+        return str(self._text.toHtml(encoding=QByteArray()))
+
     # -------------------------------------------------------------------------
     def save(self, save_proc):
         if self._text.isModified():
             self._text.setModified(False)
-            if self._cfg.get("TextEditor/PlainText", 0):
-                txt = str(self._text.toPlainText())
-                if self._cfg.get("TextEditor/ReplaceTabWithSpace", 0):
-                    cnt = self._cfg.get("TextEditor/CountSpaceInTab", 1)
-                    txt = txt.replace("\t", " " * cnt)
-                res = save_proc(txt)
-            else:
-                res = save_proc(str(self._text.toHtml(encoding=QByteArray())))
+            res = save_proc(self.serialize())
             if res is not None:
                 self._text.setModified(True)
 
@@ -333,6 +421,17 @@ class Doc(QObject):
             self._text.setHtml(load_proc())
         self._text.setModified(False)
 
+    # -------------------------------------------------------------------------
+    def set_document(self, document):
+        """Replaces the document with the built one (see builder.py)."""
+        self._text.blockCountChanged.disconnect(self._blocks_changed)
+        document.setDefaultTextOption(self._text.defaultTextOption())
+        self._text = document
+        self._text_edit_cursor = QTextCursor(self._text)
+        self._lines = None
+        self._blocks = self._text.blockCount()
+        self._text.blockCountChanged.connect(self._blocks_changed)
+
     # -------------------------------------------------------------------------
     def get_text(self):
         if self._cfg.get("TextEditor/PlainText", 0):
@@ -5,21 +5,28 @@
 """The main class for the embeddable text editor."""
 
 import os
+import re
 import sys
 from abc import ABCMeta
 from typing import Dict
 from PyQt5.Qt import (QAction, QIcon, QWidget, Qt, QObject, QTextCursor,
                       QTextEdit, QCursor, QFileDialog, QFileInfo, QColor,
-                      QTextDocument, pyqtSignal, QWidgetAction, QLabel,
-                      QImageReader, QLocale)
+                      pyqtSignal, QWidgetAction, QLabel, QImageReader,
+                      QLocale, QTimer, QTextCharFormat, QTextDocument)
 from PyQt5.QtPrintSupport import QPrintPreviewDialog, QPrinter
 from ligm.core.common import img, ConfigHelper
 from ligm.core.qt import BlockSignals, yes_no
 from .abstract import IEditor
 from .doc import Doc
 from .view import View, ImageSize
-from .syntax_python import PythonHighlighter
-from .syntax_sql import SQLHighlighter
+from .syntax import highlighter_cls
+from .highlighter import LexerHighlighter
+from .policy import LargeDocumentPolicy
+from .search import Query, SearchEngine
+from .trigrams import TrigramIndex
+from .autosave import AutoSave
+from .operation import AsyncOperation
+from .builder import build_async
 from ..spell import SpellChecker, SpellHighlighter
 from ..keyswitcher import KeySwitcher
 from ligm.core.qt import TestableWidget
@@ -35,12 +42,18 @@ class IQWidgetEditor(ABCMeta, type(QObject)):
 class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
 
     enabled_save_signal = pyqtSignal(bool)     # for update status "Save"
+    progress = pyqtSignal(str, int)            # "load"/"save", percent
+    loaded = pyqtSignal(bool)                  # the result of load_async
+    saved = pyqtSignal(bool)                   # the result of save_async
 
     # constans for copying text format
     NORMAL_MODE = 1
     READY_TO_FORMAT_COPY = 2
     COPY_FORMAT = 3
 
+    # the search is refined after the typing is paused (msec)
+    search_delay = 200
+
     # -------------------------------------------------------------------------
     def __init__(self, parent: QWidget, config, **params):
         super(TextEditor, self).__init__(None)
@@ -56,10 +69,36 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
 
         self._load = params["load"] if "load" in params else lambda:  ""
         self._save = params["save"] if "save" in params else lambda x: True
+        # called in the worker thread by AutoSave (see autosave.py)
+        write = params["save_background"] if "save_background" in params \
+            else None
+        # return the result, the future or the awaitable (see operation.py)
+        self._load_async = params["load_async"] if "load_async" in params \
+            else lambda progress: self._load()
+        self._save_async = params["save_async"] if "save_async" in params \
+            else lambda txt, progress: self._save(txt)
         self._cfg = ConfigHelper(config, **params)
         self._init_params_in_cfg()
         self._set_vars(textmode)
         self._doc = Doc(self._cfg)
+        self._search_index = TrigramIndex(self._doc.text, self._cfg)
+        self._search_engine = SearchEngine(self._doc.text, self._search_index)
+        self._autosave = AutoSave(self._doc, self._cfg, write, self.save)
+        self._autosave.saved.connect(self.saved)
+        self._loading = AsyncOperation(self)
+        self._loading.progress.connect(
+            lambda percent: self._show_progress("load", percent))
+        self._loading.finished.connect(self._loaded)
+        self._saving = AsyncOperation(self)
+        self._saving.progress.connect(
+            lambda percent: self._show_progress("save", percent))
+        self._saving.finished.connect(self._saved)
+        # the large HTML loaded by load_async is built in the background
+        self._building = AsyncOperation(self)
+        self._building.progress.connect(
+            lambda percent: self._show_progress("load", percent))
+        self._building.finished.connect(self._built)
+        self._readonly = False  # restored when the document is built
         margins = params["margins"] if "margins" in params else None
         self._view = View(self, self._cfg, margins)
 
@@ -78,6 +117,13 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
 
         self._highlighter = ""
         self._highlighter_cls = None
+        # the hidden editor (e.g. in an inactive tab) does not highlight the
+        # document, it keeps the range of dirty blocks (first, last) to be
+        # highlighted when it is shown
+        self._dirty = None
+        # the expensive features turned off for the large document
+        self._policy = LargeDocumentPolicy(self._cfg)
+        self._reduced = set()
         self._set_highlighter(self._highlighter)
 
         self._view.text.setAcceptRichText(
@@ -257,7 +303,7 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
         # to track ALL text changes
         self._view.text.cursorPositionChanged.connect(self._position_changed)
         self._view.text.textChanged.connect(
-            lambda: self._doc.change(self._view.text.textCursor()))
+            lambda: self._doc.schedule_change(self._view.text.textCursor()))
 
         # binding ToolButtons to Actions
         for name, btn in self._view.toolbar.controls.items():
@@ -282,6 +328,16 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
             if name in self._actions:
                 btn.setDefaultAction(self._actions[name])
 
+        # incremental search
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.search_delay)
+        self._search_timer.timeout.connect(self._incremental_search)
+        controls = self._view.search_replace.controls
+        controls["search-edit"].textEdited.connect(self._schedule_search)
+        for name in ("cs-box", "word-box", "regex-box"):
+            controls[name].toggled.connect(self._schedule_search)
+
         self.keyPressEvent = self._key_press_event
         self._old_text_key_press = self._view.text.keyPressEvent
         self._view.text.keyPressEvent = self._key_press_event
@@ -317,7 +373,7 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
 
         if self._doc.is_modified():
             if self._cfg.get("TextEditor/AutoSave", 0):
-                self.save()
+                self._autosave.touch()
 
     # -------------------------------------------------------------------------
     def _key_press_event(self, event):
@@ -433,7 +489,7 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
 
     # -------------------------------------------------------------------------
     def _position_changed(self):
-        self._doc.change(self._view.text.textCursor())
+        self._doc.schedule_change(self._view.text.textCursor())
         self._view.contents_change()
 
         self._set_align_menu()  # update align menu (need if cursor in table)
@@ -583,6 +639,11 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
             text.setTextCursor(old_cur)
 
             if word and not self._spell.check_word(word):
+                # the word stays marked while the menu is shown
+                focus = QTextEdit.ExtraSelection()
+                focus.format.setBackground(QColor(Qt.red).lighter(180))
+                focus.cursor = cursor
+                self._view.selections.set(spell=[focus])
 
                 to_dict_action = QAction(
                     self.tr("Add to the dictionary"), None)
@@ -660,6 +721,7 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
         menu.addAction(self._actions["print"])
 
         menu.exec_(QCursor().pos())
+        self._view.selections.clear("spell")
         self._restore_cursor()
 
     # -------------------------------------------------------------------------
@@ -672,12 +734,53 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
     # -------------------------------------------------------------------------
     def _add_word_to_spell(self, word):
         self._spell.add_word(word)
-        self._rehighlight()
+        # only the blocks between the first and the last word are changed
+        doc = self._doc.text
+        first = doc.find(word, 0, QTextDocument.FindWholeWords)
+        if not first.isNull():
+            last = doc.find(word, doc.characterCount(),
+                            QTextDocument.FindWholeWords |
+                            QTextDocument.FindBackward)
+            self._rehighlight(first.blockNumber(), last.blockNumber())
 
     # -------------------------------------------------------------------------
-    def _rehighlight(self):
-        if self._highlighter_cls:
-            self._highlighter_cls.rehighlight()
+    def _rehighlight(self, first=0, last=None):
+        """Highlights the blocks from the first to the last (None - to the
+        end of the document) or marks them dirty if the editor is hidden."""
+        highlighter = self._highlighter_cls
+        if highlighter is None:
+            return
+        if self._dirty:
+            first = min(first, self._dirty[0])
+            last = (None if last is None or self._dirty[1] is None else
+                    max(last, self._dirty[1]))
+        if not self.isVisible():
+            self._dirty = first, last
+            return
+
+        self._dirty = None
+        if highlighter.document() is not None and \
+                (first or last is not None):
+            block = self._doc.text.findBlockByNumber(first)
+            while block.isValid() and \
+                    (last is None or block.blockNumber() <= last):
+                highlighter.rehighlightBlock(block)
+                block = block.next()
+        elif isinstance(highlighter, LexerHighlighter):
+            highlighter.highlight_document(self._doc.text, self._view.text,
+                                           "highlighting" in self._reduced)
+        elif "highlighting" in self._reduced:
+            highlighter.setDocument(None)
+        elif highlighter.document() is None:
+            highlighter.setDocument(self._doc.text)
+        else:
+            highlighter.rehighlight()
+
+    # -------------------------------------------------------------------------
+    def showEvent(self, event):
+        if self._dirty:
+            self._rehighlight(*self._dirty)
+        super(TextEditor, self).showEvent(event)
 
     # -------------------------------------------------------------------------
     def _print_text(self):  # pragma: no cover
@@ -711,107 +814,148 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
         self._view.retranslate_ui()
         self._doc.change()  # for update status bar
 
+    # -------------------------------------------------------------------------
+    def _query(self, find_text=None):
+        controls = self._view.search_replace.controls
+        if find_text is None:
+            find_text = controls["search-edit"].text()
+        return Query(find_text,
+                     case_sensitive=controls["cs-box"].isChecked(),
+                     regex=controls["regex-box"].isChecked(),
+                     whole_word=controls["word-box"].isChecked())
+
+    # -------------------------------------------------------------------------
+    def _select(self, start, end):
+        cursor = self._view.text.textCursor()
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        self._view.text.setTextCursor(cursor)
+
     # -------------------------------------------------------------------------
     def _search(self, forward=False):
-        find_text = self._view.search_replace.controls["search-edit"].text()
+        query = self._query()
         txt = self.tr("End of document.")
-        flags = QTextDocument.FindFlags()
-        if self._view.search_replace.controls["cs-box"].isChecked():
-            flags |= QTextDocument.FindCaseSensitively
         if forward:
-            flags |= QTextDocument.FindBackward
             txt = self.tr("Begin of document.")
-        if not self._view.text.find(find_text, options=flags):
-            self._view.show_info(txt)
+        idx = self._search_engine.next(
+            query, self._view.text.textCursor(), backward=forward)
+        self._show_search_status(query, idx)
+        if idx is None:
+            self._view.show_info(query.error or txt)
             return False
+        self._select(*self._search_engine.span(idx))
         return True
 
     # -------------------------------------------------------------------------
-    def search(self, text="", show_msg=True):  # impl. of interface IEditor
-        find_text = self._view.search_replace.controls["search-edit"].text()
-        if not show_msg and text.strip():
-            find_text = text  # pragma: no cover
+    def _schedule_search(self, *_):
+        self._search_timer.start()
 
-        flags = QTextDocument.FindFlags()
-        if self._view.search_replace.controls["cs-box"].isChecked():
-            flags |= QTextDocument.FindCaseSensitively
+    # -------------------------------------------------------------------------
+    def _incremental_search(self):
+        """Selects the match from the start of the selection (or the first)."""
+        query = self._query()
+        cursor = self._view.text.textCursor()
+        cursor.setPosition(cursor.selectionStart())
+        idx = self._search_engine.next(query, cursor)
+        if idx is None and self._search_engine.count(query):
+            idx = 0
+        self._highlight_search(query)
+        if idx is not None:
+            self._select(*self._search_engine.span(idx))
+        self._show_search_status(query, idx)
 
-        old_cursor = self._view.text.textCursor()
-        self._view.text.moveCursor(QTextCursor.Start)
-        color = QColor(Qt.yellow).lighter(130)
+    # -------------------------------------------------------------------------
+    def _show_search_status(self, query, idx):
+        count = self._search_engine.count(query)
+        if query.error:
+            txt = query.error
+        elif not count:
+            txt = self.tr("Nothing found :(") if query.text else ""
+        elif idx is None:
+            txt = f'{self.tr("Results found")}: {count}'
+        else:
+            txt = f'{idx + 1} {self.tr("of")} {count}'
+        self._view.search_replace.controls["search-info"].setText(txt)
 
-        extra_sels = []
-        while self._view.text.find(find_text, options=flags):
-            extra = QTextEdit.ExtraSelection()
-            extra.format.setBackground(color)
-            extra.cursor = self._view.text.textCursor()
-            extra_sels.append(extra)
+    # -------------------------------------------------------------------------
+    def _highlight_search(self, query):
+        # the selections are made only for the matches near the viewport
+        matches = self._search_engine.matches(query)
+        fmt = QTextCharFormat()
+        fmt.setBackground(QColor(Qt.yellow).lighter(130))
+        self._view.selections.set_spans("search", matches, fmt)
+        count = matches.count()
+        self._view.overview.set_matches(matches if count else None)
+        return count
 
-        self._view.text.setExtraSelections(extra_sels)
+    # -------------------------------------------------------------------------
+    def search(self, text="", show_msg=True):  # impl. of interface IEditor
+        find_text = None
+        if not show_msg and text.strip():
+            find_text = text  # pragma: no cover
+        query = self._query(find_text)
+        count = self._highlight_search(query)
 
-        if len(extra_sels) != 0:
+        if count:
             txt = self.tr("Results found")
-            txt = f'{txt}: {len(extra_sels)}'
-            cursor = self._view.text.textCursor()
-            cursor.clearSelection()
-            self._view.text.setTextCursor(cursor)
+            txt = f'{txt}: {count}'
+            end = self._search_engine.span(count - 1)[1]
+            self._select(end, end)
         else:
-            txt = self.tr("Nothing found :(")
-            self._view.text.setTextCursor(old_cursor)
+            txt = query.error or self.tr("Nothing found :(")
+        self._show_search_status(query, None)
 
         if show_msg:
             self._view.show_info(txt)
 
     # -------------------------------------------------------------------------
     def _replace(self):
-        find_text = self._view.search_replace.controls["search-edit"].text()
         repl_text = self._view.search_replace.controls["replace-edit"].text()
-        cs_box = self._view.search_replace.controls["cs-box"].isChecked()
+        query = self._query()
 
-        if self._view.text.textCursor().hasSelection():
-            txt = self._view.text.textCursor().selection().toPlainText()
-            to_repl = find_text.upper() == txt.upper()
-            if cs_box:
-                to_repl = find_text == txt
-
-            if to_repl:
-                self._doc.replace(repl_text)
+        cursor = self._view.text.textCursor()
+        if cursor.hasSelection():
+            match = self._search_engine.match_at(
+                query, cursor.selectionStart(), cursor.selectionEnd())
+            if match:
+                try:
+                    text = query.replacement(match, repl_text)
+                except re.error as err:
+                    self._view.show_info(str(err))
+                    return
+                self._doc.replace(text)
                 self._search()
 
     # -------------------------------------------------------------------------
     def _replace_all(self):
-        find_text = self._view.search_replace.controls["search-edit"].text()
         repl_text = self._view.search_replace.controls["replace-edit"].text()
+        query = self._query()
+        if query.error:
+            self._view.show_info(query.error)
+            return
 
-        flags = QTextDocument.FindFlags()
-        if self._view.search_replace.controls["cs-box"].isChecked():
-            flags |= QTextDocument.FindCaseSensitively
-
-        old_cursor = self._view.text.textCursor()
-        self._view.text.moveCursor(QTextCursor.Start)
-
-        cnt = 0
-        while self._view.text.find(find_text, options=flags):
-            cnt += 1
-
-        self._view.text.setTextCursor(old_cursor)
-        if not cnt:
+        try:
+            spans, texts = self._search_engine.replacements(query, repl_text)
+        except re.error as err:
+            self._view.show_info(str(err))
+            return
+        if not spans:
             return
 
-        txt = (self.tr("Results found: ") + str(cnt) +
+        txt = (self.tr("Results found: ") + str(len(spans)) +
                self.tr(". Replace everything ?"))
         if not yes_no(txt, self):
             return
 
-        cnt = 0
-        self._view.text.moveCursor(QTextCursor.Start)
-        while self._view.text.find(find_text, options=flags):
-            self._doc.replace(repl_text)
-            cnt += 1
+        position = self._view.text.textCursor().position()
+        plain = self._cfg.get("TextEditor/PlainText", 0)
+        self._doc.replace_spans(spans, texts, plain=plain)
+        cursor = self._view.text.textCursor()
+        cursor.setPosition(min(position, self._doc.text.characterCount() - 1))
+        self._view.text.setTextCursor(cursor)
 
-        if cnt:
-            txt = self.tr("Replacements done")
-            self._view.show_info(f'{txt}: {cnt}')
+        txt = self.tr("Replacements done")
+        self._view.show_info(f'{txt}: {len(spans)}')
 
     # -------------------------------------------------------------------------
     def _clear_highlighter(self):
@@ -821,27 +965,54 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
     # -------------------------------------------------------------------------
     def _set_highlighter_cls(self, highlighter_cls):
         self._clear_highlighter()
+        self._highlighter_cls = None
+        self._dirty = None
         if self._cfg.get("TextEditor/PlainText", 1):
             if highlighter_cls:
-                self._highlighter_cls = highlighter_cls(self._doc.text)
+                self._highlighter_cls = highlighter_cls(None)
+                # comments and strings of the code are spell checked
+                if self._spell.enabled():
+                    self._highlighter_cls.set_spell(self._spell)
         else:
             if self._spell.enabled():
-                self._highlighter_cls = SpellHighlighter(
-                    self._doc.text, self._spell)
+                self._highlighter_cls = SpellHighlighter(None, self._spell)
+        # the document is attached at once or when the editor is shown
+        self._rehighlight()
+
+        self._view.folding.set_rules(
+            getattr(self._highlighter_cls, "folding", None))
+        self._view.brackets.set_rules(
+            self._highlighter_cls
+            if isinstance(self._highlighter_cls, LexerHighlighter) else None,
+            getattr(self._highlighter_cls, "folding", None))
 
     # -------------------------------------------------------------------------
     def _set_highlighter(self, highlighter):
 
-        if highlighter.upper() in ["PYTHON", "SQL"]:
+        # languages are described by the files in the "languages" directory
+        cls = highlighter_cls(highlighter) if highlighter else None
+        if cls:
             self._highlighter = highlighter
-            if highlighter.upper() == "PYTHON":
-                self._set_highlighter_cls(PythonHighlighter)
-            if highlighter.upper() == "SQL":
-                self._set_highlighter_cls(SQLHighlighter)
+            self._set_highlighter_cls(cls)
         else:
             self._highlighter = ""
             self._set_highlighter_cls(None)
-        self._view.status.set({"center": self._highlighter})
+        self._show_highlighter()
+
+    # -------------------------------------------------------------------------
+    def _show_highlighter(self):
+        text = self._highlighter
+        if self._reduced:
+            text = f"{text} [{self.tr('Large document')}]".strip()
+        self._view.status.set({"center": text})
+
+    # -------------------------------------------------------------------------
+    def _set_reduced(self, features):
+        """Turns off the expensive features (see policy.py)."""
+        self._reduced = set(features)
+        self._doc.count_lines = "line_count" not in self._reduced
+        self._view.set_reduced(self._reduced)
+        self._show_highlighter()
 
     # -------------------------------------------------------------------------
     def _set_format_text(self):
@@ -911,6 +1082,8 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
         # ---------------------------------------------------------------------
         if "auto_save" in options:
             self._cfg["TextEditor/AutoSave"] = options["auto_save"]
+            if not options["auto_save"]:
+                self._autosave.wait()  # the pending saving is cancelled
             self._set_btn_save_visible(not bool(options["auto_save"]))
 
         # ---------------------------------------------------------------------
@@ -923,22 +1096,175 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
             self._cfg["TextEditor/ShowStatusBar"] = options["show_status_bar"]
             self._view.update_ui()
 
+        # ---------------------------------------------------------------------
+        if "enable_feature" in options:
+            # the feature turned off for the large document (see policy.py)
+            name = options["enable_feature"]
+            if name in self._reduced:
+                self._set_reduced(self._reduced - {name})
+                if name == "highlighting":
+                    self._rehighlight()
+                self._doc.change()
+
+        # ---------------------------------------------------------------------
+        if "select" in options:
+            # (start, end) positions of the plain text (e.g. a found match)
+            size = self._doc.text.characterCount() - 1
+            start, end = (min(max(pos, 0), size) for pos in options["select"])
+            self._select(start, end)
+            self._view.text.ensureCursorVisible()
+
     # -------------------------------------------------------------------------
     def get_option(self, name):  # implementation of interface IEditor
         if name == "word-wrap":
             return self._cfg.get("TextEditor/WordWrap", 0)
         if name == "readonly":
             return self._view.text.isReadOnly()
+        if name == "highlighter":
+            return self._highlighter  # the name of the set one ("" - none)
+        if name == "reduced_features":
+            return set(self._reduced)
+        if name == "search_index":
+            # memory (bytes) and time of the build (seconds) of the index
+            return self._search_index.stats()
+        if name == "plain_text":
+            # positions of the text are the positions of "select"
+            return self._doc.text.toPlainText()
 
     # -------------------------------------------------------------------------
     def save(self):  # implementation of interface IEditor
+        self._autosave.wait()
         self._doc.save(self._save)
 
+    # -------------------------------------------------------------------------
+    def save_async(self):  # implementation of interface IEditor
+        """Saves the text in the background, "saved" is emitted."""
+        self._autosave.wait()
+        if not self._doc.is_modified():
+            self.saved.emit(True)
+            return
+        txt = self._doc.serialize()
+        self._doc.text.setModified(False)
+        self._saving.start(lambda progress: self._save_async(txt, progress))
+
+    # -------------------------------------------------------------------------
+    def _saved(self, success, result):
+        if not success or result is not None:
+            self._doc.text.setModified(True)
+        self._doc.change()
+        self.saved.emit(success and result is None)
+
+    # -------------------------------------------------------------------------
+    def load_async(self):  # implementation of interface IEditor
+        """Loads the text in the background, "loaded" is emitted."""
+        self._autosave.wait()
+        self._building.cancel()
+        self._loading.start(self._load_async)
+
+    # -------------------------------------------------------------------------
+    def _loaded(self, success, txt):
+        if success and self._build(txt):
+            return  # "loaded" is emitted when the document is built
+        if success:
+            self._load_text(lambda: txt)
+        self._doc.change()
+        self.loaded.emit(success)
+
+    # -------------------------------------------------------------------------
+    def _build(self, txt):
+        """
+        The large HTML ("TextEditor/AsyncHtmlSize") is built in the worker
+        thread (see builder.py), the text is read only until it is built.
+        """
+        size = self._cfg.get("TextEditor/AsyncHtmlSize", 0)
+        if self._cfg.get("TextEditor/PlainText", 0) or not size or \
+                len(txt) < size:
+            return False
+        self._readonly = self._view.text.isReadOnly()
+        self._set_readonly(True)
+        font = self._doc.text.defaultFont()
+        indent_width = self._doc.text.indentWidth()
+        self._building.start(lambda progress: build_async(
+            txt, font, indent_width, self.thread(), progress))
+        return True
+
+    # -------------------------------------------------------------------------
+    def _built(self, success, document):
+        self._set_readonly(self._readonly)
+        if success:
+            self._set_document(document)
+        self._doc.change()
+        self.loaded.emit(success)
+
+    # -------------------------------------------------------------------------
+    def _set_document(self, document):
+        """Replaces the document (with the search index) by the built one."""
+        detach = self._detach_highlighter()
+        self._autosave.wait()
+        self._search_timer.stop()
+        self._view.selections.clear("search")
+        self._view.overview.set_matches(None)
+        with BlockSignals(self._view.text):
+            self._doc.set_document(document)
+            self._view.text.setDocument(document)
+        self._search_index = TrigramIndex(document, self._cfg)
+        self._search_engine = SearchEngine(document, self._search_index)
+        self._document_loaded(detach)
+
+    # -------------------------------------------------------------------------
+    def cancel_async(self):
+        """Cancels load_async and save_async."""
+        self._loading.cancel()
+        self._building.cancel()
+        self._saving.cancel()
+
+    # -------------------------------------------------------------------------
+    def is_busy(self):
+        """load_async or save_async is not finished."""
+        return (self._loading.is_running() or self._building.is_running() or
+                self._saving.is_running())
+
+    # -------------------------------------------------------------------------
+    def _show_progress(self, name, percent):
+        self.progress.emit(name, percent)
+        if percent < 100:
+            text = self.tr("Loading") if name == "load" else \
+                self.tr("Saving")
+            self._view.status.set({"left": f"{text}: {percent}%"})
+
     # -------------------------------------------------------------------------
     def load(self):  # implementation of interface IEditor
+        self._building.cancel()
+        self._load_text(self._load)
+
+    # -------------------------------------------------------------------------
+    def _detach_highlighter(self):
+        highlighter = self._highlighter_cls
+        detach = highlighter is not None and highlighter.document() is not None
+        if detach:
+            highlighter.setDocument(None)
+        return detach
+
+    # -------------------------------------------------------------------------
+    def _load_text(self, load_proc):
+        # the highlighter is detached while the text is loaded, then a large
+        # document is highlighted in the background (or only in the viewport
+        # if the document is too large, see policy.py)
+        detach = self._detach_highlighter()
+        self._autosave.wait()
         with BlockSignals(self._view.text):
-            self._doc.load(self._load)
+            self._doc.load(load_proc)
+        self._document_loaded(detach)
+
+    # -------------------------------------------------------------------------
+    def _document_loaded(self, detach):
         self._view.text.moveCursor(QTextCursor.Start)
+        highlighting = "highlighting" in self._reduced
+        reduced = self._policy.reduced(self._doc.text)
+        if reduced or self._reduced:
+            self._set_reduced(reduced)
+        if detach or highlighting != ("highlighting" in reduced):
+            self._rehighlight()
 
     # -------------------------------------------------------------------------
     def get_text(self):  # implementation of interface IEditor
@@ -973,6 +1299,13 @@ class TextEditor(TestableWidget, IEditor, metaclass=IQWidgetEditor):
             "TextEditor/TimeoutBalloon": 3000,
             "TextEditor/ReplaceTabWithSpace": 1,
             "TextEditor/CountSpaceInTab": 4,
+            "TextEditor/LargeDocumentSize": 20_000_000,
+            "TextEditor/LargeDocumentLines": 300_000,
+            "TextEditor/SearchIndexSize": 1_000_000,
+            "TextEditor/SearchIndexMemory": 256,
+            "TextEditor/AutoSaveDelay": 1000,
+            "TextEditor/AutoSaveMaxDelay": 10000,
+            "TextEditor/AsyncHtmlSize": 1_000_000,
         }.items():
             key_name = key if key[0] != "-" else key[1:]
             system = key[0] == "-"
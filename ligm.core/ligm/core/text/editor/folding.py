@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Code folding in the plain text mode.
+
+The structure of every block (indent, balance of begin/end keywords, is it
+a comment) is cached in the user data of the block (see blockdata.py) and
+is computed again only when the text of the block is changed. The regions
+are found by these cached values; the blocks of a folded region are hidden,
+so Qt does not lay them out. The hidden blocks left without the folded
+header (e.g. its line is deleted) are shown again, the lines inserted into
+the folded region are hidden. The folded header keeps the count of the
+hidden blocks, the line numbers skip them at once.
+
+The rules are set by the "folding" of the definition of the language:
+  "indent"  - the lines with the greater indent are the region;
+  "begin"   - pattern opening the region (e.g. BEGIN), closed by "end";
+  "comment" - prefix of comments, a run of comment lines is the region.
+"""
+
+import re
+from PyQt5.Qt import QObject, QTextCursor, pyqtSignal
+from .blockdata import BlockData, block_data
+
+
+# =============================================================================
+class FoldData:
+    """Cached structure of the block."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, text, folding):
+        self.version = folding.version
+
+        stripped = text.lstrip()
+        # indent of the empty line is None (it does not break the region)
+        self.indent = (len(text.expandtabs(4)) - len(stripped.expandtabs(4))
+                       if stripped else None)
+        self.comment = bool(folding.comment and
+                            stripped.startswith(folding.comment))
+        self.delta = 0
+        if folding.begin and not self.comment:
+            self.delta = (len(folding.begin.findall(text)) -
+                          len(folding.end.findall(text)))
+
+
+# =============================================================================
+class Folding(QObject):
+    """Folding of the document of the QTextEdit."""
+
+    changed = pyqtSignal()  # the visibility of blocks was changed
+
+    # -------------------------------------------------------------------------
+    def __init__(self, textedit):
+        super(Folding, self).__init__(textedit)
+        self._textedit = textedit
+        self.version = 0
+        self.indent = False
+        self.comment = ""
+        self.begin = self.end = None
+        self._folded = 0  # count of folded regions
+        self._document = None  # the document with the folded regions
+        textedit.cursorPositionChanged.connect(self._cursor_moved)
+
+    # -------------------------------------------------------------------------
+    def set_rules(self, rules):
+        """Sets the rules (dict, see the module doc) or None to disable."""
+        self.unfold_all()
+        rules = rules or {}
+        self.version += 1  # the cached data of blocks is outdated
+        self.indent = rules.get("indent", False)
+        self.comment = rules.get("comment", "")
+        self.begin = self.end = None
+        if rules.get("begin"):
+            self.begin = re.compile(rules["begin"], re.IGNORECASE)
+            self.end = re.compile(rules["end"], re.IGNORECASE)
+        self.changed.emit()
+
+    # -------------------------------------------------------------------------
+    def enabled(self):
+        return bool(self.indent or self.comment or self.begin)
+
+    # -------------------------------------------------------------------------
+    def data(self, block):
+        """Returns FoldData of the block (computes it if the text changed)."""
+        text = block.text()
+        data = block_data(block, text)
+        if data.fold is None or data.fold.version != self.version:
+            data.fold = FoldData(text, self)
+        return data.fold
+
+    # -------------------------------------------------------------------------
+    def _next_indent(self, block):
+        """Returns the indent of the next not empty block (or None)."""
+        block = block.next()
+        while block.isValid():
+            indent = self.data(block).indent
+            if indent is not None:
+                return indent
+            block = block.next()
+        return None
+
+    # -------------------------------------------------------------------------
+    def is_foldable(self, block):
+        """The block starts a region (it is cheap: see only the neighbours)."""
+        if not self.enabled():
+            return False
+        data = self.data(block)
+        if self.begin and data.delta > 0:
+            return True
+        if self.indent and data.indent is not None:
+            indent = self._next_indent(block)
+            if indent is not None and indent > data.indent:
+                return True
+        if data.comment:
+            previous, following = block.previous(), block.next()
+            return (not (previous.isValid() and self.data(previous).comment)
+                    and following.isValid() and self.data(following).comment)
+        return False
+
+    # -------------------------------------------------------------------------
+    def is_folded(self, block):
+        data = block.userData()
+        return isinstance(data, BlockData) and data.folded
+
+    # -------------------------------------------------------------------------
+    def region(self, block):
+        """Returns the last block of the region started by the block."""
+        if not self.is_foldable(block):
+            return None
+        data = self.data(block)
+        last = None
+
+        if self.begin and data.delta > 0:
+            depth, last = data.delta, block.next()
+            while last.isValid():
+                depth += self.data(last).delta
+                if depth <= 0:
+                    return last
+                last = last.next()
+            return self._textedit.document().lastBlock()
+
+        if self.indent and data.indent is not None and \
+                (self._next_indent(block) or 0) > data.indent:
+            following = block.next()
+            while following.isValid():
+                indent = self.data(following).indent
+                if indent is not None:
+                    if indent <= data.indent:
+                        break
+                    last = following
+                following = following.next()
+            return last
+
+        following = block.next()
+        while following.isValid() and self.data(following).comment:
+            last, following = following, following.next()
+        return last
+
+    # -------------------------------------------------------------------------
+    def hidden_end(self, block):
+        """
+        Returns the last block hidden by the folded block (found by the
+        kept count of the hidden blocks, the region is not searched).
+        """
+        doc = block.document()
+        last = doc.findBlockByNumber(block.blockNumber() +
+                                     block_data(block).hidden)
+        if last.isValid() and not last.isVisible() and \
+                (not last.next().isValid() or last.next().isVisible()):
+            return last
+        # the count is outdated: the blocks are stepped
+        last = block
+        while last.next().isValid() and not last.next().isVisible():
+            last = last.next()
+        return last
+
+    # -------------------------------------------------------------------------
+    def fold(self, block):
+        last = self.region(block)
+        if last is None or self.is_folded(block):
+            return False
+        self._watch()
+        data = block_data(block)
+        data.folded = True
+        data.hidden = last.blockNumber() - block.blockNumber()
+        self._folded += 1
+
+        # the cursor can not stay in the hidden text
+        cursor = self._textedit.textCursor()
+        if block.blockNumber() < cursor.blockNumber() <= last.blockNumber():
+            cursor = QTextCursor(block)
+            cursor.movePosition(QTextCursor.EndOfBlock)
+            self._textedit.setTextCursor(cursor)
+
+        self._set_visible(block.next(), last, False)
+        return True
+
+    # -------------------------------------------------------------------------
+    def unfold(self, block):
+        if not self.is_folded(block):
+            return False
+        block_data(block).folded = False
+        self._folded -= 1
+        last = self.region(block)
+        if last is None:
+            # the text was changed and it is not a region now: show all the
+            # hidden blocks after it
+            following = block.next()
+            while following.isValid() and not following.isVisible():
+                last, following = following, following.next()
+        if last is not None:
+            self._set_visible(block.next(), last, True)
+        return True
+
+    # -------------------------------------------------------------------------
+    def toggle(self, block):
+        if not self.unfold(block):
+            self.fold(block)
+
+    # -------------------------------------------------------------------------
+    def unfold_all(self):
+        if not self._folded:
+            return
+        doc = self._textedit.document()
+        block = doc.begin()
+        while block.isValid():
+            block.setVisible(True)
+            if isinstance(block.userData(), BlockData):
+                block.userData().folded = False
+            block = block.next()
+        self._folded = 0
+        doc.markContentsDirty(0, doc.characterCount())
+        self.changed.emit()
+
+    # -------------------------------------------------------------------------
+    def _watch(self):
+        """Tracks the changes of the document (the QTextEdit may get
+        another one)."""
+        doc = self._textedit.document()
+        if doc is not self._document:
+            self._document = doc
+            self._folded = 0
+            doc.contentsChange.connect(self._contents_change)
+
+    # -------------------------------------------------------------------------
+    def _contents_change(self, position, removed, added):
+        """
+        Shows the hidden blocks left without the folded header (e.g. the
+        header is deleted or merged with the previous line) or out of its
+        changed region.
+        """
+        if self.sender() is not self._document or not self._folded:
+            return
+        # the nearest visible block above the change is the header
+        start = self._document.findBlock(position)
+        header = start
+        while not header.isVisible() and header.previous().isValid():
+            header = header.previous()
+        if not header.isVisible():
+            first = header  # the first block of the document
+        elif self.is_folded(header):
+            last = self.region(header)
+            if last is None:
+                self.unfold(header)  # it is not a region now
+                return
+            block_data(header).hidden = (last.blockNumber() -
+                                         header.blockNumber())
+            # the blocks inserted into the region are hidden too
+            block = header.next() if start == header else start
+            end = self._document.findBlock(position + added)
+            if end.blockNumber() > last.blockNumber():
+                end = last
+            if block.isValid() and block.blockNumber() <= end.blockNumber():
+                self._set_visible(block, end, False)
+            first = last.next()
+        else:
+            first = header.next()
+        if not first.isValid() or first.isVisible():
+            return
+
+        if not self.is_folded(header):
+            self._folded = max(0, self._folded - 1)  # the header is lost
+        last = first
+        while last.next().isValid() and not last.next().isVisible():
+            last = last.next()
+        self._set_visible(first, last, True)
+
+    # -------------------------------------------------------------------------
+    def _set_visible(self, block, last, visible):
+        """Shows or hides the blocks up to the last (the block of the
+        region), the folded regions inside stay hidden."""
+        start, stop = block.position(), last.position() + last.length()
+        while block.isValid() and block.position() < stop:
+            block.setVisible(visible)
+            if visible and self.is_folded(block):
+                inner = self.region(block)
+                if inner is not None:
+                    block = inner
+            block = block.next()
+        self._textedit.document().markContentsDirty(start, stop - start)
+        self.changed.emit()
+
+    # -------------------------------------------------------------------------
+    def _cursor_moved(self):
+        # e.g. the found text is in the folded region: show it
+        block = self._textedit.textCursor().block()
+        if block.isVisible() or not self._folded:
+            return
+
+        # the folded regions containing the block, the outer one is the last
+        headers, header = [], block.previous()
+        while header.isValid():
+            if self.is_folded(header):
+                last = self.region(header)
+                if last is not None and \
+                        last.blockNumber() >= block.blockNumber():
+                    headers.append(header)
+            if header.isVisible():
+                break
+            header = header.previous()
+        for header in reversed(headers):
+            self.unfold(header)
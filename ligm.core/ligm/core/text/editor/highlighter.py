@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Base class of the syntax highlighters built on the block lexer."""
+
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.Qt import (QSyntaxHighlighter, QTextLayout, QTextCharFormat,
+                      QTimer, QPoint, pyqtSignal)
+from ..format_cache import format_cache
+from .lexer import Lexer
+from ..spell.syntax_spell import SpellHighlighter, wrong_words
+
+
+# one worker is enough: the state of a block depends on the previous block,
+# so the blocks of a document are tokenized one after another
+_executor = ThreadPoolExecutor(max_workers=1)
+
+
+# =============================================================================
+def tokenize(lexer, texts):
+    """
+    Tokenizes the block texts. Returns the list of (spans, state), spans of
+    a block do not overlap.
+    """
+    result, state = [], 0
+    for text in texts:
+        spans, state = lexer.scan(text, state)
+        result.append((flatten(spans), state))
+    return result
+
+
+# =============================================================================
+def flatten(spans):
+    """
+    Removes overlaps of spans: as with setFormat(), a later span overrides
+    the earlier ones.
+    """
+    end = -1
+    for start, length, _ in spans:
+        if start < end:
+            break
+        end = start + length
+    else:
+        return spans  # no overlaps (the usual case)
+
+    result = []
+    for start, length, style in spans:
+        end, rest = start + length, []
+        for s, n, st in result:
+            if s + n <= start or s >= end:
+                rest.append((s, n, st))
+                continue
+            if s < start:
+                rest.append((s, start - s, st))
+            if s + n > end:
+                rest.append((end, s + n - end, st))
+        rest.append((start, length, style))
+        result = rest
+    return sorted(result)
+
+
+# =============================================================================
+class LexerHighlighter(QSyntaxHighlighter):
+    """
+    Syntax highlighter that delegates tokenizing to a Lexer.
+
+    Subclasses define ``styles`` (dict {style: QTextCharFormat}) and
+    override ``make_lexer`` (the lexer of the base class finds nothing). The
+    lexer is compiled once per class and is shared by all instances, so
+    creating a highlighter is cheap.
+
+    ``semantic`` is the class of the service of background analysis of the
+    document (see semantic.PythonSemantic), its spans are merged with the
+    spans of the lexer.
+
+    With ``set_spell`` the words of comments and strings are spell checked
+    in the same pass over the block.
+
+    Large documents (see ``highlight_document``) are tokenized in a worker
+    thread; the GUI thread only applies the ready formats, visible blocks
+    first, a range of blocks per pass of the event loop. Very large ones
+    can be highlighted only in the viewport (the blocks are formatted when
+    they are scrolled into the view).
+    """
+    styles = {}
+
+    # the class of the semantic analysis service (or None)
+    semantic = None
+
+    # the words of spans of these styles are spell checked
+    spell_styles = ("comment", "string", "string2")
+
+    # documents with more blocks are tokenized in the background
+    background_blocks = 5000
+    # formats of a large document are applied in about this count of passes
+    # of the event loop (each pass makes Qt update the layout once)
+    passes = 16
+
+    tokenized = pyqtSignal(int, object)  # job, list of (spans, state)
+
+    # -------------------------------------------------------------------------
+    def __init__(self, document):
+        QSyntaxHighlighter.__init__(self, document)
+        self.lexer = self.compiled_lexer()
+        self.spell = None
+        self._styles = self.styles  # with the formats of wrong words
+        self._semantic = self.semantic(self) if self.semantic else None
+
+        self._view = None       # QTextEdit to find visible blocks
+        self._job = 0           # number of the last background job
+        self._busy = False      # the background job is not finished
+        self._revision = -1     # revision of the document being tokenized
+        self._texts = None      # texts of blocks sent to the worker
+        self._results = None    # results of the worker
+        self._ranges = []       # ranges of blocks waiting for formats
+        self._refresh = None    # blocks to refresh after the background pass
+        self._refresh_ranges = []  # ranges of blocks waiting for refresh
+        self._viewport_only = False
+        self._skip = False      # highlightBlock does not change the blocks
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._apply_chunk)
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(0)
+        self._refresh_timer.timeout.connect(self._refresh_chunk)
+        self._viewport_timer = QTimer(self)
+        self._viewport_timer.setSingleShot(True)
+        self._viewport_timer.setInterval(0)
+        self._viewport_timer.timeout.connect(self._highlight_viewport)
+        self._skip_timer = QTimer(self)
+        self._skip_timer.setSingleShot(True)
+        self._skip_timer.setInterval(0)
+        self._skip_timer.timeout.connect(self._end_skip)
+        self.tokenized.connect(self._tokenized)
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def compiled_lexer(cls):
+        """Returns the lexer of the class (compiles it on first use)."""
+        if "_lexer" not in cls.__dict__:
+            cls._lexer = cls.make_lexer()
+        return cls._lexer
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def make_lexer(cls):
+        """Returns the new Lexer of the class."""
+        return Lexer()
+
+    # -------------------------------------------------------------------------
+    def set_spell(self, dictionary):
+        """
+        Sets the dictionary (SpellChecker) to check the words of comments and
+        strings, None disables checking. Call rehighlight() after it.
+        """
+        self.spell = dictionary
+        self._styles = dict(self.styles)
+        if dictionary is None:
+            return
+        for style in self.spell_styles:
+            if style in self.styles:
+                fmt = QTextCharFormat(self.styles[style])
+                fmt.merge(SpellHighlighter.char_format)
+                self._styles["spell " + style] = fmt
+
+    # -------------------------------------------------------------------------
+    def _owner(self):
+        """Key of the results in the format cache."""
+        if self.spell is None:
+            return self.lexer
+        return self.lexer, self.spell, getattr(self.spell, "version", 0)
+
+    # -------------------------------------------------------------------------
+    def _spell_spans(self, text, spans):
+        """Adds the spans of wrong words in comments and strings."""
+        if self.spell is None:
+            return spans
+        result = list(spans)
+        for start, length, style in flatten(spans):
+            if style in self.spell_styles:
+                result.extend(
+                    (pos, n, "spell " + style) for pos, n in
+                    wrong_words(self.spell, text, start, start + length))
+        return result
+
+    # -------------------------------------------------------------------------
+    def is_busy(self):
+        """Returns True while the document is highlighted in background."""
+        return self._busy
+
+    # -------------------------------------------------------------------------
+    def highlight_document(self, document, view=None, viewport_only=False):
+        """
+        Sets the document and highlights it: at once if it is small,
+        otherwise in the background (``view`` is the QTextEdit showing the
+        document, its visible blocks are formatted first). With
+        ``viewport_only`` only the visible blocks of the view are formatted.
+        """
+        self._set_view(view, viewport_only and view is not None)
+        self._stop()
+        self._skip_timer.stop()
+        self._skip = False
+        self.setDocument(document)
+        if document is None:
+            return
+        if self._viewport_only:
+            # setDocument() has scheduled the highlighting of all blocks,
+            # highlightBlock keeps their formats (the timer is started after
+            # it), the visible blocks are formatted by the timer
+            self._skip = True
+            self._viewport_timer.start()
+        elif document.blockCount() < self.background_blocks:
+            self.rehighlight()
+        else:
+            # the same, all blocks are formatted by the worker
+            self._skip = True
+            self._skip_timer.start()
+            self._start()
+
+    # -------------------------------------------------------------------------
+    def _set_view(self, view, viewport_only):
+        if self._viewport_only:
+            scrollbar = self._view.verticalScrollBar()
+            scrollbar.valueChanged.disconnect(self._schedule_viewport)
+            scrollbar.rangeChanged.disconnect(self._schedule_viewport)
+            self._viewport_timer.stop()
+        self._view, self._viewport_only = view, viewport_only
+        if viewport_only:
+            scrollbar = view.verticalScrollBar()
+            scrollbar.valueChanged.connect(self._schedule_viewport)
+            scrollbar.rangeChanged.connect(self._schedule_viewport)
+
+    # -------------------------------------------------------------------------
+    def _end_skip(self):
+        self._skip = False
+
+    # -------------------------------------------------------------------------
+    def _schedule_viewport(self, *_):
+        self._viewport_timer.start()
+
+    # -------------------------------------------------------------------------
+    def _highlight_viewport(self):
+        """Formats the visible blocks which were not highlighted yet."""
+        self._skip = False
+        doc = self.document()
+        if doc is None or not self._viewport_only:
+            return
+        first, last = self._visible_blocks()
+        block = doc.findBlockByNumber(first)
+        start = end = None
+        for number in range(first, last + 1):
+            if not block.isValid():
+                break
+            # the state of the highlighted block is not -1 (the state of
+            # previous not highlighted block is unknown, it is taken as 0)
+            if block.userState() == -1:
+                text = block.text()
+                spans, state = self._block_spans(
+                    text, max(block.previous().userState(), 0))
+                self._set_layout(block, self._semantic_spans(number, text,
+                                                             spans))
+                block.setUserState(state)
+                start = block.position() if start is None else start
+                end = block.position() + block.length()
+            block = block.next()
+        if start is not None:
+            doc.markContentsDirty(start, end - start)
+
+    # -------------------------------------------------------------------------
+    def _stop(self):
+        self._job += 1
+        self._busy = False
+        self._timer.stop()
+        self._texts = self._results = None
+
+    # -------------------------------------------------------------------------
+    def _start(self):
+        """Sends the texts of all blocks to the worker."""
+        self._stop()
+        self._busy = True
+        # the new pass formats all blocks
+        self._refresh, self._refresh_ranges = None, []
+        self._refresh_timer.stop()
+        doc = self.document()
+        self._revision = doc.revision()
+
+        texts, block = [], doc.begin()
+        while block.isValid():
+            texts.append(block.text())
+            block = block.next()
+        self._texts = texts
+
+        job = self._job
+        future = _executor.submit(tokenize, self.lexer, texts)
+        future.add_done_callback(lambda f: self._done(job, f))
+
+    # -------------------------------------------------------------------------
+    def _done(self, job, future):
+        """Called in the worker thread."""
+        try:
+            self.tokenized.emit(job, future.result())
+        except RuntimeError:  # pragma: no cover
+            pass  # the highlighter is already deleted
+
+    # -------------------------------------------------------------------------
+    def _tokenized(self, job, results):
+        if job != self._job:
+            return  # the result of the cancelled job
+        if self.document() is None:
+            self._stop()
+            return
+        if self.document().revision() != self._revision:
+            self._start()  # the text was changed while it was tokenized
+            return
+
+        self._results = results
+        count = len(results)
+        first, last = self._visible_blocks()
+        last = min(last + 1, count)
+        size = max(count // self.passes, 1)
+        self._ranges = [(first, last)] + [
+            (i, min(i + size, stop))
+            for begin, stop in ((last, count), (0, first))
+            for i in range(begin, stop, size)]
+        self._ranges.reverse()
+        self._timer.start()
+
+    # -------------------------------------------------------------------------
+    def _visible_blocks(self):
+        if self._view is None:
+            return 0, 0
+        viewport = self._view.viewport()
+        first = self._view.cursorForPosition(QPoint(0, 0))
+        last = self._view.cursorForPosition(
+            QPoint(viewport.width() - 1, viewport.height() - 1))
+        if first.blockNumber() > last.blockNumber():
+            # the layout is not finished yet, the hit test of the top gives
+            # the last laid out block
+            return 0, last.blockNumber()
+        return first.blockNumber(), last.blockNumber()
+
+    # -------------------------------------------------------------------------
+    def _apply_chunk(self):
+        doc = self.document()
+        if doc is None:
+            self._stop()
+            return
+        if doc.revision() != self._revision:
+            self._start()  # the text was changed, the results are outdated
+            return
+        if not self._ranges:
+            self._stop()
+            if self._refresh:
+                self.refresh_blocks(*self._refresh)
+            if self._semantic:
+                self._semantic.schedule()
+            return
+
+        # the formats are set to the layouts of blocks directly (as
+        # QSyntaxHighlighter does), rehighlightBlock() for every block would
+        # make Qt update the layout of the document every time
+        first, stop = self._ranges.pop()
+        if first >= stop:
+            return
+        results, texts = self._results, self._texts
+        block = doc.findBlockByNumber(first)
+        start = block.position()
+        for number in range(first, stop):
+            spans, state = results[number]
+            spans = self._spell_spans(texts[number], spans)
+            self._set_layout(block, self._semantic_spans(number, texts[number],
+                                                         spans))
+            block.setUserState(state)
+            end = block.position() + block.length()
+            block = block.next()
+        doc.markContentsDirty(start, end - start)
+
+        # marking changes the revision too, only edits between the passes
+        # make the results outdated
+        self._revision = doc.revision()
+
+    # -------------------------------------------------------------------------
+    def refresh_blocks(self, first, last):
+        """
+        Formats the blocks from first to last again without changing their
+        states (e.g. the semantic spans were changed).
+        """
+        doc = self.document()
+        if doc is None:
+            return
+        if self._busy:
+            # some blocks can be already formatted by the background pass
+            if self._refresh:
+                first = min(first, self._refresh[0])
+                last = max(last, self._refresh[1])
+            self._refresh = first, last
+            return
+        self._refresh = None
+
+        # large ranges are formatted in a few passes of the event loop
+        size = max(doc.blockCount() // self.passes, 1)
+        self._refresh_ranges.extend(reversed(
+            [(i, min(i + size, last + 1))
+             for i in range(first, last + 1, size)]))
+        self._refresh_timer.start()
+
+    # -------------------------------------------------------------------------
+    def _refresh_chunk(self):
+        doc = self.document()
+        if doc is None or not self._refresh_ranges:
+            self._refresh_ranges = []
+            self._refresh_timer.stop()
+            return
+
+        first, stop = self._refresh_ranges.pop()
+        block = doc.findBlockByNumber(first)
+        if not block.isValid():
+            return  # the blocks were removed
+        start = block.position()
+        previous = max(block.previous().userState(), 0)
+        for number in range(first, stop):
+            text = block.text()
+            spans, previous = self._block_spans(text, previous)
+            self._set_layout(block, self._semantic_spans(number, text, spans))
+            end = block.position() + block.length()
+            block = block.next()
+            if not block.isValid():
+                break
+        doc.markContentsDirty(start, end - start)
+
+    # -------------------------------------------------------------------------
+    def highlightBlock(self, text):
+        """Apply syntax highlighting to the given block of text."""
+        if self._skip:
+            self._keep_formats()
+            return
+        number = self.currentBlock().blockNumber()
+        if self._semantic:
+            self._semantic.schedule()
+
+        if self._busy:
+            results, texts = self._results, self._texts
+            if number < len(texts) and texts[number] == text:
+                if results is None:
+                    # not tokenized yet, the block keeps the old formats
+                    self._keep_formats()
+                    return
+                spans, state = results[number]
+                spans = self._spell_spans(text, spans)
+                self._set_formats(self._semantic_spans(number, text, spans))
+                self.setCurrentBlockState(state)
+                return
+
+        spans, state = self._block_spans(text,
+                                         max(self.previousBlockState(), 0))
+        self._set_formats(self._semantic_spans(number, text, spans))
+        self.setCurrentBlockState(state)
+
+    # -------------------------------------------------------------------------
+    def _keep_formats(self):
+        """
+        Sets the formats of the current block again (QSyntaxHighlighter
+        clears the formats not set by highlightBlock), the state is kept.
+        """
+        for fmt in self.currentBlock().layout().formats():
+            self.setFormat(fmt.start, fmt.length, fmt.format)
+
+    # -------------------------------------------------------------------------
+    def _block_spans(self, text, previous):
+        """Returns (spans, state) of the block."""
+        # blocks with the same text and the same previous state are
+        # formatted the same way (undo/redo, scrolling, copies of lines)
+        key = format_cache.key(self._owner(), text, previous)
+        cached = format_cache.get(key)
+        if cached is None:
+            spans, state = self.lexer.scan(text, previous)
+            spans = self._spell_spans(text, spans)
+            format_cache.put(key, spans, state)
+            return spans, state
+        return cached
+
+    # -------------------------------------------------------------------------
+    def block_spans(self, block):
+        """Returns the spans of the lexer (start, length, style) of the block
+        (they are usually taken from the format cache)."""
+        return self._block_spans(block.text(),
+                                 max(block.previous().userState(), 0))[0]
+
+    # -------------------------------------------------------------------------
+    def _semantic_spans(self, number, text, spans):
+        if self._semantic is None:
+            return spans
+        semantic = self._semantic.spans(number, text)
+        if not semantic:
+            return spans
+        return list(spans) + list(semantic)
+
+    # -------------------------------------------------------------------------
+    def _set_layout(self, block, spans):
+        """Sets the formats to the layout of the block directly."""
+        styles, ranges = self._styles, []
+        for pos, length, style in spans:
+            fmt = QTextLayout.FormatRange()
+            fmt.start, fmt.length, fmt.format = pos, length, styles[style]
+            ranges.append(fmt)
+        block.layout().setFormats(ranges)
+
+    # -------------------------------------------------------------------------
+    def _set_formats(self, spans):
+        styles = self._styles
+        for start, length, style in spans:
+            self.setFormat(start, length, styles[style])
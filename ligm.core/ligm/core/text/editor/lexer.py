@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Incremental block lexer for the syntax highlighters.
+
+The lexer works on one block (line) of text at a time. Constructs that can
+span several blocks (triple-quoted strings, ``/* */`` comments, ...) are
+described by regions, and the number of the open region is the outgoing
+state of the block. This is all that is needed to continue scanning the
+next block, so ``QSyntaxHighlighter`` stops rehighlighting at the first
+block whose outgoing state is unchanged.
+"""
+
+import re
+
+
+# =============================================================================
+class Region:
+    """
+    A construct that starts with ``start`` and lasts until ``end``.
+
+    ``end`` is matched (not searched) right after the opening delimiter and
+    must consume the body of the region together with the closing delimiter.
+    If it does not match, the region lasts until the end of the block and:
+      - for a multiline region the block ends inside the region;
+      - for a single-line region the block ends inside the region only if the
+        line ends with a backslash (``continuation``).
+    ``inner`` is a list of (pattern, style) highlighted inside the region.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, name, start, end, style, multiline=True,
+                 continuation=False, inner=(), flags=0):
+        self.name = name
+        self.start = start
+        self.end = re.compile(end, flags)
+        self.style = style
+        self.multiline = multiline
+        self.continuation = continuation
+        self.inner = [(re.compile(pat, flags), stl) for pat, stl in inner]
+
+
+# =============================================================================
+class Lexer:
+    """
+    Scanner of the block text.
+
+    ``tokens`` - list of (pattern, style) for single-line tokens,
+    ``keywords`` - dict {style: list of words},
+    ``regions`` - list of Region.
+    At the same position regions win over tokens and tokens win over keywords;
+    tokens are tried in the order of the list.
+    """
+
+    _CONTINUATION = re.compile(r"(?<!\\)(?:\\\\)*\\$")
+
+    # -------------------------------------------------------------------------
+    def __init__(self, tokens=(), keywords=None, regions=(),
+                 ignore_case=False):
+        self.regions = list(regions)
+        self._flags = re.IGNORECASE if ignore_case else 0
+
+        parts, self._groups = [], {}
+        for i, region in enumerate(self.regions):
+            parts.append(f"(?P<r{i}>{region.start})")
+            self._groups[f"r{i}"] = (region, i + 1)
+        for i, (pattern, style) in enumerate(tokens):
+            parts.append(f"(?P<t{i}>{pattern})")
+            self._groups[f"t{i}"] = (None, style)
+        for i, (style, words) in enumerate((keywords or {}).items()):
+            words = sorted(set(words), key=len, reverse=True)
+            words = "|".join(re.escape(w) for w in words)
+            parts.append(f"(?P<k{i}>\\b(?:{words})\\b)")
+            self._groups[f"k{i}"] = (None, style)
+
+        self._master = re.compile("|".join(parts) or "(?!)", self._flags)
+
+    # -------------------------------------------------------------------------
+    def scan(self, text, state=0):
+        """
+        Tokenize the text of one block. ``state`` is the outgoing state of
+        the previous block. Returns the list of spans (start, length, style)
+        and the outgoing state of this block.
+        """
+        spans = []
+        pos = 0
+
+        if 0 < state <= len(self.regions):
+            pos, state = self._region(text, 0, 0, self.regions[state - 1],
+                                      state, spans)
+            if state:
+                return spans, state
+        state = 0
+
+        master = self._master
+        groups = self._groups
+        length = len(text)
+        while pos < length:
+            match = master.search(text, pos)
+            if not match:
+                break
+            region, value = groups[match.lastgroup]
+            if region is None:
+                start, end = match.span()
+                if end > start:
+                    spans.append((start, end - start, value))
+                pos = end if end > start else end + 1
+                continue
+
+            pos, state = self._region(text, match.start(), match.end(),
+                                      region, value, spans)
+            if state:
+                break
+
+        return spans, state
+
+    # -------------------------------------------------------------------------
+    def _region(self, text, start, body, region, state, spans):
+        """
+        Highlight the region that starts at ``start`` (its body starts at
+        ``body``). Returns the position after the region and the state.
+        """
+        match = region.end.match(text, body)
+        if match:
+            end, state = match.end(), 0
+        else:
+            end = len(text)
+            if not region.multiline:
+                if not (region.continuation and
+                        self._CONTINUATION.search(text)):
+                    state = 0
+
+        if end > start:
+            spans.append((start, end - start, region.style))
+        for pattern, style in region.inner:
+            for m in pattern.finditer(text, body, end):
+                if m.end() > m.start():
+                    spans.append((m.start(), m.end() - m.start(), style))
+
+        return end, state
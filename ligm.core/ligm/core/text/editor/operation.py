@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Asynchronous operation of the editor (load_async, save_async).
+
+The function of the host is called in the GUI thread with the function
+"progress(percent)" and returns the result, the future
+(concurrent.futures.Future) or the awaitable (e.g. the coroutine). The
+future is waited and the awaitable is run (asyncio.run) in the worker
+thread, so the GUI thread is not blocked; the result is signaled by
+"finished" in the GUI thread.
+
+"progress" may be called in any thread, it returns False if the operation
+is cancelled (the long operation should stop then). The cancelled future
+and coroutine are cancelled too.
+"""
+
+import asyncio
+import inspect
+from concurrent.futures import Future, ThreadPoolExecutor, CancelledError
+from PyQt5.Qt import QObject, pyqtSignal
+
+
+_executor = ThreadPoolExecutor(max_workers=2)
+
+
+# =============================================================================
+class AsyncOperation(QObject):
+
+    progress = pyqtSignal(int)            # percent
+    finished = pyqtSignal(bool, object)   # success, result or error
+    _progress = pyqtSignal(int, int)      # job, percent
+    _result = pyqtSignal(int, bool, object)
+
+    # -------------------------------------------------------------------------
+    def __init__(self, parent=None):
+        super(AsyncOperation, self).__init__(parent)
+        self._job = 0           # number of the last operation
+        self._future = None     # waiting in the worker thread
+        self._pending = None    # the future or the awaitable of the host
+        self._task = None       # (loop, task) of the running awaitable
+        self._progress.connect(self._show_progress)
+        self._result.connect(self._finish)
+
+    # -------------------------------------------------------------------------
+    def is_running(self):
+        return self._future is not None
+
+    # -------------------------------------------------------------------------
+    def start(self, function):
+        """Calls function(progress), the previous operation is cancelled."""
+        self.cancel()
+        self._job += 1
+        job = self._job
+
+        def progress(percent):
+            if job != self._job:
+                return False
+            self._progress.emit(job, percent)
+            return True
+
+        try:
+            result = function(progress)
+        except Exception as err:
+            self._finish(job, False, err)
+            return
+        if not isinstance(result, Future) and not inspect.isawaitable(result):
+            self._finish(job, True, result)  # the synchronous function
+            return
+
+        self._pending = result
+        self._future = _executor.submit(self._wait, job, result)
+        self._future.add_done_callback(lambda f: self._done(job, f))
+
+    # -------------------------------------------------------------------------
+    def cancel(self):
+        """Cancels the operation ("finished" is emitted with the error)."""
+        if self._future is None:
+            return
+        self._job += 1
+        if isinstance(self._pending, Future):
+            self._pending.cancel()
+        if self._task is not None:
+            loop, task = self._task
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:  # pragma: no cover
+                pass  # the coroutine is already finished
+        self._future.cancel()
+        self._future = self._pending = self._task = None
+        self.finished.emit(False, CancelledError())
+
+    # -------------------------------------------------------------------------
+    def _wait(self, job, result):
+        """Called in the worker thread."""
+        if isinstance(result, Future):
+            return result.result()
+
+        async def run():
+            task = asyncio.ensure_future(result)
+            if job == self._job:
+                self._task = (asyncio.get_running_loop(), task)
+            return await task
+
+        return asyncio.run(run())
+
+    # -------------------------------------------------------------------------
+    def _done(self, job, future):
+        """Called in the worker thread."""
+        try:
+            self._result.emit(job, True, future.result())
+        except (CancelledError, asyncio.CancelledError):
+            pass  # "finished" is emitted by cancel()
+        except Exception as err:
+            try:
+                self._result.emit(job, False, err)
+            except RuntimeError:  # pragma: no cover
+                pass  # the editor is already deleted
+
+    # -------------------------------------------------------------------------
+    def _show_progress(self, job, percent):
+        if job == self._job:
+            self.progress.emit(percent)
+
+    # -------------------------------------------------------------------------
+    def _finish(self, job, success, result):
+        if job != self._job:
+            return  # the result of the cancelled operation
+        self._future = self._pending = self._task = None
+        self.progress.emit(100)
+        self.finished.emit(success, result)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Policy of the large documents: the expensive features of the editor are
+turned off or reduced when the loaded document is larger than the limits.
+
+  "line_numbers" - the line number area is hidden;
+  "current_line" - the current line is not highlighted;
+  "highlighting" - only the visible blocks are highlighted by the syntax
+                   highlighter, the spell checking of the rich text is
+                   turned off;
+  "margin_line"  - the margin line is not drawn;
+  "line_count"   - the status bar shows the count of blocks, not the count
+                   of lines of the layout (it needs the layout of the whole
+                   document).
+
+The limits are "TextEditor/LargeDocumentSize" (count of characters) and
+"TextEditor/LargeDocumentLines" (count of lines), 0 disables the limit.
+"TextEditor/LargeDocumentFeatures" is the list of reduced features (comma
+separated, all by default).
+"""
+
+FEATURES = ("line_numbers", "current_line", "highlighting", "margin_line",
+            "line_count")
+
+
+# =============================================================================
+class LargeDocumentPolicy:
+
+    # -------------------------------------------------------------------------
+    def __init__(self, config):
+        self._cfg = config
+
+    # -------------------------------------------------------------------------
+    def is_large(self, size, lines):
+        max_size = self._cfg.get("TextEditor/LargeDocumentSize", 0)
+        max_lines = self._cfg.get("TextEditor/LargeDocumentLines", 0)
+        return bool(max_size and size > max_size or
+                    max_lines and lines > max_lines)
+
+    # -------------------------------------------------------------------------
+    def reduced(self, document):
+        """Returns the set of features to reduce for the QTextDocument."""
+        if not self.is_large(document.characterCount(),
+                             document.blockCount()):
+            return set()
+        features = self._cfg.get(
+            "TextEditor/LargeDocumentFeatures", ",".join(FEATURES))
+        return {name.strip() for name in features.split(",")} & set(FEATURES)
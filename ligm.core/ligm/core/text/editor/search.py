@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Search engine of the text editor.
+
+The query (the literal text, the whole words or the Python regular
+expression) is compiled once and matched over the plain text of the whole
+document, so the matches may span several lines ("^" and "$" match at the
+lines, "\\n" matches the end of the line). The positions of the plain text
+are the positions of the document (QTextDocument.toPlainText keeps them).
+
+The table of matches (the spans sorted by position) of the last query is
+kept up to date with the changes of the document: only the changed blocks
+are searched again, the spans after them are shifted. The regular
+expression may match several lines, its table is searched again at the
+next use. The navigation (next, previous), highlighting and replacing
+reuse the table. The table is kept in the arrays of integers (the starts
+and the ends of the matches), so the thousands of matches take little
+memory; the selections of them are made only near the viewport.
+
+With the trigram index (see trigrams.py) the literal query is matched only
+in the blocks with its trigrams.
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from PyQt5.Qt import QObject, QTextCursor
+
+
+# the characters of QTextCursor.selectedText() as in the plain text
+PLAIN = str.maketrans({"\u2029": "\n", "\u2028": "\n", "\ufdd0": "\n",
+                       "\ufdd1": "\n", "\u00a0": " "})
+
+
+# =============================================================================
+class Query:
+
+    # -------------------------------------------------------------------------
+    def __init__(self, text, case_sensitive=False, regex=False,
+                 whole_word=False):
+        self.text = text
+        self.regex = regex
+        self.key = (text, case_sensitive, regex, whole_word)
+        self.pattern = None
+        self.error = ""  # the error of the regular expression
+
+        if not text:
+            return
+        pattern = text if regex else re.escape(text)
+        if whole_word:
+            pattern = rf"\b(?:{pattern})\b"
+        flags = re.MULTILINE
+        if not case_sensitive:
+            flags |= re.IGNORECASE
+        try:
+            self.pattern = re.compile(pattern, flags)
+        except re.error as err:
+            self.error = str(err)
+
+    # -------------------------------------------------------------------------
+    def replacement(self, match, replace_text):
+        """
+        The text to replace the match (with groups "\\1", "\\g<name>"),
+        re.error is raised for the invalid template (e.g. "\\q", "\\9").
+        """
+        if not self.regex:
+            return replace_text
+        try:
+            return match.expand(replace_text)
+        except IndexError as err:  # the unknown name of the group
+            raise re.error(str(err)) from err
+
+
+# =============================================================================
+class SearchEngine(QObject):
+
+    # -------------------------------------------------------------------------
+    def __init__(self, document, index=None):
+        super(SearchEngine, self).__init__(document)
+        self._document = document
+        self._index = index  # TrigramIndex or None
+        self._query = None
+        self._revision = None  # the revision of the table (None - to find)
+        self._starts = array("q")
+        self._ends = array("q")
+        document.documentLayout()  # the changes are signaled with the layout
+        document.contentsChange.connect(self._contents_change)
+
+    # -------------------------------------------------------------------------
+    def find(self, query):
+        """The spans (start, end) of the matches sorted by position."""
+        self._update(query)
+        return list(zip(self._starts, self._ends))
+
+    # -------------------------------------------------------------------------
+    def matches(self, query):
+        return Matches(self, query)
+
+    # -------------------------------------------------------------------------
+    def spans(self, query, first, last):
+        """The spans of the matches with the start in the range."""
+        self._update(query)
+        i = bisect_left(self._starts, first)
+        j = bisect_right(self._starts, last)
+        return zip(self._starts[i:j], self._ends[i:j])
+
+    # -------------------------------------------------------------------------
+    def count(self, query, first=0, last=None):
+        """The count of the matches (with the start in the range)."""
+        self._update(query)
+        if not first and last is None:
+            return len(self._starts)
+        if last is None:
+            return len(self._starts) - bisect_left(self._starts, first)
+        return bisect_right(self._starts, last) - bisect_left(
+            self._starts, first)
+
+    # -------------------------------------------------------------------------
+    def span(self, index):
+        """The span of the match of the last query by index."""
+        return self._starts[index], self._ends[index]
+
+    # -------------------------------------------------------------------------
+    def next(self, query, cursor, backward=False):
+        """
+        The index of the match after the selection of the QTextCursor
+        (before it if backward) or None.
+        """
+        self._update(query)
+        if backward:
+            idx = bisect_left(self._starts, cursor.selectionStart()) - 1
+            return idx if idx >= 0 else None
+        idx = bisect_left(self._starts, cursor.selectionEnd())
+        return idx if idx < len(self._starts) else None
+
+    # -------------------------------------------------------------------------
+    def index(self, query, start, end):
+        """The index of the match of the span (start, end) or None."""
+        self._update(query)
+        idx = bisect_left(self._starts, start)
+        if idx < len(self._starts) and self._starts[idx] == start and \
+                self._ends[idx] == end:
+            return idx
+        return None
+
+    # -------------------------------------------------------------------------
+    def match_at(self, query, start, end):
+        """The match (re.Match) of the span (start, end) or None."""
+        if self.index(query, start, end) is None:
+            return None
+        return query.pattern.search(self._document.toPlainText(), start)
+
+    # -------------------------------------------------------------------------
+    def replacements(self, query, replace_text):
+        """
+        The spans of all matches and the texts to replace them (re.error is
+        raised for the invalid template before the texts are made).
+        """
+        if not query.regex:
+            spans = self.find(query)
+            return spans, [replace_text] * len(spans)
+        matches = self._finditer(query, self._document.toPlainText())
+        if matches:
+            query.replacement(matches[0], replace_text)  # check the template
+        return ([m.span() for m in matches],
+                [query.replacement(m, replace_text) for m in matches])
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _finditer(query, text):
+        if not query.pattern:
+            return []
+        return [m for m in query.pattern.finditer(text)
+                if m.end() > m.start()]  # without empty matches
+
+    # -------------------------------------------------------------------------
+    def _update(self, query):
+        revision = self._document.revision()
+        if self._query is None or self._query.key != query.key or \
+                self._revision != revision:
+            self._starts, self._ends = array("q"), array("q")
+            numbers = self._candidates(query)
+            if numbers is not None:
+                self._find_in_blocks(query, numbers)
+            elif query.pattern:
+                text = self._document.toPlainText()
+                for start, end in map(re.Match.span,
+                                      query.pattern.finditer(text)):
+                    if end > start:
+                        self._starts.append(start)
+                        self._ends.append(end)
+            self._query, self._revision = query, revision
+
+    # -------------------------------------------------------------------------
+    def _candidates(self, query):
+        """The numbers of blocks to search by the index or None (all)."""
+        if self._index is None or query.regex or not query.pattern:
+            return None
+        numbers = self._index.candidates(query.text)
+        if numbers is None:
+            self._index.schedule()  # it is built on the first search
+        elif len(numbers) > self._document.blockCount() // 4:
+            return None  # the whole text is matched faster
+        return numbers
+
+    # -------------------------------------------------------------------------
+    def _find_in_blocks(self, query, numbers):
+        document = self._document
+        for number in numbers:
+            block = document.findBlockByNumber(number)
+            position = block.position()
+            text = block.text().translate(PLAIN)
+            for start, end in map(re.Match.span,
+                                  query.pattern.finditer(text)):
+                self._starts.append(position + start)
+                self._ends.append(position + end)
+
+    # -------------------------------------------------------------------------
+    def _contents_change(self, position, removed, added):
+        revision = self._document.revision()
+        if self._query is None or self._revision not in (revision,
+                                                         revision - 1):
+            self._revision = None  # the change is not followed
+            return
+        if self._query.regex:
+            self._revision = None  # the matches may span the changed blocks
+            return
+
+        # the changed blocks (the literal text is matched in the line)
+        size = self._document.characterCount() - 1
+        first = self._document.findBlock(min(position, size)).position()
+        end = self._document.findBlock(min(position + added, size))
+        end = min(end.position() + end.length() - 1, size)
+        delta = added - removed
+
+        cursor = QTextCursor(self._document)
+        cursor.setPosition(first)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        matches = self._finditer(
+            self._query, cursor.selectedText().translate(PLAIN))
+
+        # the matches of the changed blocks are replaced, the next ones are
+        # shifted
+        i = bisect_left(self._starts, first)
+        j = bisect_left(self._starts, end - delta)
+        starts = array("q", (m.start() + first for m in matches))
+        starts.extend(s + delta for s in self._starts[j:])
+        ends = array("q", (m.end() + first for m in matches))
+        ends.extend(e + delta for e in self._ends[j:])
+        self._starts[i:] = starts
+        self._ends[i:] = ends
+        self._revision = revision
+
+
+# =============================================================================
+class Matches:
+    """
+    The matches of the query found by the engine: the source of the spans
+    of ExtraSelections and of the counts of SearchOverview.
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, engine, query):
+        self._engine = engine
+        self._query = query
+
+    # -------------------------------------------------------------------------
+    def spans(self, first, last):
+        return self._engine.spans(self._query, first, last)
+
+    # -------------------------------------------------------------------------
+    def count(self, first=0, last=None):
+        return self._engine.count(self._query, first, last)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Extra selections of the QTextEdit by named layers.
+
+Every layer (current line, search hits, brackets, spell) is set on its own,
+the other layers are kept as they are. The layers are drawn in the order of
+LAYERS (the later ones over the earlier). The selections of a large layer
+(e.g. thousands of search hits) are passed to Qt only if they are near the
+viewport; they are passed again when the document is scrolled or resized.
+
+The layer of spans (set_spans) keeps no selections at all: its source gives
+the spans (start, end) of a range of positions (e.g. the table of matches of
+the search engine), only the spans near the viewport are made selections.
+"""
+
+from bisect import bisect_left, bisect_right
+from PyQt5.Qt import QObject, QTimer, QPoint, QTextEdit, QTextCursor, QEvent
+
+
+LAYERS = ("current_line", "search", "brackets", "spell")
+
+
+# =============================================================================
+class ExtraSelections(QObject):
+
+    # the layers with more selections are clipped to the viewport
+    clip_size = 500
+
+    # -------------------------------------------------------------------------
+    def __init__(self, textedit):
+        super(ExtraSelections, self).__init__(textedit)
+        self._textedit = textedit
+        self._layers = {name: [] for name in LAYERS}
+        self._sources = {}  # name: (source of spans, format)
+        self._made = {}  # name: ((range, revision), selections of spans)
+        self._starts = {}  # name: (revision, start positions of selections)
+        self._range = None  # the range of positions of the clipped layers
+
+        # the clipped layers are updated after scrolling
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._scrolled)
+        scrollbar = textedit.verticalScrollBar()
+        scrollbar.valueChanged.connect(self._schedule)
+        scrollbar.rangeChanged.connect(self._schedule)
+        textedit.viewport().installEventFilter(self)
+        textedit.textChanged.connect(self._text_changed)
+
+    # -------------------------------------------------------------------------
+    def set(self, **layers):
+        """
+        Sets the selections of the layers (name=selections sorted by
+        position), the selections of other layers are kept.
+        """
+        for name, selections in layers.items():
+            self._layers[name] = list(selections)
+            self._starts.pop(name, None)
+            self._sources.pop(name, None)
+            self._made.pop(name, None)
+        self._push()
+
+    # -------------------------------------------------------------------------
+    def set_spans(self, name, source, fmt):
+        """
+        Sets the layer of spans with the format (QTextCharFormat). The
+        source has the method spans(first, last), it returns the spans
+        (start, end) sorted by position with the start in the range.
+        """
+        self._layers[name] = []
+        self._starts.pop(name, None)
+        self._made.pop(name, None)
+        self._sources[name] = source, fmt
+        self._push()
+
+    # -------------------------------------------------------------------------
+    def get(self, name):
+        if name in self._sources:
+            size = self._textedit.document().characterCount()
+            return self._selections(name, 0, size)
+        return list(self._layers[name])
+
+    # -------------------------------------------------------------------------
+    def clear(self, name):
+        if self._layers[name] or name in self._sources:
+            self.set(**{name: []})
+
+    # -------------------------------------------------------------------------
+    def _push(self):
+        result, self._range = [], None
+        for name in LAYERS:
+            selections = self._layers[name]
+            if name in self._sources:
+                selections = self._spans(name)
+            elif len(selections) > self.clip_size:
+                selections = self._clip(name)
+            result.extend(selections)
+        self._textedit.setExtraSelections(result)
+
+    # -------------------------------------------------------------------------
+    def _spans(self, name):
+        """The selections of the layer of spans near the viewport."""
+        key = self._clip_range(), self._textedit.document().revision()
+        if self._made.get(name, (None,))[0] != key:
+            self._made[name] = key, self._selections(name, *key[0])
+        return self._made[name][1]
+
+    # -------------------------------------------------------------------------
+    def _selections(self, name, first, last):
+        """The selections of the spans of the layer in the range."""
+        source, fmt = self._sources[name]
+        document = self._textedit.document()
+        result = []
+        for start, end in source.spans(first, last):
+            selection = QTextEdit.ExtraSelection()
+            selection.format = fmt
+            selection.cursor = QTextCursor(document)
+            selection.cursor.setPosition(start)
+            selection.cursor.setPosition(end, QTextCursor.KeepAnchor)
+            result.append(selection)
+        return result
+
+    # -------------------------------------------------------------------------
+    def _clip_range(self):
+        if self._range is None:
+            self._range = self._visible_range()
+        return self._range
+
+    # -------------------------------------------------------------------------
+    def _clip(self, name):
+        """The selections of the layer near the viewport."""
+        first, last = self._clip_range()
+
+        # the positions of selections are changed with the text
+        revision = self._textedit.document().revision()
+        if self._starts.get(name, (None,))[0] != revision:
+            starts = [s.cursor.selectionStart() for s in self._layers[name]]
+            self._starts[name] = revision, starts
+        starts = self._starts[name][1]
+        return self._layers[name][bisect_left(starts, first):
+                                  bisect_right(starts, last)]
+
+    # -------------------------------------------------------------------------
+    def _viewport(self):
+        """Range of positions of the viewport."""
+        viewport = self._textedit.viewport()
+        first = self._textedit.cursorForPosition(QPoint(0, 0)).position()
+        last = self._textedit.cursorForPosition(
+            QPoint(viewport.width() - 1, viewport.height() - 1)).position()
+        if first > last:
+            first = 0  # the layout is not finished yet
+        return first, last
+
+    # -------------------------------------------------------------------------
+    def _visible_range(self):
+        """Range of positions of the viewport and a page before and after."""
+        first, last = self._viewport()
+        size = last - first
+        return first - size, last + size
+
+    # -------------------------------------------------------------------------
+    def _schedule(self, *_):
+        if self._sources or any(len(selections) > self.clip_size
+                                for selections in self._layers.values()):
+            self._timer.start()
+
+    # -------------------------------------------------------------------------
+    def _text_changed(self):
+        if self._sources:
+            self._range = None  # the spans of the sources are changed
+            self._timer.start()
+
+    # -------------------------------------------------------------------------
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize:
+            self._schedule()
+        return False
+
+    # -------------------------------------------------------------------------
+    def _scrolled(self):
+        first, last = self._viewport()
+        if self._range is None or first < self._range[0] or \
+                last > self._range[1]:
+            self._push()
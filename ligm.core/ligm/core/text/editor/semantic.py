@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Semantic highlighting of Python: definitions, parameters, imported and
+undefined names found by the ast module.
+
+The document is parsed in a separate process after a pause in editing
+(ast.parse holds the GIL, in a thread it would stop the GUI as well). The
+highlighter merges the ready spans of a block with the spans of its lexer.
+The spans of lines are moved with the lines inserted or removed above them,
+so they are kept until the next result.
+
+The names are looked up in the scopes of the module, functions, classes
+and comprehensions (the names of a class are not seen in its methods).
+"""
+
+import re
+import ast
+import builtins
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from PyQt5.Qt import QObject, QTimer, pyqtSignal
+
+
+_executor = None
+
+# base class of the patterns of "match" (python 3.10+)
+_PATTERN = getattr(ast, "pattern", ())
+
+
+# =============================================================================
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # the new process does not inherit the state of Qt
+        _executor = ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+# =============================================================================
+class _Scope:
+    """Names bound in the module, function, class or comprehension."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, parent=None, kind="module"):
+        self.parent = parent
+        self.kind = kind
+        self.bound = set()
+        self.imported = set()
+
+    # -------------------------------------------------------------------------
+    def lookup(self, name):
+        """Returns the scope binding the name (the names of the enclosing
+        classes are not seen, as in Python) or None."""
+        scope = self
+        while scope is not None:
+            if name in scope.bound and \
+                    (scope is self or scope.kind != "class"):
+                return scope
+            scope = scope.parent
+        return None
+
+
+# =============================================================================
+class _Collector(ast.NodeVisitor):
+    """Collects the spans of names of the module."""
+
+    # -------------------------------------------------------------------------
+    def __init__(self, lines):
+        self.lines = lines
+        self.spans = {}
+        self.scope = _Scope()
+        self.scope.bound.update(dir(builtins))
+        self.scope.bound.update({"__file__", "__name__", "__doc__"})
+        self.loads = []  # (node, scope)
+
+    # -------------------------------------------------------------------------
+    def add(self, lineno, col, name, style):
+        """col is the offset in bytes of utf-8 (as in ast)."""
+        line = self.lines[lineno - 1]
+        if not line.isascii():
+            col = len(line.encode("utf-8")[:col].decode("utf-8", "ignore"))
+        self.spans.setdefault(lineno - 1, []).append((col, len(name), style))
+
+    # -------------------------------------------------------------------------
+    def find(self, node, name, pos, style=None):
+        """
+        Finds the whole word ``name`` in the lines of the node after pos
+        (lineno, col) and adds its span if the style is set. Returns the
+        position after the word (or pos if it is not found).
+        """
+        lineno, col = pos
+        word = re.compile(rf"\b{re.escape(name)}\b")
+        end = min(getattr(node, "end_lineno", None) or node.lineno,
+                  len(self.lines))
+        while lineno <= end:
+            match = word.search(self.lines[lineno - 1], col)
+            if match:
+                if style:
+                    self.spans.setdefault(lineno - 1, []).append(
+                        (match.start(), len(name), style))
+                return lineno, match.end()
+            lineno, col = lineno + 1, 0
+        return pos
+
+    # -------------------------------------------------------------------------
+    def visit_scope(self, node, kind, fields):
+        """Visits the fields of the node in the new scope."""
+        self.scope = _Scope(self.scope, kind)
+        for field in fields:
+            value = getattr(node, field, None)
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, ast.AST):
+                    self.visit(item)
+        self.scope = self.scope.parent
+
+    # -------------------------------------------------------------------------
+    def visit_FunctionDef(self, node):
+        self.scope.bound.add(node.name)
+        # the name follows "def" (decorators are on the previous lines)
+        self.find(node, node.name, (node.lineno, 0), "definition")
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        if isinstance(node, ast.ClassDef):
+            for base in node.bases + node.keywords:
+                self.visit(base)
+            self.visit_scope(node, "class", ["body"])
+        else:
+            self.visit_scope(node, "function", ["args", "returns", "body"])
+
+    visit_AsyncFunctionDef = visit_ClassDef = visit_FunctionDef
+
+    # -------------------------------------------------------------------------
+    def visit_Lambda(self, node):
+        self.visit_scope(node, "function", ["args", "body"])
+
+    # -------------------------------------------------------------------------
+    def visit_ListComp(self, node):
+        self.visit_scope(node, "comprehension",
+                         ["generators", "elt", "key", "value"])
+
+    visit_SetComp = visit_GeneratorExp = visit_DictComp = visit_ListComp
+
+    # -------------------------------------------------------------------------
+    def visit_NamedExpr(self, node):
+        # the target of ":=" in the comprehension is bound outside of it
+        scope = self.scope
+        while scope.kind == "comprehension":
+            scope = scope.parent
+        scope.bound.add(node.target.id)
+        self.visit(node.value)
+
+    # -------------------------------------------------------------------------
+    def visit_arg(self, node):
+        self.scope.bound.add(node.arg)
+        self.add(node.lineno, node.col_offset, node.arg, "parameter")
+        self.generic_visit(node)
+
+    # -------------------------------------------------------------------------
+    def visit_Import(self, node):
+        pos = (node.lineno, 0)
+        if isinstance(node, ast.ImportFrom):
+            pos = self.find(node, "import", pos)  # skip the name of module
+        for alias in node.names:
+            name = alias.asname or alias.name.split(".")[0]
+            if name == "*":
+                continue
+            self.scope.bound.add(name)
+            self.scope.imported.add(name)
+            pos = self.find(node, alias.asname or alias.name.split(".")[-1],
+                            pos, "imported")
+
+    visit_ImportFrom = visit_Import
+
+    # -------------------------------------------------------------------------
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.loads.append((node, self.scope))
+        else:
+            self.scope.bound.add(node.id)
+
+    # -------------------------------------------------------------------------
+    def visit_Global(self, node):
+        module = self.scope
+        while module.parent is not None:
+            module = module.parent
+        module.bound.update(node.names)
+        self.scope.bound.update(node.names)
+
+    # -------------------------------------------------------------------------
+    def visit_Nonlocal(self, node):
+        self.scope.bound.update(node.names)
+
+    # -------------------------------------------------------------------------
+    def visit_ExceptHandler(self, node):
+        if node.name:
+            self.scope.bound.add(node.name)
+        self.generic_visit(node)
+
+    # -------------------------------------------------------------------------
+    def generic_visit(self, node):
+        # names of patterns of "match" (MatchAs, MatchStar, MatchMapping)
+        for attr in ("name", "rest"):
+            value = getattr(node, attr, None)
+            if isinstance(value, str) and isinstance(node, _PATTERN):
+                self.scope.bound.add(value)
+        super().generic_visit(node)
+
+    # -------------------------------------------------------------------------
+    def result(self):
+        for node, scope in self.loads:
+            scope = scope.lookup(node.id)
+            if scope is None:
+                self.add(node.lineno, node.col_offset, node.id, "undefined")
+            elif node.id in scope.imported:
+                self.add(node.lineno, node.col_offset, node.id, "imported")
+        return {number: sorted(spans) for number, spans in self.spans.items()}
+
+
+# =============================================================================
+def analyze(source):
+    """
+    Returns {number of line: [(start, length, style)]} of the Python source
+    or None if the source has syntax errors. Styles: definition, parameter,
+    imported, undefined.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    collector = _Collector(source.split("\n"))
+    collector.visit(tree)
+    return collector.result()
+
+
+# =============================================================================
+class PythonSemantic(QObject):
+    """
+    Background semantic analysis of the document of the highlighter.
+    The analysis starts ``delay`` ms after the last change of the document.
+    """
+    delay = 700
+
+    analyzed = pyqtSignal(int, object)  # job, (source, result)
+
+    # -------------------------------------------------------------------------
+    def __init__(self, highlighter):
+        super(PythonSemantic, self).__init__(highlighter)
+        self._highlighter = highlighter
+        self._job = 0
+        self._source = None     # the last analyzed text
+        self._lines = {}        # {number: (text, spans)}
+        self._document = None   # the document of the lines
+        self._blocks = 0        # count of blocks of the document
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.delay)
+        self._timer.timeout.connect(self._start)
+        self.analyzed.connect(self._analyzed)
+
+    # -------------------------------------------------------------------------
+    def schedule(self):
+        """The document was changed: analyze it after a pause."""
+        self._watch()
+        self._timer.start()
+
+    # -------------------------------------------------------------------------
+    def _watch(self):
+        """Tracks the inserted and removed lines of the document (the
+        highlighter may get another one)."""
+        doc = self._highlighter.document()
+        if doc is not self._document:
+            self._document = doc
+            self._source, self._lines = None, {}
+            if doc is not None:
+                self._blocks = doc.blockCount()
+                doc.contentsChange.connect(self._contents_change)
+
+    # -------------------------------------------------------------------------
+    def _contents_change(self, position, removed, added):
+        """Moves the spans of the lines after the changed ones."""
+        doc = self._document
+        if self.sender() is not doc:
+            return
+        delta, self._blocks = doc.blockCount() - self._blocks, doc.blockCount()
+        if not delta or not self._lines:
+            return
+        start = doc.findBlock(position).blockNumber()
+        last = doc.findBlock(min(position + added,
+                                 doc.characterCount() - 1)).blockNumber()
+        lines = {}
+        for number, line in self._lines.items():
+            if number < start:
+                lines[number] = line
+            elif number > last - delta:
+                lines[number + delta] = line
+            else:
+                # the first and the last changed lines may keep their text
+                # (the spans are checked against it)
+                if number == start:
+                    lines[number] = line
+                if number == last - delta:
+                    lines.setdefault(last, line)
+        self._lines = lines
+
+    # -------------------------------------------------------------------------
+    def spans(self, number, text):
+        """Returns the spans of the block if its text is not changed."""
+        line = self._lines.get(number)
+        if line is None or line[0] != text:
+            return ()
+        return line[1]
+
+    # -------------------------------------------------------------------------
+    def _start(self):
+        doc = self._highlighter.document()
+        if doc is None:
+            return
+        source = doc.toPlainText()
+        if source == self._source:
+            return  # e.g. only the formats were changed
+
+        self._job += 1
+        job = self._job
+        try:
+            future = _get_executor().submit(analyze, source)
+        except RuntimeError:  # pragma: no cover
+            return  # the interpreter is shutting down
+        future.add_done_callback(lambda f: self._done(job, source, f))
+
+    # -------------------------------------------------------------------------
+    def _done(self, job, source, future):
+        """Called in the thread of the executor."""
+        try:
+            self.analyzed.emit(job, (source, future.result()))
+        except Exception:  # pragma: no cover
+            pass  # the worker is broken or the object is already deleted
+
+    # -------------------------------------------------------------------------
+    def _analyzed(self, job, data):
+        source, result = data
+        doc = self._highlighter.document()
+        if job != self._job or doc is None:
+            return
+        if result is None:
+            return  # syntax error: the lines not changed keep their spans
+        self._source = source
+
+        # only the blocks with other spans are formatted again
+        texts = source.split("\n")
+        lines = {number: (texts[number], spans)
+                 for number, spans in result.items()}
+        changed = {number for number in lines.keys() | self._lines.keys()
+                   if lines.get(number) != self._lines.get(number)}
+        self._lines = lines
+        if changed:
+            self._highlighter.refresh_blocks(min(changed), max(changed))
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Data-driven syntax highlighters.
+
+Every language is described by a JSON file in the ``languages`` directory:
+  "title"       - name of the language for the user;
+  "ignore_case" - keywords and patterns are case insensitive (optional);
+  "semantic"    - name of the semantic analysis (see SEMANTIC, optional);
+  "folding"     - rules of the code folding (see folding.py, optional);
+  "styles"      - {style: [color, "bold italic"]};
+  "keywords"    - {style: [list of words]};
+  "tokens"      - [[pattern, style], ...] single-line tokens;
+  "regions"     - [{"name", "start", "end", "style", "multiline",
+                    "continuation", "inner"}, ...] (see lexer.Region).
+Patterns use the syntax of the ``re`` module. The definition is compiled
+into a Lexer once per process (it takes about a millisecond: the patterns
+are compiled by ``re``, a cache of them on disk would be compiled again).
+"""
+
+import os
+import re
+import json
+from PyQt5.Qt import QColor, QTextCharFormat, QFont
+from .highlighter import LexerHighlighter
+from .lexer import Lexer, Region
+from .semantic import PythonSemantic
+
+
+LANGUAGES_DIR = os.path.join(os.path.dirname(__file__), "languages")
+
+# highlighter classes by the name of the language
+_classes = {}
+
+# services of the semantic analysis (the "semantic" of the definition)
+SEMANTIC = {"python": PythonSemantic}
+
+
+# =============================================================================
+def format_style(color, style=''):
+    """Return a QTextCharFormat with the given attributes."""
+    _color = QColor()
+    _color.setNamedColor(color)
+
+    _format = QTextCharFormat()
+    _format.setForeground(_color)
+    if 'bold' in style:
+        _format.setFontWeight(QFont.Bold)
+    if 'italic' in style:
+        _format.setFontItalic(True)
+
+    return _format
+
+
+# =============================================================================
+def languages(path=LANGUAGES_DIR):
+    """Returns the sorted list of names of the available languages."""
+    if not os.path.isdir(path):
+        return []
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(path)
+                  if name.endswith(".json"))
+
+
+# =============================================================================
+def compile_language(definition):
+    """Builds the Lexer from the definition of the language (dict)."""
+    ignore_case = definition.get("ignore_case", False)
+    flags = re.IGNORECASE if ignore_case else 0
+    regions = [Region(r["name"], r["start"], r["end"], r["style"],
+                      multiline=r.get("multiline", True),
+                      continuation=r.get("continuation", False),
+                      inner=[tuple(i) for i in r.get("inner", ())],
+                      flags=flags)
+               for r in definition.get("regions", ())]
+    return Lexer([tuple(t) for t in definition.get("tokens", ())],
+                 definition.get("keywords", {}), regions,
+                 ignore_case=ignore_case)
+
+
+# =============================================================================
+def load_language(name, path=LANGUAGES_DIR):
+    """
+    Loads the definition of the language and compiles it.
+    Returns (definition, lexer).
+    """
+    with open(os.path.join(path, f"{name.lower()}.json"), "rb") as f:
+        definition = json.loads(f.read().decode("utf-8"))
+    return definition, compile_language(definition)
+
+
+# =============================================================================
+class SyntaxHighlighter(LexerHighlighter):
+    """Highlighter of the language described by the definition file."""
+    language = ""
+    path = LANGUAGES_DIR
+    folding = None
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def make_lexer(cls):
+        return load_language(cls.language, cls.path)[1]
+
+
+# =============================================================================
+def highlighter_cls(name, path=LANGUAGES_DIR):
+    """
+    Returns the highlighter class for the language (or None if the language
+    is unknown). The class is created and compiled once per process.
+    """
+    key = (name.lower(), path)
+    if key not in _classes:
+        if not os.path.exists(os.path.join(path, f"{name.lower()}.json")):
+            return None
+        definition, lexer = load_language(name, path)
+        styles = {style: format_style(*value) for style, value in
+                  definition.get("styles", {}).items()}
+        title = definition.get("title", name)
+        _classes[key] = type(
+            f"{name.title()}Highlighter", (SyntaxHighlighter,),
+            {"__doc__": f"Syntax highlighter for the {title}.",
+             "language": name.lower(), "path": path,
+             "title": title, "styles": styles, "_lexer": lexer,
+             "semantic": SEMANTIC.get(definition.get("semantic")),
+             "folding": definition.get("folding")})
+    return _classes[key]
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Benchmark of scrolling the text editor (frames per second).
+
+  QT_QPA_PLATFORM=offscreen python -m ligm.core.text.editor.tests.bench_scroll
+
+Every frame scrolls the document by the step of the wheel (3 lines) and
+processes the events (the editor and the line number area are painted).
+"""
+
+import sys
+import time
+from PyQt5.Qt import QApplication
+from ligm.core.text import TextEditor
+from ligm.core.common import SimpleConfig as Config
+
+
+# =============================================================================
+def measure(lines=100_000, frames=500, highlighter="python"):
+    """Returns frames per second of scrolling the document of the lines."""
+    app = QApplication.instance() or QApplication(sys.argv)
+    text = "\n".join(f"def f{i}(x):  # line {i}" for i in range(lines))
+    editor = TextEditor(None, Config(), format="text", load=lambda: text)
+    editor.set_option(highlighter=highlighter)
+    editor.resize(800, 600)
+    editor.show()
+    editor.load()
+    while editor._highlighter_cls and editor._highlighter_cls.is_busy():
+        app.processEvents()  # the background highlighting
+    app.processEvents()
+
+    scrollbar = editor.view.text.verticalScrollBar()
+    step = scrollbar.singleStep() * 3
+    start = time.perf_counter()
+    for frame in range(frames):
+        scrollbar.setValue(scrollbar.value() + step)
+        app.processEvents()
+    return frames / (time.perf_counter() - start)
+
+
+# =============================================================================
+if __name__ == "__main__":
+    print(f"{measure():.1f} frames per second")
@@ -23,6 +23,14 @@ class TestEditor(IEditor):
     def load(self):
         super().load()
 
+    # -------------------------------------------------------------------------
+    def save_async(self):
+        super().save_async()
+
+    # -------------------------------------------------------------------------
+    def load_async(self):
+        super().load_async()
+
     # -------------------------------------------------------------------------
     def set_option(self, **options):
         super().set_option(**options)
@@ -62,6 +70,16 @@ class IEditorTest(unittest.TestCase):
     def test_load(self):
         self.assertIsNone(TestEditor().load())
 
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_save_async")
+    def test_save_async(self):
+        self.assertIsNone(TestEditor().save_async())
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_load_async")
+    def test_load_async(self):
+        self.assertIsNone(TestEditor().load_async())
+
     # -------------------------------------------------------------------------
     @unittest.skipIf(DEBUG, "test_set_option")
     def test_set_option(self):
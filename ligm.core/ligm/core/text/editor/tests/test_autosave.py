@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the automatic saving of the document."""
+
+import threading
+import time
+import unittest
+from PyQt5.Qt import QApplication, QTextCursor
+from ligm.core.text.editor.autosave import AutoSave
+from ligm.core.text.editor.doc import Doc
+from ligm.core.common import SimpleConfig as Config
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class AutoSaveTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        self.cfg = cfg = Config()
+        cfg["TextEditor/PlainText"] = 1
+        cfg["TextEditor/AutoSaveDelay"] = 10
+        cfg["TextEditor/AutoSaveMaxDelay"] = 50
+        self.doc = Doc(cfg)
+        self.written, self.saved, self.result = [], [], None
+        self.threads = set()
+        self.autosave = AutoSave(self.doc, cfg, self.write,
+                                 lambda: self.saved.append(True))
+
+    # -------------------------------------------------------------------------
+    def write(self, text):
+        self.threads.add(threading.current_thread())
+        self.written.append(text)
+        return self.result
+
+    # -------------------------------------------------------------------------
+    def type(self, text):
+        QTextCursor(self.doc.text).insertText(text)
+        self.autosave.touch()
+
+    # -------------------------------------------------------------------------
+    def wait(self):
+        while self.autosave.is_pending():
+            QApplication.processEvents()
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_debounce")
+    def test_debounce(self):
+        # the modifications are saved once, in the worker thread
+        enabled, status = [], []
+        self.doc.enabled_save.connect(enabled.append)
+        self.doc.changed_status.connect(status.append)
+        for char in "abc":
+            self.type(char)
+        self.assertEqual(self.written, [])
+        self.wait()
+        self.assertEqual(self.written, ["cba"])
+        self.assertNotIn(threading.current_thread(), self.threads)
+        self.assertFalse(self.doc.is_modified())
+        # the status and the button "Save" are updated
+        self.assertEqual(enabled, [False])
+        self.assertEqual(status[-1]["left"], "")
+
+        # the same text is not written again
+        self.type("x")
+        self.doc.text.undo()
+        self.autosave.touch()
+        self.wait()
+        self.assertEqual(self.written, ["cba"])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_max_delay")
+    def test_max_delay(self):
+        # the continuous typing is saved after the max delay
+        self.cfg["TextEditor/AutoSaveDelay"] = 10000
+        for i in range(30):
+            self.type(str(i % 10))
+            for _ in range(5):
+                QApplication.processEvents()
+            if self.written:
+                break
+            time.sleep(0.005)
+        self.wait()
+        self.assertEqual(len(self.written), 1)
+        self.assertLess(len(self.written[0]), 30)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_failed")
+    def test_failed(self):
+        # the document is modified after the failed write
+        self.result = OSError("disk is full")
+        results = []
+        self.autosave.saved.connect(results.append)
+        self.type("a")
+        self.wait()
+        self.assertTrue(self.doc.is_modified())
+        self.assertEqual(results, [False])
+
+        # the text is saved in the GUI thread
+        self.result = False
+        self.autosave.flush()
+        self.wait()
+        self.assertEqual(self.saved, [True])
+
+        # the written text is written again after the explicit saving
+        self.result = None
+        self.autosave.flush()
+        self.wait()
+        self.autosave.wait()
+        self.doc.text.setModified(True)
+        self.autosave.flush()
+        self.wait()
+        self.assertEqual(self.written, ["a"] * 4)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the matching of brackets."""
+
+import unittest
+from PyQt5.Qt import QTextEdit, QTextCursor
+from ligm.core.text.editor.brackets import BracketMatcher
+from ligm.core.text.editor.syntax import highlighter_cls
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+PYTHON = """x = f(a, [1, 2],
+      {3: (4)})  # (
+s = ")" + g(
+    "(", h())
+y = ]"""
+
+
+SQL = """BEGIN
+  select case when a then 1 end from t;
+  -- end
+END;"""
+
+
+# =============================================================================
+class BracketsTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def matcher(text, language):
+        textedit = QTextEdit()
+        textedit.setPlainText(text)
+        highlighter = highlighter_cls(language)(textedit.document())
+        matcher = BracketMatcher(textedit)
+        matcher.set_rules(highlighter, highlighter.folding)
+        return textedit, matcher
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def pos(textedit, line, column):
+        block = textedit.document().findBlockByNumber(line)
+        return block.position() + column
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_match")
+    def test_match(self):
+        textedit, matcher = self.matcher(PYTHON, "python")
+        pos = lambda line, column: self.pos(textedit, line, column)  # noqa
+
+        # the bracket after the cursor, then the bracket before it
+        self.assertEqual(matcher.match(pos(0, 5)),
+                         ((pos(0, 5), 1), (pos(1, 14), 1)))
+        self.assertEqual(matcher.match(pos(1, 15)),
+                         ((pos(1, 14), 1), (pos(0, 5), 1)))
+        self.assertEqual(matcher.match(pos(0, 9)),
+                         ((pos(0, 9), 1), (pos(0, 14), 1)))
+        self.assertEqual(matcher.match(pos(1, 10)),
+                         ((pos(1, 10), 1), (pos(1, 12), 1)))
+        self.assertIsNone(matcher.match(pos(0, 2)))
+
+        # the brackets in strings and comments are ignored
+        self.assertIsNone(matcher.match(pos(1, 19)))
+        self.assertEqual(matcher.match(pos(2, 11)),
+                         ((pos(2, 11), 1), (pos(3, 12), 1)))
+
+        # unmatched bracket
+        self.assertEqual(matcher.match(pos(4, 4)), ((pos(4, 4), 1), None))
+
+        matcher.set_rules(None)
+        self.assertFalse(matcher.enabled())
+        self.assertIsNone(matcher.match(pos(0, 5)))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_keywords")
+    def test_keywords(self):
+        textedit, matcher = self.matcher(SQL, "sql")
+        pos = lambda line, column: self.pos(textedit, line, column)  # noqa
+
+        self.assertEqual(matcher.match(pos(0, 2)),
+                         ((pos(0, 0), 5), (pos(3, 0), 3)))
+        self.assertEqual(matcher.match(pos(3, 1)),
+                         ((pos(3, 0), 3), (pos(0, 0), 5)))
+        self.assertEqual(matcher.match(pos(1, 9)),
+                         ((pos(1, 9), 4), (pos(1, 28), 3)))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_skip_blocks")
+    def test_skip_blocks(self):
+        text = "(\n" + "a(b)c\n" * 1000 + ")"
+        textedit, matcher = self.matcher(text, "python")
+        doc = textedit.document()
+        last = doc.lastBlock().position()
+        self.assertEqual(matcher.match(0), ((0, 1), (last, 1)))
+
+        # the cached summaries of the blocks are used again, only the
+        # changed block is scanned
+        data = matcher.data(doc.findBlockByNumber(500))
+        cursor = QTextCursor(doc.findBlockByNumber(700))
+        cursor.insertText(")")
+        self.assertIs(matcher.data(doc.findBlockByNumber(500)), data)
+        self.assertEqual(matcher.match(0)[1],
+                         (doc.findBlockByNumber(700).position(), 1))
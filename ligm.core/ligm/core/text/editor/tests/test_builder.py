@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the construction of the HTML document in the worker thread."""
+
+import base64
+import time
+import unittest
+from PyQt5.Qt import QApplication, QTextDocument, QTimer, QFont
+from ligm.core.text import TextEditor
+from ligm.core.text.editor.search import Query
+from ligm.core.text.editor.builder import (split_html, build_document,
+                                           build_async)
+from ligm.core.common import SimpleConfig as Config
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+IMAGE = base64.b64encode(b"\x89PNG" + b"x" * 3000).decode()
+
+SAMPLE = f"""<h1>Title</h1><p style="color:red">Red <b>bold</b></p>
+<p align="center">centered</p><ul><li>one</li><li>two<ul><li>nested</li>
+</ul></li></ul><ol><li>first</li></ol><table border="1"><tr><td><p>a</p>
+<p>a2</p></td><td>b</td></tr></table>
+<p><img src="data:image/png;base64,{IMAGE}"/> after image</p><p></p>
+<pre>code
+  line</pre><p>  spaces   here</p>"""
+
+
+# =============================================================================
+def qt_html(html):
+    """The HTML made by Qt (it is split by the builder)."""
+    document = QTextDocument()
+    document.setHtml(html)
+    return document.toHtml()
+
+
+# =============================================================================
+class BuilderTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        self.font = QFont("Arial", 11)
+        self.thread = QApplication.instance().thread()
+
+    # -------------------------------------------------------------------------
+    def set_html(self, html):
+        document = QTextDocument()
+        document.setDefaultFont(self.font)
+        document.setIndentWidth(30)
+        document.setHtml(html)
+        return document
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_split_html")
+    def test_split_html(self):
+        html = qt_html(SAMPLE * 3)
+        head, pieces = split_html(html, 1)
+        self.assertTrue(head.endswith(">"))
+        self.assertIn("<body", head)
+        self.assertGreater(len(pieces), 10)
+        self.assertTrue(html.startswith(head + "".join(pieces)))
+        for piece in pieces[1:]:
+            self.assertRegex(piece, r"^<(p|h1)[\s>]")
+        # the lists and the tables are not split
+        for piece in pieces:
+            self.assertEqual(piece.count("<ul"), piece.count("</ul>"))
+            self.assertEqual(piece.count("<table"), piece.count("</table>"))
+
+        self.assertEqual(len(split_html(html)[1]), 1)
+        # the HTML not made by Qt is not split
+        self.assertEqual(split_html(SAMPLE * 3, 1), ("", [SAMPLE * 3]))
+        self.assertEqual(split_html("text", 1), ("", ["text"]))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_build_document")
+    def test_build_document(self):
+        html = qt_html(SAMPLE * 3)
+        expected = self.set_html(html).toHtml()
+        for size in (1, 100, 500, 3000, 100_000):
+            document = build_document(html, self.font, 30, self.thread,
+                                      size=size)
+            self.assertEqual(document.toHtml(), expected)
+            self.assertFalse(document.isModified())
+            self.assertFalse(document.isUndoAvailable())
+            self.assertIs(document.thread(), self.thread)
+
+        document = build_document(SAMPLE, self.font, 30, self.thread, size=1)
+        self.assertEqual(document.toHtml(), self.set_html(SAMPLE).toHtml())
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_build_async")
+    def test_build_async(self):
+        percents = []
+
+        def progress(percent):
+            percents.append(percent)
+            return len(percents) < 3
+
+        html = qt_html(SAMPLE * 3)
+        future = build_async(html, self.font, 30, self.thread)
+        self.assertEqual(future.result().toHtml(),
+                         self.set_html(html).toHtml())
+        # the building is cancelled
+        self.assertIsNone(build_document(html, self.font, 30, self.thread,
+                                         progress, size=1))
+        self.assertEqual(len(percents), 3)
+        self.assertEqual(percents, sorted(percents))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_editor")
+    def test_editor(self):
+        # 20 MB of HTML: the GUI thread is not blocked while it is built
+        text = "<p>Some <b>bold</b> text, <i>italic</i> words.</p>"
+        html = qt_html(text * 50 +
+                       f'<p><img src="data:image/png;base64,{IMAGE}"/></p>')
+        start, end = html.index("<body"), html.index("</body>")
+        start = html.index(">", start) + 1
+        count = 20_000_000 // (end - start)
+        html = html[:start] + html[start:end] * count + html[end:]
+
+        editor = TextEditor(None, Config(), load=lambda: html, spell=False)
+        results = []
+        editor.loaded.connect(results.append)
+        editor.load_async()
+        self.assertTrue(editor.is_busy())
+        self.assertTrue(editor.get_option("readonly"))
+
+        ticks = [time.perf_counter()]
+        timer = QTimer()
+        timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+        timer.start(10)
+        while editor.is_busy():
+            QApplication.processEvents()
+        timer.stop()
+
+        gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+        self.assertLess(max(gaps), 1.0)
+        self.assertEqual(results, [True])
+        self.assertFalse(editor.get_option("readonly"))
+        self.assertEqual(editor.doc.text.blockCount(), 51 * count)
+        self.assertIs(editor.view.text.document(), editor.doc.text)
+        self.assertFalse(editor.doc.is_modified())
+
+        # the search uses the new document
+        self.assertEqual(editor._search_engine.count(Query("italic")),
+                         50 * count)
+
+        # the building is cancelled
+        editor.load_async()
+        self.assertTrue(editor.is_busy())
+        editor.cancel_async()
+        self.assertFalse(editor.is_busy())
+        self.assertEqual(results, [True, False])
+        self.assertFalse(editor.get_option("readonly"))
@@ -6,7 +6,9 @@
 
 import unittest
 import re
-from PyQt5.Qt import (QFont, QTextCursor, QTextOption, Qt,
+import time
+from unittest.mock import patch
+from PyQt5.Qt import (QFont, QTextCursor, QTextOption, Qt, QApplication,
                       QColor, QTextCharFormat, QImage)
 from ligm.core.text.editor.doc import Doc
 from ligm.core.common import SimpleConfig as Config
@@ -569,6 +571,26 @@ class DocTest(unittest.TestCase):
         doc.replace("HELLO")
         self.assertTrue("HELLO" in doc.text.toHtml())
 
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_replace_spans")
+    def test_replace_spans(self):
+        doc = Doc(Config())
+        txt = "ab ab\nab"
+        doc.text.setPlainText(txt)
+        doc.replace_spans([(0, 2), (3, 5), (6, 8)], "XYZ")
+        self.assertEqual(doc.text.toPlainText(), "XYZ XYZ\nXYZ")
+        doc.text.undo()  # one step of undo
+        self.assertEqual(doc.text.toPlainText(), txt)
+
+        # the plain text with many spans is replaced at once
+        doc.text.setPlainText(txt * 1000)
+        spans = [(i * 8 + j, i * 8 + j + 2) for i in range(1000)
+                 for j in (0, 3, 6)]
+        doc.replace_spans(spans, "-", plain=True)
+        self.assertEqual(doc.text.toPlainText(), "- -\n-" * 1000)
+        doc.text.undo()
+        self.assertEqual(doc.text.toPlainText(), txt * 1000)
+
     # -------------------------------------------------------------------------
     @unittest.skipIf(DEBUG, "test_ins_date")
     def test_ins_date(self):
@@ -692,3 +714,39 @@ class DocTest(unittest.TestCase):
         self.assertEqual(width, 10)
         self.assertEqual(height, 15)
         self.assertTrue("QPixmap" in str(type(image)))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_schedule_change")
+    def test_schedule_change(self):
+        doc = Doc(Config())
+        doc.text.setPlainText("1 row\n2 row")
+        result = []
+        doc.changed_status.connect(lambda param: result.append(param))
+
+        # the changes are coalesced into one update of the status
+        cursor = QTextCursor(doc.text)
+        for _ in range(10):
+            cursor.insertText("x")
+            doc.schedule_change(cursor)
+        self.assertEqual(result, [])
+        start = time.time()
+        while not result and time.time() - start < 10:
+            QApplication.processEvents()
+        self.assertEqual(result, [{"left": "The document is not saved",
+                                   "right": "1 : 11 [2]"}])
+
+        # the lines are not counted again, the count is kept up to date
+        result.clear()
+        with patch.object(doc.text, "lineCount") as line_count:
+            cursor.insertText("y")
+            doc.change(cursor)
+            cursor.insertText("\n\nz\n")
+            doc.change(cursor)
+            cursor.movePosition(QTextCursor.Start)
+            cursor.movePosition(QTextCursor.Down, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+            doc.change(cursor)
+            self.assertFalse(line_count.called)
+        self.assertEqual([status["right"] for status in result],
+                         ["1 : 12 [2]", "4 : 1 [5]", "1 : 1 [4]"])
+        self.assertEqual(doc.text.lineCount(), 4)
@@ -8,14 +8,16 @@ import sys
 import re
 import unittest
 import time
+from concurrent.futures import Future
 from unittest.mock import patch
 from PyQt5.Qt import (
     QColor, QMouseEvent, QEvent, QMessageBox, Qt, QPoint, QImage, QHBoxLayout,
-    QApplication, QCoreApplication, QFileDialog)
+    QApplication, QCoreApplication, QFileDialog, QTextCursor, QTabWidget)
 from ligm.core.text import TextEditor
 from ligm.core.qt import QTestHelper, TestableWidget, diff
 from ligm.core.common import SimpleConfig as Config
 from ligm.core.text.editor.view import ImageSize
+from ligm.core.text.editor.policy import FEATURES
 from ligm.core.text.spell import SpellChecker
 
 
@@ -615,6 +617,103 @@ class EditorTest(unittest.TestCase):
         self.test.handle_popup_widget(spell_no)
         self.editor.view.text.customContextMenuRequested.emit(pos)
 
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_incremental_search")
+    def test_incremental_search(self):
+        controls = self.editor.view.search_replace.controls
+        info = controls["search-info"]
+        self.text.setPlainText("one two\ntwo three two")
+        self.text.moveCursor(QTextCursor.Start)
+        controls["search-edit"].clear()
+
+        self.test.key_clicks(controls["search-edit"], "tw")
+        self.assertTrue(self.editor._search_timer.isActive())
+        while self.editor._search_timer.isActive():
+            QApplication.processEvents()
+        self.assertEqual(info.text(), "1 of 3")
+        self.assertEqual(self.text.textCursor().selectedText(), "tw")
+        self.assertEqual(len(self.editor.view.selections.get("search")), 3)
+
+        # the search is refined, the match at the cursor is kept
+        self.test.key_clicks(controls["search-edit"], "o")
+        self.editor._search_timer.timeout.emit()
+        self.assertEqual(self.text.textCursor().selectionStart(), 4)
+        self.assertTrue(self.editor._search())
+        self.assertEqual(info.text(), "2 of 3")
+        self.assertTrue(self.editor._search(forward=True))
+        self.assertEqual(info.text(), "1 of 3")
+
+        # the changes of the text are followed by the matches
+        cursor = self.text.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(" two")
+        self.assertTrue(self.editor._search())
+        self.assertEqual(info.text(), "2 of 4")
+
+        self.test.key_clicks(controls["search-edit"], "x")
+        self.editor._search_timer.timeout.emit()
+        self.assertEqual(info.text(), "Nothing found :(")
+        controls["search-edit"].clear()
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_select_option")
+    def test_select_option(self):
+        self.text.setPlainText("one\u00a0two\nthree")
+        self.assertEqual(self.editor.get_option("plain_text"),
+                         "one two\nthree")
+        self.editor.set_option(select=(4, 7))
+        self.assertEqual(self.text.textCursor().selectedText(), "two")
+        self.editor.set_option(select=(8, 100))  # the end of the document
+        self.assertEqual(self.text.textCursor().selectedText(), "three")
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_async")
+    def test_async(self):
+        saved = []
+
+        async def load(progress):
+            progress(50)
+            return "async text"
+
+        def save(txt, progress):
+            future = Future()
+            future.set_result(saved.append(txt))
+            return future
+
+        editor = TextEditor(None, Config(), format="text", spell=False,
+                            load_async=load, save_async=save)
+        results, percents = [], []
+        editor.loaded.connect(lambda ok: results.append(("load", ok)))
+        editor.saved.connect(lambda ok: results.append(("save", ok)))
+        editor.progress.connect(lambda name, p: percents.append((name, p)))
+
+        editor.load_async()
+        while editor.is_busy():
+            QApplication.processEvents()
+        self.assertEqual(editor.get_text(), "async text")
+        self.assertEqual(results, [("load", True)])
+        self.assertEqual(percents, [("load", 50), ("load", 100)])
+
+        editor.view.text.moveCursor(QTextCursor.End)
+        editor.view.text.insertPlainText("!")
+        editor.save_async()
+        while editor.is_busy():
+            QApplication.processEvents()
+        self.assertEqual(saved, ["async text!"])
+        self.assertEqual(results[-1], ("save", True))
+        self.assertFalse(editor.doc.is_modified())
+
+        # the synchronous callbacks are used without the asynchronous ones
+        editor = TextEditor(None, Config(), format="text", spell=False,
+                            load=lambda: "sync text", save=lambda txt: False)
+        editor.saved.connect(lambda ok: results.append(("save", ok)))
+        editor.load_async()
+        self.assertEqual(editor.get_text(), "sync text")
+        editor.view.text.insertPlainText("!")
+        editor.save_async()
+        self.assertEqual(results[-1], ("save", False))
+        self.assertTrue(editor.doc.is_modified())
+
     # -------------------------------------------------------------------------
     @unittest.skipIf(DEBUG, "test_search_replace")
     def test_search_replace(self):
@@ -664,6 +763,25 @@ class EditorTest(unittest.TestCase):
         self.editor._replace_all()
         self.editor._view.show_hide_search_panel(Qt.Key_Escape)
 
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_replace_error")
+    def test_replace_error(self):
+        editor = TextEditor(None, Config(), format="text", spell=False,
+                            load=lambda: "x=1, y=22")
+        editor.load()
+        controls = editor._view.search_replace.controls
+        controls["search-edit"].setText(r"(\w)=(\d+)")
+        controls["regex-box"].setChecked(True)
+        for template in (r"\3", r"\q", r"C:\path"):
+            controls["replace-edit"].setText(template)
+            editor.view.text.moveCursor(QTextCursor.Start)
+            with patch.object(editor._view, "show_info") as show_info:
+                editor._replace_all()
+                self.assertTrue(editor._search())
+                editor._replace()
+            self.assertEqual(show_info.call_count, 2)
+            self.assertEqual(editor.get_text(), "x=1, y=22")
+
     # -------------------------------------------------------------------------
     @unittest.skipIf(DEBUG, "test_undo")
     def test_undo(self):
@@ -779,7 +897,7 @@ class EditorTest(unittest.TestCase):
 
         self.assertEqual(len(ok), 0)
         with patch.object(self.editor, '_rehighlight',
-                          side_effect=lambda: effect(ok)):
+                          side_effect=lambda *args: effect(ok)):
             self.editor._add_word_to_spell("hello")
 
         self.assertEqual(len(ok), 1)
@@ -814,6 +932,92 @@ class EditorTest(unittest.TestCase):
 
         self.assertEqual(len(ok), 1)
 
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_hidden_highlighter")
+    def test_hidden_highlighter(self):
+        ok = []
+
+        def effect(res):
+            res.append("OK")
+
+        self.widget.hide()
+        with patch.object(self.editor._highlighter_cls, 'rehighlight',
+                          side_effect=lambda: effect(ok)):
+            self.spell.set_enabled("eng", True)
+            self.spell.set_enabled("rus", True)
+            self.assertEqual(len(ok), 0)
+            self.widget.show()
+
+        self.assertEqual(len(ok), 1)
+
+        # the highlighter is attached when the editor is shown
+        self.widget.hide()
+        self.editor._set_format_html()
+        self.assertIsNone(self.editor._highlighter_cls.document())
+        self.widget.show()
+        self.assertIs(self.editor._highlighter_cls.document(),
+                      self.editor.doc.text)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_hidden_tabs")
+    def test_hidden_tabs(self):
+        # the tabs set up before the first show
+        tabs = QTabWidget()
+        editors = []
+        for _ in range(3):
+            editor = TextEditor(None, Config(), load=lambda: "x = 1\n" * 10,
+                                format="TEXT",
+                                spell=SpellChecker(enabled=True))
+            editor.set_option(highlighter="PYTHON")
+            editor.load()
+            tabs.addTab(editor, "")
+            editors.append(editor)
+        tabs.show()
+        QApplication.processEvents()
+
+        self.assertIsNone(editors[0]._dirty)
+        for editor in editors[1:]:
+            self.assertEqual(editor._dirty, (0, None))
+            self.assertIsNone(editor._highlighter_cls.document())
+
+        # the hidden tab is highlighted when it is shown
+        tabs.setCurrentIndex(1)
+        self.assertIsNone(editors[1]._dirty)
+        self.assertIs(editors[1]._highlighter_cls.document(),
+                      editors[1].doc.text)
+        self.assertIsNone(editors[2]._highlighter_cls.document())
+        tabs.hide()
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_dirty_blocks")
+    def test_dirty_blocks(self):
+        self.editor.set_option(highlighter="PYTHON")
+        self.text.setPlainText("a = 1\nb = 'wordx'\nc = 2\nd = 'wordx'\ne")
+        highlighter = self.editor._highlighter_cls
+        numbers = []
+
+        def rehighlight_block(block):
+            numbers.append(block.blockNumber())
+
+        # only the blocks with the added word are highlighted again
+        with patch.object(highlighter, "rehighlightBlock",
+                          side_effect=rehighlight_block), \
+                patch.object(self.spell, "add_word"):
+            self.editor._add_word_to_spell("wordx")
+            self.assertEqual(numbers, [1, 2, 3])
+
+            # the hidden editor highlights the dirty blocks when shown
+            numbers.clear()
+            self.widget.hide()
+            self.editor._add_word_to_spell("wordx")
+            self.editor._rehighlight(0, 1)
+            self.assertEqual(numbers, [])
+            self.assertEqual(self.editor._dirty, (0, 3))
+            self.widget.show()
+            self.assertEqual(numbers, [0, 1, 2, 3])
+            self.assertIsNone(self.editor._dirty)
+        self.editor.set_option(highlighter="")
+
     # -------------------------------------------------------------------------
     @unittest.skipIf(DEBUG, "test_set_format_text")
     def test_set_format_text(self):
@@ -845,7 +1049,62 @@ class EditorTest(unittest.TestCase):
         self.assertTrue(self.editor._doc.is_modified())
         self.editor.set_option(auto_save=1)
         self.editor._enabled_save(True)
+        self.assertTrue(self.editor._autosave.is_pending())
+        self.editor._autosave.flush()  # without the pause of typing
         self.assertFalse(self.editor._doc.is_modified())
 
         self.editor._enabled_save(old)
         self.editor.set_option(btn_save_visible=True)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_save_background")
+    def test_save_background(self):
+        written, results, enabled = [], [], []
+        editor = TextEditor(None, Config(), format="text", spell=False,
+                            save_background=written.append)
+        editor.saved.connect(results.append)
+        editor.enabled_save_signal.connect(enabled.append)
+        editor.set_option(auto_save=1)
+        editor.view.text.insertPlainText("text")
+        editor._autosave.flush()
+        while editor._autosave.is_pending():
+            QApplication.processEvents()
+        self.assertEqual(written, ["text"])
+        self.assertEqual(results, [True])
+        self.assertFalse(enabled[-1])
+        self.assertFalse(editor._actions["save"].isEnabled())
+        self.assertEqual(editor.view.status.controls["left"].text(), "")
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_large_document")
+    def test_large_document(self):
+        cfg, load = self.editor._cfg, self.editor._load
+        lines = cfg.get("TextEditor/LargeDocumentLines", 0)
+        status = self.editor.view.status.controls["center"]
+        cfg["TextEditor/LargeDocumentLines"] = 3
+        try:
+            self.editor._load = lambda: "<p>1</p><p>2</p><p>3</p><p>4</p>"
+            self.editor.load()
+            self.assertEqual(self.editor.get_option("reduced_features"),
+                             set(FEATURES))
+            self.assertEqual(self.editor.view.line_numbers.width(), 0)
+            self.assertIn("Large document", status.text())
+            self.assertFalse(self.editor.doc.count_lines)
+            self.assertIsNone(self.editor._highlighter_cls.document())
+
+            # the feature is enabled again for this document
+            self.editor.set_option(enable_feature="line_count")
+            self.assertTrue(self.editor.doc.count_lines)
+            self.assertNotIn("line_count",
+                             self.editor.get_option("reduced_features"))
+
+            self.editor._load = load
+            self.editor.load()
+            self.assertEqual(self.editor.get_option("reduced_features"),
+                             set())
+            self.assertNotIn("Large document", status.text())
+            self.assertIs(self.editor._highlighter_cls.document(),
+                          self.editor.doc.text)
+        finally:
+            cfg["TextEditor/LargeDocumentLines"] = lines
+            self.editor._load = load
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the code folding."""
+
+import unittest
+from PyQt5.Qt import QApplication, QTextEdit, QTextCursor
+from ligm.core.text.editor.folding import Folding
+from ligm.core.text.editor.syntax import highlighter_cls
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+PYTHON = """# comment 1
+# comment 2
+def f(x):
+
+    if x:
+        return 1
+    return 2
+y = 3"""
+
+
+SQL = """select case when a then 1 end from t;
+BEGIN
+  update t set a = 1;
+  begin
+    delete from t;
+  end;
+END;
+-- comment"""
+
+
+# =============================================================================
+class FoldingTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def folding(text, language):
+        textedit = QTextEdit()
+        textedit.setPlainText(text)
+        textedit.show()
+        folding = Folding(textedit)
+        folding.set_rules(highlighter_cls(language).folding)
+        return textedit, folding
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def visible(textedit):
+        block, result = textedit.document().begin(), []
+        while block.isValid():
+            if block.isVisible():
+                result.append(block.blockNumber())
+            block = block.next()
+        return result
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_regions")
+    def test_regions(self):
+        textedit, folding = self.folding(PYTHON, "python")
+        doc = textedit.document()
+        regions = {}
+        for number in range(doc.blockCount()):
+            last = folding.region(doc.findBlockByNumber(number))
+            if last is not None:
+                regions[number] = last.blockNumber()
+        self.assertEqual(regions, {0: 1, 2: 6, 4: 5})
+
+        textedit, folding = self.folding(SQL, "sql")
+        doc = textedit.document()
+        regions = {number: folding.region(doc.findBlockByNumber(number))
+                   for number in range(doc.blockCount())}
+        self.assertEqual({k: v.blockNumber() for k, v in regions.items()
+                          if v is not None}, {1: 6, 3: 5})
+
+        folding.set_rules(None)
+        self.assertFalse(folding.enabled())
+        self.assertIsNone(folding.region(doc.findBlockByNumber(1)))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_fold")
+    def test_fold(self):
+        textedit, folding = self.folding(PYTHON, "python")
+        doc = textedit.document()
+        block = doc.findBlockByNumber
+        QApplication.processEvents()
+        height = doc.documentLayout().documentSize().height()
+
+        # the cursor leaves the folded region
+        textedit.setTextCursor(QTextCursor(block(5)))
+        self.assertTrue(folding.fold(block(4)))
+        self.assertFalse(folding.fold(block(4)))
+        self.assertEqual(textedit.textCursor().blockNumber(), 4)
+        self.assertTrue(folding.fold(block(2)))
+        self.assertEqual(self.visible(textedit), [0, 1, 2, 7])
+        QApplication.processEvents()
+        self.assertLess(doc.documentLayout().documentSize().height(), height)
+
+        # the inner folded region stays hidden
+        folding.toggle(block(2))
+        self.assertEqual(self.visible(textedit), [0, 1, 2, 3, 4, 6, 7])
+        self.assertTrue(folding.is_folded(block(4)))
+
+        # the cursor in the hidden text opens the regions
+        folding.fold(block(2))
+        textedit.setTextCursor(QTextCursor(block(5)))
+        self.assertEqual(len(self.visible(textedit)), doc.blockCount())
+
+        folding.fold(block(0))
+        folding.fold(block(2))
+        folding.unfold_all()
+        self.assertEqual(len(self.visible(textedit)), doc.blockCount())
+        self.assertFalse(folding.is_folded(block(0)))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_lost_header")
+    def test_lost_header(self):
+        textedit, folding = self.folding(PYTHON, "python")
+        doc = textedit.document()
+        block = doc.findBlockByNumber
+        count = doc.blockCount()
+
+        # the header is deleted: its region is shown
+        folding.fold(block(4))
+        folding.fold(block(2))
+        cursor = QTextCursor(block(2))
+        cursor.movePosition(QTextCursor.NextBlock, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        self.assertEqual(self.visible(textedit), [0, 1, 2, 3, 5, 6])
+        self.assertTrue(folding.is_folded(block(3)))
+        doc.undo()
+        self.assertEqual(self.visible(textedit), [0, 1, 2, 3, 4, 6, 7])
+        self.assertFalse(folding.is_folded(block(2)))
+        folding.unfold(block(4))
+        self.assertEqual(len(self.visible(textedit)), count)
+
+        # the header is merged with the previous line
+        folding.fold(block(2))
+        cursor = QTextCursor(block(2))
+        cursor.deletePreviousChar()
+        self.assertEqual(len(self.visible(textedit)), count - 1)
+
+        # the header is not a region now
+        doc.undo()
+        folding.fold(block(4))
+        QTextCursor(block(4)).insertText("    ")
+        self.assertEqual(len(self.visible(textedit)), count)
+        self.assertFalse(folding.is_folded(block(4)))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_incremental")
+    def test_incremental(self):
+        textedit, folding = self.folding(PYTHON, "python")
+        doc = textedit.document()
+        block = doc.findBlockByNumber
+        data = [folding.data(block(i)) for i in range(doc.blockCount())]
+
+        # only the data of the changed block is computed again
+        cursor = QTextCursor(block(7))
+        cursor.insertText("    ")
+        self.assertEqual(folding.region(block(2)).blockNumber(), 7)
+        for i in range(7):
+            self.assertIs(folding.data(block(i)), data[i])
+        self.assertIsNot(folding.data(block(7)), data[7])
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the base class of the syntax highlighters."""
+
+import time
+import unittest
+from unittest.mock import patch
+from PyQt5.Qt import (QApplication, QTextCursor, QTextDocument, QTextEdit,
+                      QPlainTextDocumentLayout, QTextCharFormat, QTextLayout)
+from ligm.core.text.editor.highlighter import flatten, LexerHighlighter
+from ligm.core.text.editor.lexer import Lexer
+from ligm.core.text.editor.syntax_python import STYLES, PythonHighlighter
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class Highlighter(PythonHighlighter):
+    background_blocks = 100
+
+
+# =============================================================================
+class Dictionary:
+    version = 0
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def word_needs_no_verification(word):
+        return len(word) == 1
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def check_word(word):
+        return word != "bad"
+
+
+# =============================================================================
+class HighlighterTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    def wait(self, highlighter, timeout=30):
+        start = time.time()
+        while highlighter.is_busy():
+            if time.time() - start > timeout:  # pragma: no cover
+                self.fail("the highlighting was not finished")
+            QApplication.processEvents()
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def document(text):
+        doc = QTextDocument()
+        doc.setDocumentLayout(QPlainTextDocumentLayout(doc))
+        doc.setPlainText(text)
+        return doc
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def blocks(doc):
+        block = doc.begin()
+        while block.isValid():
+            yield block
+            block = block.next()
+
+    # -------------------------------------------------------------------------
+    def check(self, block, text, state):
+        """The formats of the block are the same as highlightBlock sets."""
+        self.assertEqual(block.userState(), state)
+        formats = [(block.text()[f.start: f.start + f.length],
+                    f.format.foreground().color().name())
+                   for f in block.layout().formats()]
+        self.assertEqual(formats, [(txt, STYLES[style].foreground()
+                                    .color().name()) for txt, style in text])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_flatten")
+    def test_flatten(self):
+        spans = [(0, 2, "a"), (2, 3, "b")]
+        self.assertIs(flatten(spans), spans)
+        self.assertEqual(flatten([(0, 10, "s"), (2, 3, "x"), (8, 4, "y")]),
+                         [(0, 2, "s"), (2, 3, "x"), (5, 3, "s"),
+                          (8, 4, "y")])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_small_document")
+    def test_small_document(self):
+        doc = self.document("x = 1\n" * 10)
+        highlighter = Highlighter(None)
+        highlighter.highlight_document(doc)
+        self.assertFalse(highlighter.is_busy())
+        self.check(doc.firstBlock(), [("1", "numbers")], 0)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_background")
+    def test_background(self):
+        doc = self.document("'''a\n" + "x = 1  # c\n" * 1000 + "'''")
+        highlighter = Highlighter(None)
+        highlighter.highlight_document(doc)
+        self.assertTrue(highlighter.is_busy())
+        self.wait(highlighter)
+
+        self.check(doc.firstBlock(), [("'''a", "string2")], 3)
+        self.check(doc.findBlockByNumber(500), [("x = 1  # c", "string2")], 3)
+        self.check(doc.lastBlock(), [("'''", "string2")], 0)
+
+        # an edit during the highlighting restarts it
+        highlighter.highlight_document(doc)
+        cursor = QTextCursor(doc)
+        cursor.insertText("#")
+        self.assertTrue(highlighter.is_busy())
+        self.wait(highlighter)
+
+        self.check(doc.firstBlock(), [("#'''a", "comment")], 0)
+        self.check(doc.findBlockByNumber(500),
+                   [("1", "numbers"), ("# c", "comment")], 0)
+        self.check(doc.lastBlock(), [("'''", "string2")], 3)
+
+        # the document is detached
+        highlighter.highlight_document(doc)
+        highlighter.highlight_document(None)
+        self.assertFalse(highlighter.is_busy())
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_base_class")
+    def test_base_class(self):
+        # the lexer of the base class finds nothing
+        self.assertIsInstance(LexerHighlighter.compiled_lexer(), Lexer)
+        doc = self.document("x = 1  # comment\ny = '2'")
+        highlighter = LexerHighlighter(None)
+        highlighter.highlight_document(doc)
+        self.wait(highlighter)
+        for block in self.blocks(doc):
+            self.check(block, [], 0)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_keep_formats")
+    def test_keep_formats(self):
+        doc = self.document("x = 1\n" * 1000)
+        block = doc.findBlockByNumber(500)
+        fmt = QTextLayout.FormatRange()
+        fmt.start, fmt.length, fmt.format = 4, 1, STYLES["numbers"]
+        block.layout().setFormats([fmt])
+        changes = []
+        doc.contentsChange.connect(lambda *args: changes.append(args))
+
+        # the blocks keep the formats until the worker formats them
+        highlighter = Highlighter(None)
+        with patch.object(highlighter, "_start"):
+            highlighter.highlight_document(doc)
+            for _ in range(5):
+                QApplication.processEvents()
+            self.assertEqual(changes, [])
+            self.check(block, [("1", "numbers")], -1)
+
+            highlighter._busy = True
+            highlighter._texts = [b.text() for b in self.blocks(doc)]
+            highlighter.rehighlightBlock(block)
+            self.check(block, [("1", "numbers")], -1)
+            highlighter._stop()
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_spell")
+    def test_spell(self):
+        text = "bad = 'a bad' + f'{bad}'  # bad\n'''\nbad\n'''"
+        for cls in (PythonHighlighter, Highlighter):
+            doc = self.document(text * 50)
+            highlighter = cls(None)
+            highlighter.set_spell(Dictionary())
+            highlighter.highlight_document(doc)
+            self.wait(highlighter)
+
+            spell = QTextCharFormat.SpellCheckUnderline
+            wrong = [(block.blockNumber(),
+                      block.text()[f.start: f.start + f.length])
+                     for block in (doc.firstBlock(), doc.findBlockByNumber(2))
+                     for f in block.layout().formats()
+                     if f.format.underlineStyle() == spell]
+            self.assertEqual(wrong, [(0, "bad"), (0, "bad"), (2, "bad")])
+            fmt = doc.firstBlock().layout().formats()[-1].format
+            self.assertEqual(fmt.foreground().color().name(),
+                             STYLES["comment"].foreground().color().name())
+
+            highlighter.set_spell(None)
+            highlighter.rehighlight()
+            self.assertEqual(len(doc.firstBlock().layout().formats()), 5)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_viewport_only")
+    def test_viewport_only(self):
+        view = QTextEdit()
+        view.setPlainText("x = 1\n" * 1000)
+        view.resize(300, 200)
+        view.show()
+        doc = view.document()
+        highlighter = Highlighter(None)
+        highlighter.highlight_document(doc, view, viewport_only=True)
+        self.assertFalse(highlighter.is_busy())
+        QApplication.processEvents()
+
+        # only the visible blocks are formatted
+        self.check(doc.firstBlock(), [("1", "numbers")], 0)
+        self.assertEqual(doc.lastBlock().layout().formats(), [])
+        view.moveCursor(QTextCursor.End)
+        QApplication.processEvents()
+        self.check(doc.lastBlock().previous(), [("1", "numbers")], 0)
+        self.assertEqual(doc.findBlockByNumber(500).layout().formats(), [])
+
+        # the edited block is highlighted at once
+        cursor = QTextCursor(doc.findBlockByNumber(500))
+        cursor.insertText("#")
+        self.check(doc.findBlockByNumber(500), [("#x = 1", "comment")], 0)
+
+        highlighter.highlight_document(doc, view)
+        self.wait(highlighter)
+        self.check(doc.findBlockByNumber(300), [("1", "numbers")], 0)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the block lexer."""
+
+import unittest
+from unittest.mock import patch
+from PyQt5.Qt import QTextDocument
+from ligm.core.text.editor.lexer import Lexer, Region
+from ligm.core.text.editor.syntax_python import PythonHighlighter
+from ligm.core.text.editor.syntax_sql import SQLHighlighter
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class LexerTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    @classmethod
+    def setUpClass(cls):
+        cls.python = PythonHighlighter(None).lexer
+        cls.sql = SQLHighlighter(None).lexer
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def styles(text, spans):
+        return [(text[s: s + n], style) for s, n, style in spans]
+
+    # -------------------------------------------------------------------------
+    def scan_lines(self, lexer, text):
+        state, result = 0, []
+        for line in text.split("\n"):
+            spans, state = lexer.scan(line, state)
+            result.append((self.styles(line, spans), state))
+        return result
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_tokens")
+    def test_tokens(self):
+        lexer = Lexer(tokens=[(r"#.*", "comment"), (r"\b[0-9]+\b", "num")],
+                      keywords={"kw": ["if", "else"]})
+        text = "if x1 == 12: # else"
+        spans, state = lexer.scan(text)
+        self.assertEqual(self.styles(text, spans),
+                         [("if", "kw"), ("12", "num"), ("# else", "comment")])
+        self.assertEqual(state, 0)
+
+        lexer = Lexer(keywords={"kw": ["select"]}, ignore_case=True)
+        spans, _ = lexer.scan("SeLeCt 1")
+        self.assertEqual(spans, [(0, 6, "kw")])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_regions")
+    def test_regions(self):
+        lexer = Lexer(regions=[
+            Region("<", "<", "[^>]*>", "tag"),
+            Region('"', '"', r'(?:[^"\\]|\\.)*"', "str", multiline=False,
+                   continuation=True, inner=[(r"\$\w+", "var")]),
+        ])
+        self.assertEqual(lexer.scan("a <b"), ([(2, 2, "tag")], 1))
+        self.assertEqual(lexer.scan("c> d", 1), ([(0, 2, "tag")], 0))
+        self.assertEqual(lexer.scan('"x $y" z'),
+                         ([(0, 6, "str"), (3, 2, "var")], 0))
+        # not closed single-line region: the state is reset ...
+        self.assertEqual(lexer.scan('"x'), ([(0, 2, "str")], 0))
+        # ... if the line is not continued with a backslash
+        self.assertEqual(lexer.scan('"x\\'), ([(0, 3, "str")], 2))
+        self.assertEqual(lexer.scan('x"', 2), ([(0, 2, "str")], 0))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_python_mixed_quotes")
+    def test_python_mixed_quotes(self):
+        text = ('x = """ it\'s \'\'\' inside\n'
+                'still """ + \'\'\' and " here\n'
+                '\'\'\' # comment\n'
+                'y = f"{a} b" + r\'\\d\' + bar"""\n'
+                'def f(): """doc""" ; \'""\'')
+        lines = self.scan_lines(self.python, text)
+
+        self.assertEqual(lines[0], ([('""" it\'s \'\'\' inside', "string2")],
+                                    4))
+        self.assertEqual(lines[1][0][0], ('still """', "string2"))
+        self.assertEqual(lines[1][0][1], ('\'\'\' and " here', "string2"))
+        self.assertEqual(lines[1][1], 3)
+        self.assertEqual(lines[2], ([("'''", "string2"),
+                                     ("# comment", "comment")], 0))
+        self.assertEqual(lines[3][0][:3], [('f"{a} b"', "string"),
+                                           ("{a}", "special"),
+                                           ("r'\\d'", "string")])
+        self.assertEqual(lines[3][1], 4)
+        self.assertEqual(lines[4], ([('def f(): """', "string2"),
+                                     ('""" ; \'""\'', "string2")], 4))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_python_escaped_quotes")
+    def test_python_escaped_quotes(self):
+        lines = self.scan_lines(self.python, 'a = """\\"""\n""" 1')
+        self.assertEqual(lines[0][1], 4)
+        self.assertEqual(lines[1], ([('"""', "string2"), ("1", "numbers")],
+                                    0))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_sql_regions")
+    def test_sql_regions(self):
+        text = ('select "Quoted\n'
+                'name" from t /* comment\n'
+                '"not a name" */ where a = \'it\'\'s\n'
+                '\' -- end')
+        lines = self.scan_lines(self.sql, text)
+        self.assertEqual(lines[0], ([("select", "keyword"),
+                                     ('"Quoted', "string")], 2))
+        self.assertEqual(lines[1], ([('name"', "string"),
+                                     ("from", "keyword"),
+                                     ("/* comment", "string2")], 1))
+        self.assertEqual(lines[2], ([('"not a name" */', "string2"),
+                                     ("where", "keyword"),
+                                     ("'it''s", "string")], 3))
+        self.assertEqual(lines[3], ([("'", "string"),
+                                     ("-- end", "comment")], 0))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_shared_lexer")
+    def test_shared_lexer(self):
+        doc = QTextDocument()
+        for cls in (PythonHighlighter, SQLHighlighter):
+            cls(None)  # the lexer is compiled by the first instance
+
+            # the next instances share the rule tables of the class
+            with patch.object(cls, "make_lexer") as make_lexer:
+                highlighters = [cls(doc) for _ in range(100)]
+                self.assertFalse(make_lexer.called)
+            self.assertIs(highlighters[0].lexer, highlighters[-1].lexer)
+            self.assertIs(highlighters[0].styles, highlighters[-1].styles)
+            self.assertIs(highlighters[0].lexer, cls.compiled_lexer())
+            for highlighter in highlighters:
+                highlighter.setDocument(None)
+
+        self.assertIsNot(PythonHighlighter.compiled_lexer(),
+                         SQLHighlighter.compiled_lexer())
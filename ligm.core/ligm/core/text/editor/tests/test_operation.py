@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the asynchronous operations of the editor."""
+
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from PyQt5.Qt import QApplication
+from ligm.core.text.editor.operation import AsyncOperation
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class AsyncOperationTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        self.operation = AsyncOperation()
+        self.results, self.percents = [], []
+        self.operation.finished.connect(
+            lambda ok, result: self.results.append((ok, result)))
+        self.operation.progress.connect(self.percents.append)
+
+    # -------------------------------------------------------------------------
+    def wait(self):
+        while self.operation.is_running():
+            QApplication.processEvents()
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_sync")
+    def test_sync(self):
+        self.operation.start(lambda progress: "text")
+        self.assertFalse(self.operation.is_running())
+        self.assertEqual(self.results, [(True, "text")])
+
+        self.operation.start(lambda progress: 1 / 0)
+        self.assertFalse(self.results[-1][0])
+        self.assertIsInstance(self.results[-1][1], ZeroDivisionError)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_future")
+    def test_future(self):
+        threads = []
+
+        def read(progress):
+            threads.append(threading.current_thread())
+            for percent in (10, 50):
+                progress(percent)
+            return "text"
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            self.operation.start(lambda progress: executor.submit(
+                read, progress))
+            self.wait()
+        self.assertEqual(self.results, [(True, "text")])
+        self.assertEqual(self.percents, [10, 50, 100])
+        self.assertNotIn(threading.current_thread(), threads)
+
+        def error(progress):
+            raise OSError("no file")
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            self.operation.start(lambda progress: executor.submit(
+                error, progress))
+            self.wait()
+        self.assertFalse(self.results[-1][0])
+        self.assertIsInstance(self.results[-1][1], OSError)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_coroutine")
+    def test_coroutine(self):
+        async def load(progress):
+            await asyncio.sleep(0.01)
+            progress(50)
+            return "text"
+
+        self.operation.start(load)
+        self.assertTrue(self.operation.is_running())
+        self.wait()
+        self.assertEqual(self.results, [(True, "text")])
+        self.assertEqual(self.percents, [50, 100])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_cancel")
+    def test_cancel(self):
+        cancelled = []
+        started = threading.Event()
+
+        async def load(progress):
+            try:
+                started.set()
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        self.operation.start(load)
+        started.wait(5)
+        self.operation.cancel()
+        self.assertFalse(self.operation.is_running())
+        self.assertFalse(self.results[0][0])
+        self.assertIsInstance(self.results[0][1], CancelledError)
+        for _ in range(100):
+            QApplication.processEvents()
+            if cancelled:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(cancelled, [True])
+        self.assertEqual(len(self.results), 1)
+
+        # the progress of the cancelled operation returns False
+        progress_results = []
+        release = threading.Event()
+
+        def read(progress):
+            release.wait(5)
+            progress_results.append(progress(10))
+            return "old"
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            self.operation.start(lambda progress: executor.submit(
+                read, progress))
+            self.operation.start(lambda progress: "new")
+            release.set()
+        for _ in range(10):
+            QApplication.processEvents()
+        self.assertEqual(progress_results, [False])
+        self.assertEqual(self.results[-1], (True, "new"))
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the search engine of the text editor."""
+
+import re
+import unittest
+from PyQt5.Qt import QTextDocument, QTextCursor
+from ligm.core.text.editor.search import Query, SearchEngine
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class SearchEngineTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_query")
+    def test_query(self):
+        doc = QTextDocument()
+        doc.setPlainText("cat Cat\ncatalog cat.")
+        engine = SearchEngine(doc)
+
+        self.assertEqual(engine.count(Query("cat")), 4)
+        self.assertEqual(engine.count(Query("cat", True)), 3)
+        self.assertEqual(engine.find(Query("cat", whole_word=True)),
+                         [(0, 3), (4, 7), (16, 19)])
+        self.assertEqual(engine.find(Query("cat.", True)), [(16, 20)])
+        self.assertEqual(engine.count(Query("cat.", regex=True)), 3)
+
+        # the matches span the lines, "^" matches at the lines
+        self.assertEqual(engine.find(Query("Cat\\ncat", regex=True)),
+                         [(4, 11)])
+        self.assertEqual(engine.find(Query("^cat", True, True)),
+                         [(0, 3), (8, 11)])
+
+        # the empty matches are skipped, the wrong expression is not found
+        self.assertEqual(engine.find(Query("x*", regex=True)), [])
+        self.assertEqual(engine.find(Query("")), [])
+        query = Query("(cat", regex=True)
+        self.assertTrue(query.error)
+        self.assertEqual(engine.find(query), [])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_next")
+    def test_next(self):
+        doc = QTextDocument()
+        doc.setPlainText("ab ab ab")
+        engine = SearchEngine(doc)
+        query = Query("ab")
+
+        cursor = QTextCursor(doc)
+        cursor.setPosition(3)
+        cursor.setPosition(5, QTextCursor.KeepAnchor)
+        self.assertEqual(engine.next(query, cursor), 2)
+        self.assertEqual(engine.next(query, cursor, True), 0)
+        self.assertEqual(engine.span(2), (6, 8))
+        cursor.setPosition(0)
+        self.assertIsNone(engine.next(query, cursor, True))
+        cursor.setPosition(7)
+        self.assertIsNone(engine.next(query, cursor))
+
+        self.assertEqual(engine.index(query, 3, 5), 1)
+        self.assertIsNone(engine.index(query, 3, 4))
+        self.assertEqual(engine.match_at(query, 3, 5).span(), (3, 5))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_changes")
+    def test_changes(self):
+        doc = QTextDocument()
+        doc.setPlainText("ab cd\nab\ncd ab")
+        engine = SearchEngine(doc)
+        query = Query("ab")
+
+        def check():
+            # the table is changed by the changes, not found again
+            self.assertEqual(engine._revision, doc.revision())
+            spans = engine.find(query)
+            engine._revision = None
+            self.assertEqual(spans, engine.find(query))
+            return spans
+
+        self.assertEqual(engine.find(query), [(0, 2), (6, 8), (12, 14)])
+        cursor = QTextCursor(doc)
+        cursor.setPosition(3)
+        cursor.insertText("xab")
+        self.assertEqual(check(), [(0, 2), (4, 6), (9, 11), (15, 17)])
+        cursor.setPosition(1)
+        cursor.setPosition(10, QTextCursor.KeepAnchor)
+        cursor.insertText("")  # the blocks are removed
+        self.assertEqual(check(), [(0, 2), (6, 8)])
+        cursor.insertBlock()
+        cursor.insertText("ab")
+        self.assertEqual(check(), [(2, 4), (9, 11)])
+        while doc.isUndoAvailable():
+            doc.undo()
+        self.assertEqual(check(), [(0, 2), (6, 8), (12, 14)])
+        doc.setPlainText("ab\u00a0ab")
+        self.assertEqual(engine.find(Query("b a")), [(1, 4)])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_replacements")
+    def test_replacements(self):
+        doc = QTextDocument()
+        doc.setPlainText("x=1, y=22")
+        engine = SearchEngine(doc)
+
+        query = Query(r"(\w)=(?P<value>\d+)", regex=True)
+        self.assertEqual(engine.replacements(query, r"\g<value>:\1"),
+                         ([(0, 3), (5, 9)], ["1:x", "22:y"]))
+
+        # the groups are not expanded in the literal replacement
+        self.assertEqual(engine.replacements(Query("y"), r"\1"),
+                         ([(5, 6)], [r"\1"]))
+
+        # the invalid templates
+        for template in (r"\3", r"\q", r"C:\path", r"\g<name>"):
+            with self.assertRaises(re.error):
+                engine.replacements(query, template)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the layers of extra selections."""
+
+import unittest
+from PyQt5.Qt import QApplication, QTextEdit, QTextCursor, QTextCharFormat
+from ligm.core.text.editor.selections import ExtraSelections
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class ExtraSelectionsTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def selection(textedit, start, end):
+        selection = QTextEdit.ExtraSelection()
+        selection.cursor = QTextCursor(textedit.document())
+        selection.cursor.setPosition(start)
+        selection.cursor.setPosition(end, QTextCursor.KeepAnchor)
+        return selection
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def starts(textedit):
+        return [s.cursor.selectionStart() for s in textedit.extraSelections()]
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_layers")
+    def test_layers(self):
+        textedit = QTextEdit()
+        textedit.setPlainText("0123456789")
+        layers = ExtraSelections(textedit)
+
+        layers.set(search=[self.selection(textedit, 2, 3),
+                           self.selection(textedit, 5, 6)])
+        layers.set(current_line=[self.selection(textedit, 0, 0)])
+        self.assertEqual(self.starts(textedit), [0, 2, 5])
+
+        # the layers are drawn in their order, not in the order of setting
+        layers.set(spell=[self.selection(textedit, 1, 2)],
+                   brackets=[self.selection(textedit, 8, 9)])
+        self.assertEqual(self.starts(textedit), [0, 2, 5, 8, 1])
+
+        layers.clear("search")
+        self.assertEqual(self.starts(textedit), [0, 8, 1])
+        self.assertEqual(len(layers.get("spell")), 1)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_clip")
+    def test_clip(self):
+        textedit = QTextEdit()
+        textedit.setPlainText("x\n" * 5000)
+        textedit.resize(200, 200)
+        textedit.show()
+        textedit.document().lineCount()
+        QApplication.processEvents()
+
+        layers = ExtraSelections(textedit)
+        hits = [self.selection(textedit, i * 2, i * 2 + 1)
+                for i in range(5000)]
+        layers.set(search=hits)
+        starts = self.starts(textedit)
+        self.assertEqual(starts[0], 0)
+        self.assertLess(len(starts), 100)
+
+        # the selections near the new viewport are passed to Qt
+        textedit.moveCursor(QTextCursor.End)
+        for _ in range(3):
+            QApplication.processEvents()
+        starts = self.starts(textedit)
+        self.assertEqual(starts[-1], 9998)
+        self.assertLess(len(starts), 100)
+        self.assertEqual(len(layers.get("search")), 5000)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_spans")
+    def test_spans(self):
+        textedit = QTextEdit()
+        textedit.setPlainText("x\n" * 5000)
+        textedit.resize(200, 200)
+        textedit.show()
+        textedit.document().lineCount()
+        QApplication.processEvents()
+
+        class Source:
+            def __init__(self):
+                self.calls = []
+
+            def spans(self, first, last):
+                self.calls.append((first, last))
+                return [(i, i + 1) for i in range(max(first, 0), last + 1)
+                        if i % 2 == 0 and i < 10000]
+
+        source = Source()
+        layers = ExtraSelections(textedit)
+        layers.set_spans("search", source, QTextCharFormat())
+        starts = self.starts(textedit)
+        self.assertEqual(starts[0], 0)
+        self.assertLess(len(starts), 100)
+        self.assertEqual(len(layers.get("search")), 5000)
+
+        # the selections of the other layers do not make the spans again
+        calls = len(source.calls)
+        layers.set(current_line=[self.selection(textedit, 0, 0)])
+        self.assertEqual(len(source.calls), calls)
+
+        # the spans near the new viewport are made selections
+        textedit.moveCursor(QTextCursor.End)
+        for _ in range(3):
+            QApplication.processEvents()
+        starts = self.starts(textedit)
+        self.assertEqual(starts[-1], 9998)
+        self.assertLess(len(starts), 100)
+
+        layers.clear("search")
+        self.assertEqual(self.starts(textedit), [0])
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the semantic highlighting of Python."""
+
+import time
+import unittest
+from PyQt5.Qt import (QApplication, QTextCursor, QTextDocument,
+                      QPlainTextDocumentLayout)
+from ligm.core.text.editor.semantic import analyze
+from ligm.core.text.editor.syntax_python import STYLES, PythonHighlighter
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class SemanticTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def names(source):
+        lines = source.split("\n")
+        return {number: [(lines[number][s: s + n], style)
+                         for s, n, style in spans]
+                for number, spans in analyze(source).items()}
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_analyze")
+    def test_analyze(self):
+        self.assertIsNone(analyze("def ("))
+        self.assertEqual(self.names(
+            "import os, sys as system\n"
+            "from a.b import (c,\n"
+            "    d as e)\n"
+            "@dec\n"
+            "async def f(x, *args, y=1, **kw):\n"
+            "    return os.sep + system.argv[0] + c + e + z\n"
+            "class K:\n"
+            "    def m(self, ы):  # ё\n"
+            "        return ы, len(ы), K"), {
+            0: [("os", "imported"), ("system", "imported")],
+            1: [("c", "imported")],
+            2: [("e", "imported")],
+            3: [("dec", "undefined")],
+            4: [("f", "definition"), ("x", "parameter"),
+                ("args", "parameter"), ("y", "parameter"),
+                ("kw", "parameter")],
+            5: [("os", "imported"), ("system", "imported"),
+                ("c", "imported"), ("e", "imported"), ("z", "undefined")],
+            6: [("K", "definition")],
+            7: [("m", "definition"), ("self", "parameter"),
+                ("ы", "parameter")]})
+
+        # the names are bound in their scopes
+        self.assertEqual(self.names(
+            "def f():\n"
+            "    a = 1\n"
+            "    return a, b\n"
+            "def g():\n"
+            "    print(a, [c for c in a if (n := c)], n, c)\n"
+            "class K:\n"
+            "    z = 1\n"
+            "    def m(self):\n"
+            "        return z, K, lambda q: q + w\n"
+            "def h():\n"
+            "    global d\n"
+            "    import os\n"
+            "    d = os\n"
+            "b = d, os"), {
+            0: [("f", "definition")],
+            3: [("g", "definition")],
+            4: [("a", "undefined"), ("a", "undefined"), ("c", "undefined")],
+            5: [("K", "definition")],
+            7: [("m", "definition"), ("self", "parameter")],
+            8: [("z", "undefined"), ("q", "parameter"), ("w", "undefined")],
+            9: [("h", "definition")],
+            11: [("os", "imported")],
+            12: [("os", "imported")],
+            13: [("os", "undefined")]})
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_background")
+    def test_background(self):
+        doc = QTextDocument()
+        doc.setDocumentLayout(QPlainTextDocumentLayout(doc))
+        doc.setPlainText("import os\n\ndef f(x):\n    return os.sep + y")
+        highlighter = PythonHighlighter(doc)
+        semantic = highlighter._semantic
+        semantic._timer.setInterval(0)
+
+        def wait_for(style):
+            start = time.time()
+            while time.time() - start < 60:
+                QApplication.processEvents()
+                block = doc.lastBlock()
+                for f in block.layout().formats():
+                    if block.text()[f.start: f.start + f.length] == "y":
+                        if f.format == STYLES[style]:
+                            return
+            self.fail(f"no {style} format")  # pragma: no cover
+
+        wait_for("undefined")
+        self.assertEqual(semantic.spans(0, "import os"),
+                         [(7, 2, "imported")])
+        self.assertEqual(semantic.spans(0, "import sys"), ())
+
+        # the changed lines lose the spans, the lines below keep them, the
+        # new result replaces them
+        QTextCursor(doc).insertText("y = 1\n")
+        self.assertEqual(semantic.spans(0, "y = 1"), ())
+        self.assertEqual(semantic.spans(1, "import os"),
+                         [(7, 2, "imported")])
+        self.assertEqual(semantic.spans(4, doc.lastBlock().text()),
+                         [(11, 2, "imported"), (20, 1, "undefined")])
+        start = time.time()
+        while len(semantic.spans(4, doc.lastBlock().text())) != 1:
+            if time.time() - start > 60:  # pragma: no cover
+                self.fail("the document was not analyzed")
+            QApplication.processEvents()
+        self.assertEqual(semantic.spans(4, doc.lastBlock().text()),
+                         [(11, 2, "imported")])
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the data-driven syntax highlighters."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from ligm.core.text.editor.syntax import (languages, load_language,
+                                          highlighter_cls, LANGUAGES_DIR)
+from ligm.core.text.editor.syntax_python import PythonHighlighter
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class SyntaxTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    def scan(self, language, text):
+        lexer = highlighter_cls(language).compiled_lexer()
+        state, result = 0, []
+        for line in text.split("\n"):
+            spans, state = lexer.scan(line, state)
+            result.append(([(line[s: s + n], style) for s, n, style in spans],
+                           state))
+        return result
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_languages")
+    def test_languages(self):
+        names = languages()
+        for name in ("python", "sql", "json", "ini", "xml", "shell"):
+            self.assertIn(name, names)
+
+        for name in names:
+            cls = highlighter_cls(name)
+            self.assertIs(cls, highlighter_cls(name.upper()))
+            lexer = cls.compiled_lexer()
+            for _, _, style in lexer.scan("x = 'a' # 1 <b> -- c /* d")[0]:
+                self.assertIn(style, cls.styles)
+
+        self.assertIs(highlighter_cls("Python"), PythonHighlighter)
+        self.assertIsNone(highlighter_cls("unknown"))
+        self.assertEqual(languages("/not/existing/path"), [])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_json_ini")
+    def test_json_ini(self):
+        lines = self.scan("json", '{"key": "value", "n": -1.5e3, "b": null}')
+        self.assertEqual(lines[0][0], [('"key"', "defclass"),
+                                       ('"value"', "string"),
+                                       ('"n"', "defclass"),
+                                       ("-1.5e3", "numbers"),
+                                       ('"b"', "defclass"),
+                                       ("null", "keyword")])
+
+        lines = self.scan("ini", "[main]\n; comment\nname = 'x' 10")
+        self.assertEqual(lines[0][0], [("[main]", "keyword")])
+        self.assertEqual(lines[1][0], [("; comment", "comment")])
+        self.assertEqual(lines[2][0], [("name", "defclass"),
+                                       ("'x'", "string"), ("10", "numbers")])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_xml_shell")
+    def test_xml_shell(self):
+        lines = self.scan("xml", '<a href="x">&amp; <!-- c\n--></a>')
+        self.assertEqual(lines[0], ([("<a", "keyword"), ("href", "defclass"),
+                                     ('"x"', "string"), (">", "keyword"),
+                                     ("&amp;", "special"),
+                                     ("<!-- c", "comment")], 1))
+        self.assertEqual(lines[1], ([("-->", "comment"), ("</a", "keyword"),
+                                     (">", "keyword")], 0))
+
+        lines = self.scan("shell", 'if [ "$x" ]; then # c\ncat <<EOF\n'
+                                   'if $y\nEOF\necho ${z}')
+        self.assertEqual(lines[0][0], [("if", "keyword"), ('"$x"', "string"),
+                                       ("$x", "self"), ("then", "keyword"),
+                                       ("# c", "comment")])
+        self.assertEqual(lines[1], ([("<<EOF", "string2")], 3))
+        self.assertEqual(lines[2], ([("if $y", "string2")], 3))
+        self.assertEqual(lines[3], ([("EOF", "string2")], 0))
+        self.assertEqual(lines[4][0], [("echo", "special"), ("${z}", "self")])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_path")
+    def test_path(self):
+        path = tempfile.mkdtemp()
+        try:
+            definition, lexer = load_language("sql")
+            self.assertEqual(definition["title"], "SQL")
+            text = "select 'a' /* b"
+
+            # a new language without a new class
+            with open(os.path.join(LANGUAGES_DIR, "sql.json"), "rb") as f:
+                data = f.read()
+            with open(os.path.join(path, "mysql.json"), "wb") as f:
+                f.write(data)
+            cls = highlighter_cls("mysql", path=path)
+            self.assertEqual(cls.compiled_lexer().scan(text), lexer.scan(text))
+            self.assertIsNone(highlighter_cls("python", path=path))
+        finally:
+            shutil.rmtree(path)
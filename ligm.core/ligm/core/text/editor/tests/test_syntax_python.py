@@ -5,8 +5,9 @@
 """Test the editor GUI."""
 
 import unittest
-from PyQt5.Qt import QHBoxLayout, QTextCursor, Qt, QColor, QFont
-from ligm.core.text.editor.syntax_python import STYLES
+from PyQt5.Qt import (QHBoxLayout, QTextCursor, Qt, QColor, QFont,
+                      QTextDocument, QPlainTextDocumentLayout)
+from ligm.core.text.editor.syntax_python import STYLES, PythonHighlighter
 from ligm.core.text import TextEditor
 from ligm.core.qt import QTestHelper, TestableWidget
 from ligm.core.common import SimpleConfig as Config
@@ -99,3 +100,36 @@ class PythonHighlighterTest(unittest.TestCase):
     def test_match_multiline(self):
         """checked in test_highlightBlock"""
         pass
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_incremental_rehighlight")
+    def test_incremental_rehighlight(self):
+        """Editing of the first line does not rehighlight the document."""
+
+        class Counter(PythonHighlighter):
+            count = 0
+
+            def highlightBlock(self, text):
+                Counter.count += 1
+                PythonHighlighter.highlightBlock(self, text)
+
+        doc = QTextDocument()
+        # without a layout the document is not tracked
+        doc.setDocumentLayout(QPlainTextDocumentLayout(doc))
+        doc.setPlainText("x = 1  # line\n" * 100000)
+        highlighter = Counter(doc)
+        highlighter.rehighlight()
+        self.assertEqual(Counter.count, doc.blockCount())
+
+        cursor = QTextCursor(doc)
+        for txt in ("y = 2 + ", "'''a''' + ", '"""mixed \'\'\' " """ + ',
+                    "f'{x}' + "):
+            Counter.count = 0
+            cursor.insertText(txt)
+            self.assertLess(Counter.count, 4)
+
+        # the unclosed string changes the state of all following blocks
+        Counter.count = 0
+        cursor.insertText("'''")
+        self.assertEqual(Counter.count, doc.blockCount())
+        self.assertEqual(doc.lastBlock().previous().userState(), 3)
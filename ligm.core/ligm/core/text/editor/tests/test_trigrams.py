@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Test the trigram index of the search."""
+
+import unittest
+from PyQt5.Qt import QApplication, QTextDocument, QTextCursor
+from ligm.core.text.editor.trigrams import TrigramIndex, trigrams
+from ligm.core.text.editor.search import Query, SearchEngine
+from ligm.core.common import SimpleConfig as Config
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class TrigramIndexTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def index(text, memory=0):
+        cfg = Config()
+        cfg["TextEditor/SearchIndexSize"] = 1
+        cfg["TextEditor/SearchIndexMemory"] = memory
+        doc = QTextDocument()
+        doc.setPlainText(text)
+        index = TrigramIndex(doc, cfg)
+        index.schedule()
+        while index.is_busy():
+            QApplication.processEvents()
+        return doc, index
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_trigrams")
+    def test_trigrams(self):
+        self.assertEqual(trigrams("aBcD"), {"abc", "bcd"})
+        self.assertEqual(trigrams("ab"), set())
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_candidates")
+    def test_candidates(self):
+        doc, index = self.index("Hello world\nyellow\nhell\nworld hello")
+        self.assertTrue(index.is_ready())
+        self.assertEqual(index.candidates("hello"), [0, 3])
+        self.assertEqual(index.candidates("ELL"), [0, 1, 2, 3])
+        self.assertEqual(index.candidates("xyz"), [])
+        self.assertIsNone(index.candidates("he"))
+
+        stats = index.stats()
+        self.assertEqual(stats["blocks"], 4)
+        self.assertGreater(stats["memory"], 0)
+        self.assertGreaterEqual(stats["seconds"], 0)
+
+        # the changed blocks are indexed again
+        cursor = QTextCursor(doc.findBlockByNumber(2))
+        cursor.insertText("o")
+        self.assertEqual(index.candidates("ohell"), [2])
+        cursor.insertBlock()
+        cursor.insertText("xyz")
+        self.assertEqual(index.candidates("xyz"), [3])
+        self.assertEqual(index.candidates("hello"), [0, 4])
+        while doc.blockCount() > 4:
+            doc.undo()
+        # the old ids are more than the blocks, the index is built again
+        while index.is_busy():
+            QApplication.processEvents()
+        self.assertEqual(index.candidates("xyz"), [])
+        self.assertEqual(index.candidates("hello"), [0, 3])
+
+        index.drop()
+        self.assertIsNone(index.candidates("hello"))
+        self.assertEqual(index.stats(), {})
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_memory")
+    def test_memory(self):
+        # the index over the limit of memory is dropped
+        _, index = self.index("abcdef\n" * 1000, memory=0.001)
+        self.assertFalse(index.is_ready())
+
+        # the index grown over the limit by the changes is dropped
+        doc, index = self.index("abcdef\n" * 1000, memory=0.2)
+        self.assertTrue(index.is_ready())
+        cursor = QTextCursor(doc)
+        cursor.insertText("abc\n")
+        self.assertTrue(index.is_ready())
+        cursor.insertText("".join(chr(0x4e00 + i) for i in range(5000)))
+        self.assertFalse(index.is_ready())
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_search")
+    def test_search(self):
+        text = "\n".join(f"line {i} of the text" for i in range(200))
+        doc, index = self.index(text)
+        engine, plain = SearchEngine(doc, index), SearchEngine(doc)
+        for query in (Query("line 1"), Query("LINE 19", True),
+                      Query("line 1", whole_word=True), Query("0 of")):
+            self.assertEqual(engine.find(query), plain.find(query))
+        self.assertEqual(engine.count(Query("line 19", whole_word=True)), 1)
@@ -6,9 +6,14 @@
 
 import unittest
 from unittest.mock import patch
-from PyQt5.Qt import Qt, QTextEdit, QPainter
-from ligm.core.text.editor.view import View, StatusBar, LineNumberArea, ImageSize
+from PyQt5.Qt import (Qt, QTextEdit, QPainter, QTextDocument, QTextCursor,
+                      QApplication, QPoint)
+from ligm.core.text.editor.view import (View, StatusBar, LineNumberArea,
+                                        ImageSize, SearchOverview)
 from ligm.core.text.editor.instable import TableParamsDlg
+from ligm.core.text.editor.folding import Folding
+from ligm.core.text.editor.blockdata import block_data
+from ligm.core.text.editor.syntax import highlighter_cls
 from ligm.core.common import SimpleConfig as Config
 from ligm.core.qt import QTestHelper, TestableWidget
 
@@ -56,6 +61,24 @@ class ViewTest(unittest.TestCase):
     def test_scroll_contents_by(self):
         pass
 
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_scroll")
+    def test_scroll(self):
+        w = TestableWidget(None)
+        v = View(w, Config())
+        v.text.setPlainText("\n" * 1000)
+        QTestHelper().show_and_wait_for_active(w)
+
+        # the viewport is not repainted at once, the line number area is
+        # scrolled with it
+        viewport = v.text.viewport()
+        with patch.object(viewport, "repaint") as repaint, \
+                patch.object(v.line_numbers, "scroll") as scroll:
+            v.text.verticalScrollBar().setValue(100)
+            self.assertFalse(repaint.called)
+            self.assertEqual(scroll.call_args[0][0], 0)
+            self.assertLess(scroll.call_args[0][1], 0)
+
     # -------------------------------------------------------------------------
     @unittest.skipIf(DEBUG, "test_contents_change")
     def test_contents_change(self):
@@ -170,6 +193,88 @@ class LineNumberAreaTest(unittest.TestCase):
         cfg["TextEditor/ShowLineNumbers"] = 0
         self.assertTrue(ln.width() == 0)
 
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_digits")
+    def test_digits(self):
+        cfg = Config()
+        cfg["TextEditor/ShowLineNumbers"] = 1
+        e = QTextEdit()
+        ln = LineNumberArea(e, cfg)
+        width = ln.width()
+        e.setPlainText("\n" * 120)
+        self.assertGreater(ln.width(), width)
+        e.setPlainText("")
+        self.assertEqual(ln.width(), width)
+
+        # the new document of the QTextEdit
+        e.setDocument(QTextDocument("\n" * 9999))
+        self.assertGreater(ln.width(), width)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_visible_blocks")
+    def test_visible_blocks(self):
+        e = QTextEdit()
+        e.setPlainText("\n".join(map(str, range(10000))))
+        e.resize(200, 200)
+        e.show()
+        ln = LineNumberArea(e, Config())
+        height = e.viewport().height()
+        e.document().lineCount()  # the whole document is laid out
+        QApplication.processEvents()
+
+        def visible():
+            blocks = list(ln.visible_blocks(0, height))
+            for block, top in blocks:
+                rect = e.cursorRect(QTextCursor(block))
+                self.assertLessEqual(abs(rect.top() - top), 1)
+            return [block.blockNumber() for block, _ in blocks]
+
+        first = visible()
+        self.assertEqual(first[0], 0)
+        self.assertLess(len(first), 30)
+
+        # the last visible block is found near the one of the last paint
+        for value in (e.verticalScrollBar().maximum(), 1000, 1100):
+            e.verticalScrollBar().setValue(value)
+            QApplication.processEvents()
+            numbers = visible()
+            self.assertEqual(numbers[0], e.cursorForPosition(
+                QPoint(0, 0)).blockNumber())
+            self.assertEqual(len(numbers), len(first))
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_visible_folded")
+    def test_visible_folded(self):
+        e = QTextEdit()
+        e.setPlainText("if x:\n" + "    y = 1\n" * 10000 + "z = 2\nw = 3")
+        e.resize(200, 200)
+        e.show()
+        folding = Folding(e)
+        folding.set_rules(highlighter_cls("Python").folding)
+        ln = LineNumberArea(e, Config(), folding)
+        height = e.viewport().height()
+        folding.fold(e.document().begin())
+        QApplication.processEvents()
+
+        def visible():
+            return [block.blockNumber()
+                    for block, _ in ln.visible_blocks(0, height)]
+
+        # the region is skipped at once
+        header = e.document().begin()
+        self.assertEqual(block_data(header).hidden, 10000)
+        self.assertEqual(visible(), [0, 10001, 10002])
+
+        # the count of the hidden blocks is changed with the region
+        cursor = QTextCursor(e.document().findBlockByNumber(5000))
+        cursor.insertText("    x = 0\n" * 5)
+        self.assertEqual(block_data(header).hidden, 10005)
+        self.assertEqual(visible(), [0, 10006, 10007])
+
+        # the count is outdated: the hidden blocks are stepped
+        block_data(header).hidden = 3
+        self.assertEqual(visible(), [0, 10006, 10007])
+
     # -------------------------------------------------------------------------
     @unittest.skipIf(DEBUG, "test_resize")
     def test_resize(self):
@@ -195,6 +300,34 @@ class SearchAndReplaceBarTest(unittest.TestCase):
         self.assertTrue(v.search_replace.isVisible())
 
 
+# =============================================================================
+class SearchOverviewTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_density")
+    def test_density(self):
+        e = QTextEdit()
+        e.setPlainText("ab\n" * 100)
+        overview = SearchOverview(e)
+        self.assertFalse(overview.isVisible())
+
+        class Matches:
+            starts = [i * 3 for i in range(100) if i < 10 or i >= 90]
+
+            def count(self, first=0, last=None):
+                return len([s for s in self.starts if first <= s and
+                            (last is None or s <= last)])
+
+        e.show()
+        overview.set_matches(Matches())
+        self.assertTrue(overview.isVisible())
+        self.assertEqual(overview.density(10), [10] + [0] * 8 + [10])
+        self.assertEqual(sum(overview.density(7)), 20)
+
+        overview.set_matches(None)
+        self.assertFalse(overview.isVisible())
+
+
 # =============================================================================
 class TableTest(unittest.TestCase):
 
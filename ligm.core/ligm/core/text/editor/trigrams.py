@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Trigram index of the blocks of the document for the search.
+
+Every block (line) of the document has the id, the index maps the trigrams
+(three characters in the lower case) to the arrays of ids of the blocks
+with them. The literal query of three and more characters is matched only
+in the blocks with all its trigrams.
+
+The index is built in the worker thread on the first search of the large
+document ("TextEditor/SearchIndexSize" - the count of characters, 0 - no
+index). Then it is kept up to date with the changes of the document: the
+changed blocks get new ids, the old ids stay in the arrays and are skipped;
+the index is built again when the old ids are more than the blocks. The
+index over "TextEditor/SearchIndexMemory" (MB) is dropped, after the build
+and after the changes (the memory of the added ids and trigrams is added
+to the estimate of the built index).
+
+``stats()`` reports the memory of the index (bytes, estimated) and the
+time of the build (seconds).
+"""
+
+import sys
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.Qt import QObject, pyqtSignal
+from .search import PLAIN
+
+
+_executor = ThreadPoolExecutor(max_workers=1)
+
+# the changes of more blocks drop the index (it is built again lazily)
+_MAX_CHANGED_BLOCKS = 10000
+
+
+# =============================================================================
+def trigrams(text):
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# =============================================================================
+def build(texts):
+    """
+    Called in the worker thread: returns the arrays of ids of the trigrams
+    (the id of the block is its number), the hashes of the texts and the
+    time of the build.
+    """
+    start = time.perf_counter()
+    postings = {}
+    for number, text in enumerate(texts):
+        for gram in trigrams(text):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = ids = array("i")
+            ids.append(number)
+    hashes = [hash(text) for text in texts]
+    return postings, hashes, time.perf_counter() - start
+
+
+# =============================================================================
+class TrigramIndex(QObject):
+
+    built = pyqtSignal(dict)           # the statistics of the built index
+    _ready = pyqtSignal(int, object)   # job, result of build()
+
+    # -------------------------------------------------------------------------
+    def __init__(self, document, config):
+        super(TrigramIndex, self).__init__(document)
+        self._document = document
+        self._cfg = config
+
+        self._job = 0           # number of the last background job
+        self._busy = False      # the background job is not finished
+        self._texts = None      # texts of blocks sent to the worker
+        self._postings = None   # trigram: array of ids (None - no index)
+        self._ids = []          # ids of blocks by numbers
+        self._hashes = []       # hashes of texts of blocks by numbers
+        self._numbers = None    # {id: number} (None - to make)
+        self._next_id = 0
+        self._dead = 0          # count of old ids in the arrays
+        self._memory = 0        # running estimate of memory() (bytes)
+        self._stats = {}
+
+        self._ready.connect(self._built)
+        document.documentLayout()  # the changes are signaled with the layout
+        document.contentsChange.connect(self._contents_change)
+
+    # -------------------------------------------------------------------------
+    def is_ready(self):
+        return self._postings is not None
+
+    # -------------------------------------------------------------------------
+    def is_busy(self):
+        return self._busy
+
+    # -------------------------------------------------------------------------
+    def stats(self):
+        """
+        {"blocks", "trigrams", "memory" (bytes), "seconds" (of the build)}
+        of the index or {} if there is no index.
+        """
+        if self._postings is None:
+            return {}
+        self._stats.update(blocks=len(self._ids),
+                           trigrams=len(self._postings),
+                           memory=self.memory())
+        return dict(self._stats)
+
+    # -------------------------------------------------------------------------
+    def memory(self):
+        """Estimated size of the index in bytes."""
+        if self._postings is None:
+            return 0
+        size = sys.getsizeof(self._postings) + sys.getsizeof(self._ids) + \
+            sys.getsizeof(self._hashes)
+        size += sum(sys.getsizeof(gram) + sys.getsizeof(ids)
+                    for gram, ids in self._postings.items())
+        # the integers of the ids and the hashes
+        return size + 32 * (len(self._ids) + len(self._hashes))
+
+    # -------------------------------------------------------------------------
+    def schedule(self):
+        """Builds the index in the background if the document is large."""
+        if self._busy or self._postings is not None:
+            return
+        min_size = self._cfg.get("TextEditor/SearchIndexSize", 0)
+        if min_size and self._document.characterCount() >= min_size:
+            self._start()
+
+    # -------------------------------------------------------------------------
+    def drop(self):
+        self._job += 1
+        self._busy = False
+        self._texts = self._postings = self._numbers = None
+        self._ids, self._hashes = [], []
+        self._dead = 0
+        self._memory = 0
+
+    # -------------------------------------------------------------------------
+    def candidates(self, text):
+        """
+        Numbers of the blocks (sorted) with all trigrams of the text or None
+        if the index can not be used.
+        """
+        if self._postings is None or len(text) < 3:
+            return None
+        arrays = sorted((self._postings.get(gram, ()) for gram in
+                         trigrams(text)), key=len)
+        ids = set(arrays[0])
+        for other in arrays[1:]:
+            if not ids:
+                break
+            ids.intersection_update(other)
+
+        if self._numbers is None:
+            self._numbers = {id_: number
+                             for number, id_ in enumerate(self._ids)}
+        numbers = self._numbers
+        return sorted(numbers[id_] for id_ in ids if id_ in numbers)
+
+    # -------------------------------------------------------------------------
+    def _start(self):
+        """Sends the texts of all blocks to the worker."""
+        self.drop()
+        self._busy = True
+        texts, block = [], self._document.begin()
+        while block.isValid():
+            texts.append(block.text().translate(PLAIN))
+            block = block.next()
+        self._texts = texts
+
+        job = self._job
+        future = _executor.submit(build, texts)
+        future.add_done_callback(lambda f: self._done(job, f))
+
+    # -------------------------------------------------------------------------
+    def _done(self, job, future):
+        """Called in the worker thread."""
+        try:
+            self._ready.emit(job, future.result())
+        except RuntimeError:  # pragma: no cover
+            pass  # the index is already deleted
+
+    # -------------------------------------------------------------------------
+    def _built(self, job, result):
+        if job != self._job:
+            return  # the result of the cancelled job
+        texts, self._texts, self._busy = self._texts, None, False
+        if self._document.blockCount() != len(texts):
+            self._start()  # the lines were added or removed while building
+            return
+
+        self._postings, self._hashes, seconds = result
+        self._ids = list(range(len(texts)))
+        self._next_id = len(texts)
+        self._numbers = None
+
+        # the text could be changed while the index was built (the changes
+        # of formats change the revision too, so the texts are compared)
+        block = self._document.begin()
+        for number, text in enumerate(texts):
+            if block.text().translate(PLAIN) != text:
+                self._add_block(number, block)
+                self._dead += 1
+            block = block.next()
+
+        self._stats = {"seconds": seconds}
+        self._memory = self.memory()
+        if self._over_limit():
+            self.drop()
+            return
+        self.built.emit(self.stats())
+
+    # -------------------------------------------------------------------------
+    def _over_limit(self):
+        limit = self._cfg.get("TextEditor/SearchIndexMemory", 0)
+        return bool(limit) and self._memory > limit * 1024 * 1024
+
+    # -------------------------------------------------------------------------
+    def _add_block(self, number, block):
+        """Indexes the text of the block by the new id."""
+        text = block.text().translate(PLAIN)
+        id_, self._next_id = self._next_id, self._next_id + 1
+        for gram in trigrams(text):
+            ids = self._postings.get(gram)
+            if ids is None:
+                self._postings[gram] = ids = array("i")
+                self._memory += sys.getsizeof(gram) + sys.getsizeof(ids)
+            ids.append(id_)
+            self._memory += ids.itemsize
+        if self._numbers is not None:
+            self._numbers.pop(self._ids[number], None)
+            self._numbers[id_] = number
+        self._ids[number] = id_
+        self._hashes[number] = hash(text)
+
+    # -------------------------------------------------------------------------
+    def _contents_change(self, position, removed, added):
+        if self._postings is None:
+            return
+        doc = self._document
+        size = doc.characterCount() - 1
+        first = doc.findBlock(min(position, size))
+        last = doc.findBlock(min(position + added, size))
+        first_number, last_number = first.blockNumber(), last.blockNumber()
+        count = last_number - first_number + 1
+        old_last = last_number - (doc.blockCount() - len(self._ids))
+        if count > _MAX_CHANGED_BLOCKS or old_last < first_number:
+            self.drop()
+            return
+
+        if old_last != last_number:
+            # the lines are added or removed: the blocks of the change get
+            # new ids in place of the old ones
+            self._dead += old_last - first_number + 1
+            self._ids[first_number:old_last + 1] = [-1] * count
+            self._hashes[first_number:old_last + 1] = [None] * count
+            self._numbers = None
+
+        # the blocks with the same text (e.g. the formats are changed) keep
+        # their ids
+        block = first
+        for number in range(first_number, last_number + 1):
+            if hash(block.text().translate(PLAIN)) != self._hashes[number]:
+                if self._hashes[number] is not None:
+                    self._dead += 1
+                self._add_block(number, block)
+            block = block.next()
+
+        if self._over_limit():
+            self.drop()
+        elif self._dead > len(self._ids):
+            self._start()
@@ -10,11 +10,15 @@ from PyQt5.Qt import (Qt, QObject, QWidget, QHBoxLayout, QVBoxLayout, QLabel,
                       QFontComboBox, QSpinBox, QPalette, QColor, QCursor,
                       QPixmap, QPainter, QPoint, QTextCursor, QFont, QCheckBox,
                       QFontMetrics, QTextFormat, QLineEdit, QPushButton,
-                      QGridLayout, QTimer)
+                      QGridLayout, QTimer, QPolygon, QEvent, QStyle,
+                      QStyleOptionSlider)
 from ligm.core.common import img
 from ligm.core.qt import ColorPicker, BlockSignals, TestableWidget, TestableDialog
 from .instable import InsertTable
 from .align import AlignText
+from .folding import Folding
+from .brackets import BracketMatcher
+from .selections import ExtraSelections
 
 
 TWidget = Union[QWidget, TestableWidget]
@@ -33,9 +37,16 @@ class View(QObject):
         self.text = QTextEdit()
         self.status = StatusBar()
         self.search_replace = SearchAndReplaceBar()
-        self.line_numbers = LineNumberArea(self.text, self._cfg)
+        self.folding = Folding(self.text)
+        self.brackets = BracketMatcher(self.text)
+        self.selections = ExtraSelections(self.text)
+        self.line_numbers = LineNumberArea(self.text, self._cfg, self.folding)
+        self.overview = SearchOverview(self.text)
 
         self.cursors = {}
+        self.reduced = set()  # features turned off (see policy.py)
+        self._margins = None  # the last margins of the viewport
+        self._margin_fm = None  # font metrics of the margin line
         self.init_ui(margins)
         self.update_ui()
 
@@ -85,21 +96,32 @@ class View(QObject):
             self.text.setAcceptRichText(True)
 
         self.text.paintEvent = self.paint
+        self._margin_fm = QFontMetrics(QFont(
+            self._cfg.get("TextEditor/MonospaceFont", "Mono", system=True),
+            self._cfg.get("TextEditor/MonospaceFontSize", 11, system=True)))
 
         self.contents_change()
 
     # -------------------------------------------------------------------------
     def scroll_contents_by(self, dx, dy):  # pragma: no cover
+        # Qt scrolls the viewport and repaints only the exposed area, the
+        # line number area is scrolled the same way
         QTextEdit.scrollContentsBy(self.text, dx, dy)
-        self.line_numbers.update()
-        self.text.viewport().repaint()
+        if dy:
+            self.line_numbers.scroll(0, dy)
+        if dx and "margin_line" not in self.reduced:
+            # the margin line stays at its place in the viewport
+            self.text.viewport().update()
 
     # -------------------------------------------------------------------------
     def contents_change(self):
         if self.line_numbers:
-            self.text.setViewportMargins(self.line_numbers.width(), 0, 0, 0)
+            # the width is changed only with the count of digits
+            margins = self.line_numbers.width()
+            if margins != self._margins:
+                self._margins = margins
+                self.text.setViewportMargins(margins, 0, 0, 0)
             self.line_numbers.update()
-        self.text.setExtraSelections([])
         self.highlight_cur_line()
 
     # -------------------------------------------------------------------------
@@ -107,18 +129,55 @@ class View(QObject):
         self.line_numbers.resize(self.text.contentsRect())
         QTextEdit.resizeEvent(self.text, event)
 
+    # -------------------------------------------------------------------------
+    def set_reduced(self, features):
+        """Turns off the expensive features (see policy.py)."""
+        self.reduced = set(features)
+        self.line_numbers.reduced = "line_numbers" in self.reduced
+        self.line_numbers.resize(self.text.contentsRect())
+        self.contents_change()
+        self.text.viewport().update()
+
     # -------------------------------------------------------------------------
     def highlight_cur_line(self):
-        if not self._cfg.get("TextEditor/HighlightCurrentLine", 1):
-            return
-        selection = QTextEdit.ExtraSelection()
-        color = self._cfg.get(
-            "TextEditor/HighlightCurrentLineColor", "yellow", system=True)
-        selection.format.setBackground(QColor(color))
-        selection.format.setProperty(QTextFormat.FullWidthSelection, True)
-        selection.cursor = self.text.textCursor()
-        selection.cursor.clearSelection()
-        self.text.setExtraSelections([selection])
+        selections = []
+        if self._cfg.get("TextEditor/HighlightCurrentLine", 1) and \
+                "current_line" not in self.reduced:
+            selection = QTextEdit.ExtraSelection()
+            color = self._cfg.get(
+                "TextEditor/HighlightCurrentLineColor", "yellow", system=True)
+            selection.format.setBackground(QColor(color))
+            selection.format.setProperty(QTextFormat.FullWidthSelection, True)
+            selection.cursor = self.text.textCursor()
+            selection.cursor.clearSelection()
+            selections.append(selection)
+        self.selections.set(current_line=selections,
+                            brackets=self._brackets_selections())
+
+    # -------------------------------------------------------------------------
+    def _brackets_selections(self):
+        """The bracket at the cursor and its pair (or the unmatched one)."""
+        cursor = self.text.textCursor()
+        if not self.brackets.enabled() or cursor.hasSelection():
+            return []
+        found = self.brackets.match(cursor.position())
+        if found is None:
+            return []
+        bracket, partner = found
+        color = QColor(self._cfg.get(
+            "TextEditor/BracketMatchColor", "#B4EEB4", system=True)
+            if partner else self._cfg.get(
+                "TextEditor/BracketMismatchColor", "#FFB4B4", system=True))
+        selections = []
+        for start, length in filter(None, (bracket, partner)):
+            selection = QTextEdit.ExtraSelection()
+            selection.format.setBackground(color)
+            selection.cursor = QTextCursor(self.text.document())
+            selection.cursor.setPosition(start)
+            selection.cursor.setPosition(start + length,
+                                         QTextCursor.KeepAnchor)
+            selections.append(selection)
+        return selections
 
     # -------------------------------------------------------------------------
     def show_hide_search_panel(self, key):
@@ -146,6 +205,10 @@ class View(QObject):
         if key == Qt.Key_Escape:
             self.search_replace.set_visible(False)
 
+        if not self.search_replace.isVisible():
+            self.selections.clear("search")
+            self.overview.set_matches(None)
+
     # -------------------------------------------------------------------------
     def retranslate_ui(self):
         self.search_replace.retranslate_ui()
@@ -169,17 +232,14 @@ class View(QObject):
             return
 
         numline = self._cfg.get("TextEditor/MarginLine", 0)
-        if not numline:  # pragma: no cover
+        if not numline or "margin_line" in self.reduced:  # pragma: no cover
             return
 
         painter = QPainter(self.text.viewport())
         painter.setPen(QColor("lightgray"))
 
-        fm = QFontMetrics(QFont(
-            self._cfg.get("TextEditor/MonospaceFont", "Mono", system=True),
-            self._cfg.get("TextEditor/MonospaceFontSize", 11, system=True)))
-
-        x = self.text.document().documentMargin() + fm.width("A") * numline - 1
+        x = int(self.text.document().documentMargin() +
+                self._margin_fm.width("A") * numline - 1)
         painter.drawLine(x, 0, x, self.text.viewport().height())
 
 
@@ -308,10 +368,14 @@ class StatusBar(TestableWidget):
 class LineNumberArea(TestableWidget):
 
     # -------------------------------------------------------------------------
-    def __init__(self, textedit, cfg):
+    def __init__(self, textedit, cfg, folding=None):
         TestableWidget.__init__(self, textedit)
         self._textedit = textedit
         self._cfg = cfg
+        self._folding = folding
+        self.reduced = False  # it is hidden for the large document
+        if folding:
+            folding.changed.connect(self._folding_changed)
 
         self._font = QFont(
             self._cfg.get("TextEditor/MonospaceFont", "Mono", system=True),
@@ -323,44 +387,219 @@ class LineNumberArea(TestableWidget):
         self._fontcolor = QColor(self._cfg.get(
             "TextEditor/NumberColorLineNumberArea", "gray", system=True))
 
+        self._first = 0        # number of the first visible block
+        self._document = None  # the document of the count of digits
+        self._digits = 1       # count of digits of the count of blocks
+
     # -------------------------------------------------------------------------
     def paintEvent(self, event):  # pragma: no cover
         painter = QPainter(self)
         painter.setFont(self._font)
         painter.fillRect(event.rect(), self._background)
         painter.setPen(self._fontcolor)
-        cursor = self._textedit.cursorForPosition(QPoint(0, 0))
-        at_end = False
+        height = self._textedit.height()
 
         font_height = self._fm.height()
-        height = self._textedit.height()
-        while not at_end:
-            rect = self._textedit.cursorRect(cursor)
-            if rect.top() >= height:
-                break
-            number = str(cursor.blockNumber() + 1)
-            painter.drawText(0, rect.top(), self.width() - 2 - 3,
-                             font_height, Qt.AlignRight, number)
-            cursor.movePosition(QTextCursor.EndOfBlock)
-            at_end = cursor.atEnd()
-            if not at_end:
-                cursor.movePosition(QTextCursor.NextBlock)
+        markers = self._markers_width()
+        show_numbers = self._cfg.get("TextEditor/ShowLineNumbers", 1)
+        for block, top in self.visible_blocks(event.rect().top(),
+                                              event.rect().bottom()):
+            if show_numbers:
+                number = str(block.blockNumber() + 1)
+                painter.drawText(0, top, self.width() - markers - 5,
+                                 font_height, Qt.AlignRight, number)
+            if markers and self._folding.is_foldable(block):
+                self._draw_marker(painter, top, font_height,
+                                  self._folding.is_folded(block))
         painter.drawLine(self.width() - 1, 0, self.width() - 1, height)
 
+    # -------------------------------------------------------------------------
+    def visible_blocks(self, top, bottom):
+        """
+        Yields (block, top of the block in the viewport) of the visible
+        blocks between top and bottom (coordinates of the viewport). Only
+        these blocks are iterated, the geometry of blocks is cached by the
+        layout of the document.
+        """
+        layout = self._textedit.document().documentLayout()
+        offset = self._textedit.verticalScrollBar().value()
+        block = self._first_block(layout, offset + top)
+        while block.isValid():
+            if block.isVisible():  # else it is in the folded region
+                rect = layout.blockBoundingRect(block)
+                if not rect.height():
+                    break  # the block is not laid out yet
+                y = int(rect.top()) - offset
+                if y > bottom:
+                    break
+                yield block, y
+                if self._folding and self._folding.is_folded(block):
+                    block = self._folding.hidden_end(block)  # skip the region
+            block = block.next()
+
+    # -------------------------------------------------------------------------
+    def _first_block(self, layout, y):
+        """Returns the block at the y (coordinate of the document)."""
+        doc = self._textedit.document()
+        block = doc.findBlockByNumber(min(self._first, doc.blockCount() - 1))
+
+        # the first block of the last paint is near (e.g. after scrolling by
+        # lines or pages), else the hit test finds it
+        if abs(layout.blockBoundingRect(block).top() - y) > 4 * self.height():
+            block = self._textedit.cursorForPosition(
+                QPoint(0, y - self._textedit.verticalScrollBar().value())
+            ).block()
+        while block.previous().isValid() and \
+                layout.blockBoundingRect(block).top() > y:
+            block = block.previous()
+        while block.next().isValid() and \
+                layout.blockBoundingRect(block).bottom() <= y:
+            block = block.next()
+        self._first = block.blockNumber()
+        return block
+
+    # -------------------------------------------------------------------------
+    def _draw_marker(self, painter, top, size, folded):  # pragma: no cover
+        """Triangle: to the right for the folded region, else down."""
+        x, y, d = self.width() - size, top + size // 4, size // 2
+        if folded:
+            points = [(x, y), (x + d, y + d // 2), (x, y + d)]
+        else:
+            points = [(x, y), (x + d, y), (x + d // 2, y + d)]
+        painter.setBrush(self._fontcolor)
+        painter.drawPolygon(QPolygon([QPoint(*p) for p in points]))
+
+    # -------------------------------------------------------------------------
+    def mousePressEvent(self, event):
+        # click on the marker folds or unfolds the region
+        markers = self._markers_width()
+        if markers and event.x() >= self.width() - markers:
+            cursor = self._textedit.cursorForPosition(QPoint(0, event.y()))
+            self._folding.toggle(cursor.block())
+        TestableWidget.mousePressEvent(self, event)
+
+    # -------------------------------------------------------------------------
+    def _folding_changed(self):
+        self.setGeometry(self.x(), self.y(), self.width(), self.height())
+        self._textedit.setViewportMargins(self.width(), 0, 0, 0)
+        self.update()
+
+    # -------------------------------------------------------------------------
+    def _markers_width(self):
+        if self._folding and self._folding.enabled():
+            return self._fm.height()
+        return 0
+
     # -------------------------------------------------------------------------
     def width(self):
+        if self.reduced:
+            return 0
+        width = self._markers_width()
         if self._cfg.get("TextEditor/ShowLineNumbers", 1):
-            cursor = QTextCursor(self._textedit.document())
-            cursor.movePosition(QTextCursor.End)
-            digits = len(str(cursor.blockNumber() + 1))
-            return 5 + self._fm.width('9') * digits + 3
-        return 0
+            width += 5 + self._fm.width('9') * self._digits_count() + 3
+        return width
+
+    # -------------------------------------------------------------------------
+    def _digits_count(self):
+        doc = self._textedit.document()
+        if doc is not self._document:
+            # the QTextEdit has got another document
+            self._document = doc
+            doc.blockCountChanged.connect(self._block_count_changed)
+            self._block_count_changed(doc.blockCount())
+        return self._digits
+
+    # -------------------------------------------------------------------------
+    def _block_count_changed(self, count):
+        if self.sender() is None or self.sender() is self._document:
+            self._digits = len(str(count))
 
     # -------------------------------------------------------------------------
     def resize(self, rect):
         self.setGeometry(rect.left(), rect.top(), self.width(), rect.height())
 
 
+# =============================================================================
+class SearchOverview(QWidget):
+    """
+    Density of the search matches over the groove of the vertical scroll bar.
+    The groove is divided into rows of pixels by the count of blocks, the row
+    with more matches is drawn darker (the counts are taken from the source
+    of matches by the ranges of positions, the matches are not iterated).
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, textedit):
+        scrollbar = textedit.verticalScrollBar()
+        QWidget.__init__(self, scrollbar)
+        self._textedit = textedit
+        self._matches = None  # the source of counts of the matches
+        self._color = QColor(Qt.darkYellow)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        scrollbar.installEventFilter(self)
+        textedit.textChanged.connect(self._text_changed)
+        self.setVisible(False)
+
+    # -------------------------------------------------------------------------
+    def set_matches(self, matches):
+        """Sets the matches with the method count(first, last) or None."""
+        self._matches = matches
+        self.setGeometry(self.parent().rect())
+        self.setVisible(matches is not None)
+        self.update()
+
+    # -------------------------------------------------------------------------
+    def density(self, rows):
+        """The counts of the matches of the rows (equal parts of blocks)."""
+        doc = self._textedit.document()
+        blocks = doc.blockCount()
+        counts, first = [], 0
+        for row in range(1, rows + 1):
+            if row < rows:
+                last = doc.findBlockByNumber(blocks * row // rows).position()
+                counts.append(self._matches.count(first, last - 1))
+                first = last
+            else:
+                counts.append(self._matches.count(first))
+        return counts
+
+    # -------------------------------------------------------------------------
+    def paintEvent(self, event):  # pragma: no cover
+        if not self._matches:
+            return
+        scrollbar = self.parent()
+        option = QStyleOptionSlider()
+        option.initFrom(scrollbar)
+        option.orientation = Qt.Vertical
+        option.minimum, option.maximum = 0, scrollbar.maximum()
+        option.pageStep = scrollbar.pageStep()
+        option.subControls = QStyle.SC_All
+        groove = scrollbar.style().subControlRect(
+            QStyle.CC_ScrollBar, option, QStyle.SC_ScrollBarGroove, scrollbar)
+
+        counts = self.density(max(groove.height(), 1))
+        peak = max(counts) or 1
+        painter = QPainter(self)
+        width = max(groove.width() // 3, 2)
+        left = groove.right() - width + 1
+        for y, count in enumerate(counts):
+            if count:
+                color = QColor(self._color)
+                color.setAlpha(96 + 159 * count // peak)
+                painter.fillRect(left, groove.top() + y, width, 1, color)
+
+    # -------------------------------------------------------------------------
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize and self._matches:
+            self.setGeometry(obj.rect())
+        return False
+
+    # -------------------------------------------------------------------------
+    def _text_changed(self):
+        if self._matches:
+            self.update()
+
+
 # =============================================================================
 class SearchAndReplaceBar(TestableWidget):
 
@@ -392,15 +631,19 @@ class SearchAndReplaceBar(TestableWidget):
             "replace": QToolButton(self),
             "replace-all": QToolButton(self),
             "search-edit": QLineEdit(self),
+            "search-info": QLabel(self),
             "replace-edit": QLineEdit(self),
             "cs-box": QCheckBox(self.tr("case-sensitive"), self),
+            "word-box": QCheckBox(self.tr("whole words"), self),
+            "regex-box": QCheckBox(self.tr("regular expression"), self),
         }
 
         self.controls["find-all"].setToolButtonStyle(
             Qt.ToolButtonTextBesideIcon)
 
         for c in ("search-edit", "find-prev", "find-next", "find-all",
-                  "cs-box", "replace-edit", "replace", "replace-all"):
+                  "search-info", "cs-box", "word-box", "regex-box",
+                  "replace-edit", "replace", "replace-all"):
             layout = repl_layout if c.startswith("replace") else search_layout
             layout.addWidget(self.controls[c], alignment=Qt.Alignment())
 
@@ -423,6 +666,8 @@ class SearchAndReplaceBar(TestableWidget):
     # -------------------------------------------------------------------------
     def retranslate_ui(self):
         self.controls["cs-box"].setText(self.tr("case-sensitive"))
+        self.controls["word-box"].setText(self.tr("whole words"))
+        self.controls["regex-box"].setText(self.tr("regular expression"))
         self.controls["search-edit"].setPlaceholderText(self.tr("Search"))
         self.controls["replace-edit"].setPlaceholderText(
             self.tr("Replace with"))
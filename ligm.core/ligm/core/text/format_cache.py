@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Cache of the highlighting results of text blocks."""
+
+from collections import OrderedDict
+
+
+# =============================================================================
+class FormatCache:
+    """
+    LRU cache {(owner, hash of text, previous state): (spans, state)}, where
+    spans is a tuple of (start, length, style) and state is the state of the
+    block after highlighting. ``owner`` separates the results of different
+    highlighters (e.g. the lexer or the dictionary with its version).
+    """
+
+    # -------------------------------------------------------------------------
+    def __init__(self, size=20000):
+        self.size = size
+        self._data = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def key(owner, text, state):
+        return owner, hash(text), len(text), state
+
+    # -------------------------------------------------------------------------
+    def get(self, key):
+        """Returns (spans, state) or None."""
+        value = self._data.get(key)
+        if value is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+            self._data.move_to_end(key)
+        return value
+
+    # -------------------------------------------------------------------------
+    def put(self, key, spans, state):
+        self._data[key] = (tuple(spans), state)
+        self._data.move_to_end(key)
+        if len(self._data) > self.size:
+            self._data.popitem(last=False)
+
+    # -------------------------------------------------------------------------
+    def clear(self):
+        self._data.clear()
+        self._hits = self._misses = 0
+
+    # -------------------------------------------------------------------------
+    def stats(self):
+        """Returns dict with hits, misses, hit ratio and count of entries."""
+        total = self._hits + self._misses
+        return {"hits": self._hits, "misses": self._misses,
+                "ratio": self._hits / total if total else 0.0,
+                "entries": len(self._data)}
+
+
+# the cache shared by all highlighters
+format_cache = FormatCache()
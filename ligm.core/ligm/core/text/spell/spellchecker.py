@@ -22,6 +22,9 @@ class SpellChecker(QObject):
         self._enabled_all = enabled
         self._enabled_en, self._enabled_ru = False, False
 
+        # changes when the result of checking of words can change
+        self.version = 0
+
         if not enabled:
             return
 
@@ -53,6 +56,7 @@ class SpellChecker(QObject):
         if name_dict.lower() == "all":
             self._enabled_en = value
             self._enabled_ru = value
+        self.version += 1
         self.change_enabled.emit()
 
     # -------------------------------------------------------------------------
@@ -146,3 +150,4 @@ class SpellChecker(QObject):
     def add_word(self, word, auto_save=True):
         if not self.check_word(word):
             self._man.add_word(word, auto_save)  # pragma: no cover
+            self.version += 1  # pragma: no cover
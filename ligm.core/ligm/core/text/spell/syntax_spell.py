@@ -6,11 +6,37 @@
 import re
 from PyQt5.QtCore import Qt
 from PyQt5.Qt import QTextCharFormat, QSyntaxHighlighter
+from ..format_cache import format_cache
+
+
+# =============================================================================
+def wrong_words(dictionary, text, pos=0, endpos=None):
+    """Returns the list of (start, length) of wrong words in the text."""
+    endpos = len(text) if endpos is None else endpos
+
+    # collect data for checking
+    mark = []
+    for match in SpellHighlighter.words.finditer(text, pos, endpos):
+        if dictionary.word_needs_no_verification(match.group(0)):
+            continue
+
+        mark.append((match.group(0).lower(), match.start(),
+                     match.end() - match.start()))
+
+    # word check
+    return [(start, length) for word, start, length in mark
+            if not dictionary.check_word(word)]
 
 
 # =============================================================================
 class SpellHighlighter(QSyntaxHighlighter):
 
+    # compiled once per process and shared by all instances
+    words = re.compile('[^_\\W]+', flags=re.UNICODE)
+    char_format = QTextCharFormat()
+    char_format.setUnderlineColor(Qt.red)
+    char_format.setUnderlineStyle(QTextCharFormat.SpellCheckUnderline)
+
     # -------------------------------------------------------------------------
     def __init__(self, document, dictionary):
         QSyntaxHighlighter.__init__(self, document)
@@ -18,26 +44,18 @@ class SpellHighlighter(QSyntaxHighlighter):
 
     # -------------------------------------------------------------------------
     def highlightBlock(self, text):
-        words = re.compile('[^_\\W]+', flags=re.UNICODE)
-
-        char_format = QTextCharFormat()
-        char_format.setUnderlineColor(Qt.red)
-        char_format.setUnderlineStyle(QTextCharFormat.SpellCheckUnderline)
-
-        # collect data for checking
-        mark = []
-        for match in words.finditer(text):
-            final_format = QTextCharFormat()
-            final_format.merge(char_format)
-            final_format.merge(self.format(match.start()))
-
-            if self._dictionary.word_needs_no_verification(match.group(0)):
-                continue
-
-            mark.append((match.group(0).lower(), match.start(),
-                         match.end() - match.start(), final_format))
-
-        # word check
-        for word, start, length, fmt in mark:
-            if not self._dictionary.check_word(word):
-                self.setFormat(start, length, fmt)
+        # the result depends on the text and on the state of the dictionary
+        key = format_cache.key(
+            (self._dictionary, getattr(self._dictionary, "version", 0)),
+            text, 0)
+        cached = format_cache.get(key)
+        if cached is None:
+            spans = [(start, length, "spell") for start, length in
+                     wrong_words(self._dictionary, text)]
+            format_cache.put(key, spans, -1)
+        else:
+            spans = cached[0]
+
+        char_format = SpellHighlighter.char_format
+        for start, length, _ in spans:
+            self.setFormat(start, length, char_format)
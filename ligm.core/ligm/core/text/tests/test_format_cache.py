@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Tests for FormatCache."""
+
+import unittest
+from PyQt5.Qt import QTextDocument, QTextCursor, QPlainTextDocumentLayout
+from ligm.core.qt import QTestHelper
+from ligm.core.text.format_cache import FormatCache, format_cache
+from ligm.core.text.editor.syntax_python import PythonHighlighter
+from ligm.core.text.spell import SpellHighlighter
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class Dictionary:
+    version = 0
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def word_needs_no_verification(word):
+        return len(word) == 1
+
+    # -------------------------------------------------------------------------
+    def check_word(self, word):
+        return self.version > 0 or word != "bad"
+
+
+# =============================================================================
+class FormatCacheTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def document(text):
+        doc = QTextDocument()
+        doc.setDocumentLayout(QPlainTextDocumentLayout(doc))
+        doc.setPlainText(text)
+        return doc
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_lru")
+    def test_lru(self):
+        cache = FormatCache(size=2)
+        self.assertEqual(cache.stats()["ratio"], 0)
+        a, b, c = (cache.key("o", txt, 0) for txt in "abc")
+        self.assertNotEqual(a, cache.key("o", "a", 1))
+        self.assertNotEqual(a, cache.key("p", "a", 0))
+
+        cache.put(a, [(0, 1, "x")], 1)
+        cache.put(b, [], 0)
+        self.assertEqual(cache.get(a), (((0, 1, "x"),), 1))
+        cache.put(c, [], 0)  # "b" is the least recently used
+        self.assertIsNone(cache.get(b))
+        self.assertIsNotNone(cache.get(a))
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1,
+                                         "ratio": 2 / 3, "entries": 2})
+        cache.clear()
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_highlighters")
+    def test_highlighters(self):
+        format_cache.clear()
+        doc = self.document("x = 1  # c\n" * 100 + "'''\nx = 1  # c")
+        highlighter = PythonHighlighter(doc)
+        highlighter.rehighlight()
+        stats = format_cache.stats()
+        self.assertEqual(stats["entries"], 3)
+        self.assertGreater(stats["ratio"], 0.9)
+
+        # the same text in a string has another previous state
+        last = doc.lastBlock()
+        self.assertEqual(last.userState(), 3)
+        self.assertEqual(len(last.layout().formats()), 1)
+
+        # undo replays the cached formats
+        cursor = QTextCursor(doc)
+        cursor.insertText("#")
+        hits = format_cache.stats()["hits"]
+        doc.undo()
+        self.assertEqual(format_cache.stats()["hits"], hits + 1)
+        self.assertEqual(len(doc.firstBlock().layout().formats()), 2)
+
+        # the change of the dictionary makes the cached results outdated
+        dictionary = Dictionary()
+        doc = self.document("a bad word\na bad word")
+        highlighter = SpellHighlighter(doc, dictionary)
+        highlighter.rehighlight()
+        for block in (doc.firstBlock(), doc.lastBlock()):
+            formats = block.layout().formats()
+            self.assertEqual([(f.start, f.length) for f in formats], [(2, 3)])
+
+        dictionary.version += 1
+        highlighter.rehighlight()
+        self.assertEqual(doc.firstBlock().layout().formats(), [])
@@ -14,11 +14,13 @@ from PyQt5.QtWidgets import (QComboBox, QLabel, QCheckBox, QFileDialog,
                              QTabWidget)
 
 from ligm.core.text import SpellChecker
-from ligm.core.common import img
+from ligm.core.common import img, realpath
 from ligm.core.qt import (yes_no, install_translators, TestableMainWindow,
                      get_current_language)
 from .config import Config
 from .tabedit import TabEdit
+from .findpanel import FindPanel
+from .findfiles import FindInFilesPanel
 
 
 # =============================================================================
@@ -32,6 +34,8 @@ class MainWindow(TestableMainWindow):
 
         self.cfg = Config()
         self._tabs = QTabWidget()
+        self._find = FindPanel(self)
+        self._find_files = FindInFilesPanel(self)
         self._actions: Dict[str, QAction] = {}
         self._menus: Dict[str, QMenu] = {}
         self._make_actions()
@@ -46,6 +50,9 @@ class MainWindow(TestableMainWindow):
                 ("open", self.tr("Open"), self.open),
                 ("save", self.tr("Save"), self.save),
                 ("save_as", self.tr("Save as ..."), self.saveas),
+                ("find-tabs", self.tr("Find in open documents"),
+                 self.find_in_tabs),
+                ("find-files", self.tr("Find in files"), self.find_in_files),
                 ("exit", self.tr("Exit"), self.close),
                 ("about", self.tr("About"), self.about),
                 ("about_qt", self.tr("About Qt"), about_qt),
@@ -60,6 +67,11 @@ class MainWindow(TestableMainWindow):
                 ("python", self.tr("Python"),
                  lambda: self.set_syntax("Python")),
                 ("sql", self.tr("SQL"), lambda: self.set_syntax("SQL")),
+                ("json", self.tr("JSON"), lambda: self.set_syntax("JSON")),
+                ("ini", self.tr("INI"), lambda: self.set_syntax("INI")),
+                ("xml", self.tr("XML/HTML"), lambda: self.set_syntax("XML")),
+                ("shell", self.tr("Shell"),
+                 lambda: self.set_syntax("Shell")),
                 ("invisible-symbol", self.tr("Show/hide invisible symbol"),
                  self.set_invisible_symbol),
                 ("read-only", self.tr("Read only"), self._read_only),
@@ -102,6 +114,8 @@ class MainWindow(TestableMainWindow):
         self._menus["format"].setTitle(self.tr("&Format"))
         self._menus["syntax"].setTitle(self.tr("&Syntax"))
         self._menus["spell"].setTitle(self.tr("&Check spelling"))
+        self._find.retranslate_ui()
+        self._find_files.retranslate_ui()
 
         idx_current = self._tabs.currentIndex()
         idx_help = -1
@@ -133,6 +147,14 @@ class MainWindow(TestableMainWindow):
         self._tabs.currentChanged.connect(self.change_tab)
         self.setCentralWidget(self._tabs)
 
+        self._find.set_documents(self._documents)
+        self._find.activated.connect(self._show_found)
+        self._find.hide()
+        self.addDockWidget(Qt.BottomDockWidgetArea, self._find)
+        self._find_files.file_activated.connect(self._open_found)
+        self._find_files.hide()
+        self.addDockWidget(Qt.BottomDockWidgetArea, self._find_files)
+
         # Setup the menu
         self._menus["file"] = self.menuBar().addMenu(self.tr("&File"))
         self._menus["view"] = self.menuBar().addMenu(self.tr("&View"))
@@ -149,6 +171,9 @@ class MainWindow(TestableMainWindow):
         self._menus["file"].addAction(self._actions["save"])
         self._menus["file"].addAction(self._actions["save_as"])
         self._menus["file"].addSeparator()
+        self._menus["file"].addAction(self._actions["find-tabs"])
+        self._menus["file"].addAction(self._actions["find-files"])
+        self._menus["file"].addSeparator()
 
         self._menus["lang"] = self._menus["file"].addMenu(self.tr("&Language"))
         self._menus["lang"].addAction(self._actions["eng"])
@@ -164,6 +189,10 @@ class MainWindow(TestableMainWindow):
         self._menus["syntax"].addAction(self._actions["no-syntax"])
         self._menus["syntax"].addAction(self._actions["python"])
         self._menus["syntax"].addAction(self._actions["sql"])
+        self._menus["syntax"].addAction(self._actions["json"])
+        self._menus["syntax"].addAction(self._actions["ini"])
+        self._menus["syntax"].addAction(self._actions["xml"])
+        self._menus["syntax"].addAction(self._actions["shell"])
         self._menus["spell"] = self._menus["view"].addMenu(
             self.tr("&Check spelling"))
         self._menus["spell"].addAction(self._actions["eng-spell"])
@@ -181,6 +210,8 @@ class MainWindow(TestableMainWindow):
             self._actions["save"].setEnabled(False)
             self._actions["save_as"].setEnabled(False)
 
+        self._actions["find-tabs"].setShortcut("Ctrl+Shift+F")
+        self._actions["find-files"].setShortcut("Ctrl+Shift+G")
         self._actions["word-wrap"].setCheckable(True)
         self._actions["read-only"].setCheckable(True)
 
@@ -214,6 +245,51 @@ class MainWindow(TestableMainWindow):
         if self._tabs.count() > 0:
             self._tabs.widget(self._tabs.currentIndex()).set_word_wrap()
 
+    # -------------------------------------------------------------------------
+    def find_in_tabs(self):
+        self._find.show()
+        self._find.controls["search-edit"].setFocus()
+        self._find.controls["search-edit"].selectAll()
+
+    # -------------------------------------------------------------------------
+    def find_in_files(self):
+        controls = self._find_files.controls
+        if self._find_files.isHidden():
+            controls["folder-edit"].setText(self.cfg.get(
+                "TextEditor/LastPath", os.path.abspath("."), system=True))
+        self._find_files.show()
+        controls["search-edit"].setFocus()
+        controls["search-edit"].selectAll()
+
+    # -------------------------------------------------------------------------
+    def _open_found(self, path, line, column, length):
+        """Shows the match found in the file (the file is opened as text)."""
+        for i in range(self._tabs.count()):
+            if self._tabs.widget(i).file_path() == realpath(path):
+                self._tabs.setCurrentIndex(i)
+                break
+        else:
+            self.open_file(path, fmt="text")
+            if self._tabs.widget(self._tabs.currentIndex()).file_path() != \
+                    realpath(path):
+                return  # the file is removed after the search
+        self._tabs.widget(self._tabs.currentIndex()).select_in_line(
+            line, column, length)
+
+    # -------------------------------------------------------------------------
+    def _documents(self):
+        """The snapshots of the texts of the tabs for the search."""
+        tabs = (self._tabs.widget(i) for i in range(self._tabs.count()))
+        return [(w, w.get_name(), w.plain_text()) for w in tabs]
+
+    # -------------------------------------------------------------------------
+    def _show_found(self, widget, start, end):
+        idx = self._tabs.indexOf(widget)
+        if idx < 0:
+            return  # the tab is closed after the search
+        self._tabs.setCurrentIndex(idx)
+        widget.select(start, end)
+
     # -------------------------------------------------------------------------
     def closeEvent(self, event):
         self.write_settings()
@@ -271,8 +347,9 @@ class MainWindow(TestableMainWindow):
         self._actions["read-only"].setEnabled(not w.is_help_text())
         self._menus["format"].setEnabled(not w.is_read_only())
         self._menus["syntax"].setEnabled(textmode)
+        # the comments and the strings of the code are spell checked
         self._menus["spell"].setEnabled(
-            not textmode and self._spell.enabled("all"))
+            (not textmode or w.has_syntax()) and self._spell.enabled("all"))
 
     # -------------------------------------------------------------------------
     def change_enabled_save(self):
@@ -295,8 +372,9 @@ class MainWindow(TestableMainWindow):
     # -------------------------------------------------------------------------
     def set_syntax(self, name_syntax):
         if self._tabs.count() > 0:
-            self._tabs.widget(
-                self._tabs.currentIndex()).set_highlighter(name_syntax)
+            idx = self._tabs.currentIndex()
+            self._tabs.widget(idx).set_highlighter(name_syntax)
+            self.change_tab(idx)
 
     # -------------------------------------------------------------------------
     def set_invisible_symbol(self):
@@ -368,6 +446,12 @@ class MainWindow(TestableMainWindow):
             (self.tr("Python files (*.py *.pyw)"),
              "Python", False, ["py", "pyw"]),
             (self.tr("SQL scripts (*.sql)"), "SQL", False, ["sql"]),
+            (self.tr("JSON files (*.json)"), "JSON", False, ["json"]),
+            (self.tr("INI files (*.ini *.cfg *.conf)"),
+             "INI", False, ["ini", "cfg", "conf"]),
+            (self.tr("XML files (*.xml)"), "XML", False, ["xml"]),
+            (self.tr("Shell scripts (*.sh *.bash)"),
+             "Shell", False, ["sh", "bash"]),
             (self.tr("Text files (*.txt)"),
              self.tr("-- no --"), False, ["txt"]),
         ]
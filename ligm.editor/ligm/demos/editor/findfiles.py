@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Panel of the search in the files on disk.
+
+The folder is walked in the thread (the ignored names are skipped, see
+IGNORE), the found files are sent by batches to the pool of processes.
+Each file is mapped to memory (mmap) and its bytes are matched by the
+bytes pattern, so the file is not read into the Python string; the files
+with zero bytes at the start are binary and skipped. The matches are
+added to the list as the batches are done.
+
+The pattern is matched in UTF-8, the case is ignored for ASCII letters.
+"""
+
+import fnmatch
+import mmap
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PyQt5.Qt import Qt, pyqtSignal
+from PyQt5.QtWidgets import (QLineEdit, QToolButton, QFileDialog,
+                             QHBoxLayout, QListWidgetItem)
+from .findpanel import FindPanel, _pool, _drop_pool
+
+
+# the names of the folders and files not searched (separated by ";")
+IGNORE = ".git;.hg;.svn;__pycache__;*.pyc;*.pyo;*.so;*.dll;*.exe;*.zip"
+
+BATCH_SIZE = 64        # files searched by one task
+BINARY_SIZE = 8192     # bytes checked for zero bytes
+
+_walker = ThreadPoolExecutor(max_workers=1)
+
+
+# =============================================================================
+def compile_pattern(text, case_sensitive=False, regex=False):
+    """The bytes pattern and the error of the regular expression."""
+    pattern = text.encode("utf-8")
+    if not regex:
+        pattern = re.escape(pattern)
+    flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
+    try:
+        return re.compile(pattern, flags), ""
+    except re.error as err:
+        return None, str(err)
+
+
+# =============================================================================
+def ignored(name, globs):
+    return any(fnmatch.fnmatch(name, glob) for glob in globs)
+
+
+# =============================================================================
+def walk(root, globs):
+    """Yields the paths of the files of the folder without ignored ones."""
+    for folder, folders, files in os.walk(root):
+        folders[:] = sorted(f for f in folders if not ignored(f, globs))
+        for name in sorted(files):
+            if not ignored(name, globs):
+                yield os.path.join(folder, name)
+
+
+# =============================================================================
+def _decode(data):
+    return data.decode("utf-8", "replace")
+
+
+# =============================================================================
+def search_file(pattern, path, limit=None):
+    """
+    Called in the worker process: the list of (line, column, length, text of
+    line) of the matches in the file (the columns and the lengths are in
+    the characters).
+    """
+    try:
+        with open(path, "rb") as file:
+            if not os.fstat(file.fileno()).st_size:
+                return []
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if b"\0" in data[:BINARY_SIZE]:
+                    return []  # the binary file
+                return _find(pattern, data, limit)
+    except (OSError, ValueError):
+        return []  # the file is not readable
+
+
+# =============================================================================
+def _find(pattern, data, limit):
+    hits, line, last = [], 0, 0
+    for match in pattern.finditer(data):
+        start, end = match.span()
+        if end == start:
+            continue  # without empty matches
+        line += data[last:start].count(b"\n")
+        last = start
+        begin = data.rfind(b"\n", 0, start) + 1
+        stop = data.find(b"\n", start)
+        stop = len(data) if stop < 0 else stop
+        hits.append((line, len(_decode(data[begin:start])),
+                     len(_decode(data[start:end])),
+                     _decode(data[begin:stop]).rstrip("\r")))
+        if limit is not None and len(hits) >= limit:
+            break
+    return hits
+
+
+# =============================================================================
+def search_files(pattern, paths, limit=None):
+    """Called in the worker process: the list of (path, matches)."""
+    result = []
+    for path in paths:
+        hits = search_file(pattern, path, limit)
+        if hits:
+            result.append((path, hits))
+    return result
+
+
+# =============================================================================
+class FindInFilesPanel(FindPanel):
+
+    file_activated = pyqtSignal(str, int, int, int)  # path, line, col, length
+    _walked = pyqtSignal(int, object)                # job, batch of paths
+
+    # -------------------------------------------------------------------------
+    def __init__(self, parent=None):
+        super(FindInFilesPanel, self).__init__(parent)
+        self.setObjectName("find-files-panel")
+        self._root = ""
+        self.controls["folder-edit"] = QLineEdit(os.path.abspath("."))
+        self.controls["folder-btn"] = QToolButton()
+        self.controls["ignore-edit"] = QLineEdit(IGNORE)
+
+        folder = QHBoxLayout()
+        folder.addWidget(self.controls["folder-edit"])
+        folder.addWidget(self.controls["folder-btn"])
+        folder.addWidget(self.controls["ignore-edit"])
+        self.widget().layout().insertLayout(1, folder)
+
+        self.controls["folder-btn"].setText("...")
+        self.controls["folder-btn"].clicked.connect(self._choose_folder)
+        self.controls["folder-edit"].returnPressed.connect(self.find)
+        self.controls["ignore-edit"].returnPressed.connect(self.find)
+        self._walked.connect(self._submit)
+        self.retranslate_ui()
+
+    # -------------------------------------------------------------------------
+    def retranslate_ui(self):
+        super(FindInFilesPanel, self).retranslate_ui()
+        self.setWindowTitle(self.tr("Find in files"))
+        if "ignore-edit" in self.controls:
+            self.controls["folder-edit"].setToolTip(self.tr("Folder"))
+            self.controls["ignore-edit"].setToolTip(
+                self.tr("Ignored folders and files (separated by ';')"))
+
+    # -------------------------------------------------------------------------
+    def _choose_folder(self):  # pragma: no cover
+        folder = QFileDialog.getExistingDirectory(
+            self, self.tr("Folder"), self.controls["folder-edit"].text())
+        if folder:
+            self.controls["folder-edit"].setText(folder)
+
+    # -------------------------------------------------------------------------
+    def find(self):
+        self.cancel()
+        self.controls["results"].clear()
+        self._count, self._capped = 0, False
+        controls = self.controls
+        pattern, error = compile_pattern(
+            controls["search-edit"].text(),
+            case_sensitive=controls["cs-box"].isChecked(),
+            regex=controls["regex-box"].isChecked())
+        self._root = controls["folder-edit"].text()
+        if not controls["search-edit"].text() or pattern is None:
+            controls["info"].setText(error)
+            return
+        if not os.path.isdir(self._root):
+            controls["info"].setText(self.tr("Folder not found"))
+            return
+
+        globs = [g.strip() for g in controls["ignore-edit"].text().split(";")
+                 if g.strip()]
+        job = self._job
+        self._pending = 1  # the walk of the folder
+        self._futures.append(_walker.submit(
+            self._walk, job, pattern, self._root, globs))
+        self._show_info()
+
+    # -------------------------------------------------------------------------
+    def _walk(self, job, pattern, root, globs):
+        """Called in the thread: sends the batches of files to the GUI."""
+        batch = []
+        for path in walk(root, globs):
+            if job != self._job:
+                return  # the search is cancelled
+            batch.append(path)
+            if len(batch) == BATCH_SIZE:
+                self._walked.emit(job, (pattern, batch))
+                batch = []
+        self._walked.emit(job, (pattern, batch))
+        self._walked.emit(job, None)  # the end of the walk
+
+    # -------------------------------------------------------------------------
+    def _submit(self, job, batch):
+        if job != self._job:
+            return  # the batch of the cancelled search
+        if batch is None:
+            self._add(job, [])  # the walk is done
+            return
+        pattern, paths = batch
+        if not paths:
+            return
+        # the done task calls back at once (in this thread)
+        self._pending += 1
+        try:
+            future = _pool().submit(search_files, pattern, paths,
+                                    self.max_hits)
+        except BrokenProcessPool:  # pragma: no cover
+            _drop_pool()  # e.g. a worker was killed
+            future = _pool().submit(search_files, pattern, paths,
+                                    self.max_hits)
+        self._futures.append(future)
+        future.add_done_callback(lambda f: self._batch_done(job, f))
+
+    # -------------------------------------------------------------------------
+    def _batch_done(self, job, future):
+        """Called in the thread of the pool (or in this one if done)."""
+        try:
+            result = future.result()
+        except BrokenProcessPool:
+            _drop_pool()
+            result = []
+        except Exception:
+            # the batch is cancelled or failed: nothing is found in it, but
+            # it is counted as done
+            result = []
+        try:
+            self._found.emit(job, result)
+        except RuntimeError:  # pragma: no cover
+            pass  # the panel is deleted
+
+    # -------------------------------------------------------------------------
+    def _add(self, job, result):
+        if job != self._job:
+            return  # the result of the cancelled search
+        results = self.controls["results"]
+        self._pending -= 1
+        for path, hits in result:
+            self._count += len(hits)
+            # the matches after max_hits of the file are not counted
+            self._capped |= len(hits) >= self.max_hits
+            name = os.path.relpath(path, self._root)
+            for line, column, length, text in \
+                    hits[:self.max_hits - results.count()]:
+                item = QListWidgetItem(f"{name}:{line + 1}: {text.strip()}")
+                item.setData(Qt.UserRole, (path, line, column, length))
+                results.addItem(item)
+        self._show_info()
+        if not self._pending:
+            self._futures = []
+
+    # -------------------------------------------------------------------------
+    def _activate(self, item):
+        self.file_activated.emit(*item.data(Qt.UserRole))
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""
+Panel of the search in the open documents.
+
+The plain texts of the tabs are taken in the GUI thread (the snapshots),
+then they are split into the pieces at the lines and searched by the pool
+of threads. The regular expression may match several lines, the whole text
+is searched at once by the pool of processes (a long match does not hold
+the GIL of the GUI). The found matches are added to the list as the pieces
+are done, so the GUI is not blocked by a hundred of large documents. The
+new search cancels the previous one (its results are ignored).
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PyQt5.Qt import Qt, pyqtSignal
+from PyQt5.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLineEdit, QCheckBox, QListWidget, QLabel,
+                             QListWidgetItem)
+from ligm.core.text.editor.search import Query
+
+
+_executor = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+_processes = None
+
+# characters of the piece of the text searched by one task
+CHUNK_SIZE = 256 * 1024
+
+
+# =============================================================================
+def _pool():
+    global _processes
+    if _processes is None:
+        # the new processes do not inherit the state of Qt
+        _processes = ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context("spawn"))
+    return _processes
+
+
+# =============================================================================
+def _drop_pool():
+    """The broken pool is replaced with the new one on the next search."""
+    global _processes
+    _processes = None
+
+
+# =============================================================================
+def chunks(text, size=CHUNK_SIZE):
+    """
+    Yields (piece, position, line) - the pieces of the text ended at the
+    lines, their positions and the numbers of their first lines.
+    """
+    position, line = 0, 0
+    while position < len(text):
+        end = text.find("\n", position + size)
+        end = len(text) if end < 0 else end + 1
+        yield text[position:end], position, line
+        line += text.count("\n", position, end)
+        position = end
+
+
+# =============================================================================
+def find_lines(pattern, text, position=0, line=0, limit=None):
+    """
+    Called in the worker: (count, hits) - the count of the matches of the
+    pattern in the piece of the text and the list of (start, end, line,
+    text of line) of the first ``limit`` of them.
+    """
+    count, hits, last = 0, [], 0
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        if end == start:
+            continue  # without empty matches
+        count += 1
+        if limit is not None and len(hits) >= limit:
+            continue  # only counted
+        line += text.count("\n", last, start)
+        last = start
+        begin = text.rfind("\n", 0, start) + 1
+        stop = text.find("\n", start)
+        stop = len(text) if stop < 0 else stop
+        hits.append((position + start, position + end, line,
+                     text[begin:stop]))
+    return count, hits
+
+
+# =============================================================================
+class FindPanel(QDockWidget):
+
+    activated = pyqtSignal(object, int, int)   # document, start, end
+    _found = pyqtSignal(int, object)  # job, (document, name, count, hits)
+
+    max_hits = 10000  # the matches shown in the list
+
+    # -------------------------------------------------------------------------
+    def __init__(self, parent=None):
+        super(FindPanel, self).__init__(parent)
+        self.setObjectName("find-panel")
+        self.controls = {
+            "search-edit": QLineEdit(),
+            "cs-box": QCheckBox(),
+            "regex-box": QCheckBox(),
+            "results": QListWidget(),
+            "info": QLabel(),
+        }
+        self._job = 0           # number of the last search
+        self._futures = []
+        self._pending = 0       # pieces of the last search not done yet
+        self._count = 0         # matches of the last search
+        self._capped = False    # some matches are not counted
+
+        top = QHBoxLayout()
+        top.addWidget(self.controls["search-edit"])
+        top.addWidget(self.controls["cs-box"])
+        top.addWidget(self.controls["regex-box"])
+        layout = QVBoxLayout()
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.addLayout(top)
+        layout.addWidget(self.controls["results"])
+        layout.addWidget(self.controls["info"])
+        widget = QWidget()
+        widget.setLayout(layout)
+        self.setWidget(widget)
+
+        self.controls["search-edit"].returnPressed.connect(self.find)
+        self.controls["results"].itemActivated.connect(self._activate)
+        self.controls["results"].itemClicked.connect(self._activate)
+        self._found.connect(self._add)
+        self._documents = lambda: []
+        self.retranslate_ui()
+
+    # -------------------------------------------------------------------------
+    def retranslate_ui(self):
+        self.setWindowTitle(self.tr("Find in open documents"))
+        self.controls["search-edit"].setPlaceholderText(self.tr("Find"))
+        self.controls["cs-box"].setText(self.tr("case sensitive"))
+        self.controls["regex-box"].setText(self.tr("regular expression"))
+
+    # -------------------------------------------------------------------------
+    def set_documents(self, documents):
+        """
+        The function returning the list of (document, name, plain text) -
+        the snapshots of the documents to search.
+        """
+        self._documents = documents
+
+    # -------------------------------------------------------------------------
+    def is_busy(self):
+        return self._pending > 0
+
+    # -------------------------------------------------------------------------
+    def cancel(self):
+        self._job += 1
+        for future in self._futures:
+            future.cancel()
+        self._futures, self._pending = [], 0
+
+    # -------------------------------------------------------------------------
+    def find(self):
+        self.cancel()
+        self.controls["results"].clear()
+        self._count, self._capped = 0, False
+        controls = self.controls
+        query = Query(controls["search-edit"].text(),
+                      case_sensitive=controls["cs-box"].isChecked(),
+                      regex=controls["regex-box"].isChecked())
+        if not query.pattern:
+            controls["info"].setText(query.error)
+            return
+
+        job = self._job
+        for document, name, text in self._documents():
+            # the regular expression may match several lines
+            pieces = [(text, 0, 0)] if query.regex else chunks(text)
+            executor = _pool() if query.regex else _executor
+            for piece, position, line in pieces:
+                # the done task calls back at once (in this thread)
+                self._pending += 1
+                try:
+                    future = executor.submit(find_lines, query.pattern,
+                                             piece, position, line,
+                                             self.max_hits)
+                except BrokenProcessPool:  # pragma: no cover
+                    _drop_pool()  # e.g. a worker was killed
+                    executor = _pool()
+                    future = executor.submit(find_lines, query.pattern,
+                                             piece, position, line,
+                                             self.max_hits)
+                self._futures.append(future)
+                future.add_done_callback(
+                    lambda f, d=document, n=name: self._done(job, d, n, f))
+        self._show_info()
+
+    # -------------------------------------------------------------------------
+    def _done(self, job, document, name, future):
+        """Called in the thread of the pool (or in this one if done)."""
+        try:
+            count, hits = future.result()
+        except BrokenProcessPool:  # pragma: no cover
+            _drop_pool()
+            count, hits = 0, []
+        except Exception:
+            # the piece is cancelled or failed: nothing is found in it, but
+            # it is counted as done
+            count, hits = 0, []
+        try:
+            self._found.emit(job, (document, name, count, hits))
+        except RuntimeError:  # pragma: no cover
+            pass  # the panel is deleted
+
+    # -------------------------------------------------------------------------
+    def _add(self, job, result):
+        if job != self._job:
+            return  # the result of the cancelled search
+        document, name, count, hits = result
+        results = self.controls["results"]
+        self._pending -= 1
+        self._count += count
+        for start, end, line, text in hits[:self.max_hits - results.count()]:
+            item = QListWidgetItem(f"{name}:{line + 1}: {text.strip()}")
+            item.setData(Qt.UserRole, (document, start, end))
+            results.addItem(item)
+        self._show_info()
+        if not self._pending:
+            self._futures = []
+
+    # -------------------------------------------------------------------------
+    def _show_info(self):
+        text = self.tr("Results found") + f": {self._count}"
+        if self._capped:
+            text += "+"
+        if self._pending:
+            text += " ..."
+        self.controls["info"].setText(text)
+
+    # -------------------------------------------------------------------------
+    def _activate(self, item):
+        self.activated.emit(*item.data(Qt.UserRole))
@@ -1,59 +1,60 @@
 <?xml version="1.0" encoding="utf-8"?>
-<!DOCTYPE TS><TS version="2.0" language="ru_RU" sourcelanguage="">
+<!DOCTYPE TS>
+<TS version="2.1" language="ru_RU">
 <context>
     <name>MainWindow</name>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>Exit</source>
         <translation>Выход</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>About</source>
         <translation>О программе</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>About Qt</source>
         <translation>О Qt</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="138"/>
+        <location filename="../../demoedit.py" line="159"/>
         <source>&amp;File</source>
         <translation>&amp;Файл</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="140"/>
+        <location filename="../../demoedit.py" line="161"/>
         <source>&amp;Help</source>
         <translation>&amp;Справка</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="284"/>
+        <location filename="../../demoedit.py" line="359"/>
         <source>Demo for &apos;Embedded text editor&apos;</source>
         <translation>Демонстрация встраиваемого текстового редактора</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="286"/>
+        <location filename="../../demoedit.py" line="361"/>
         <source>Information</source>
         <translation>Информация</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>English</source>
         <translation>Английский</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>Russian</source>
         <translation>Русский</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="154"/>
+        <location filename="../../demoedit.py" line="178"/>
         <source>&amp;Language</source>
         <translation>&amp;Язык</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="128"/>
+        <location filename="../../demoedit.py" line="141"/>
         <source>[Demo] Embedded text editor</source>
         <translation>Встраиваемый текстовый редактор (демо)</translation>
     </message>
@@ -68,27 +69,27 @@
         <translation type="obsolete">Вы действительно хотите продолжить?</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="285"/>
+        <location filename="../../demoedit.py" line="360"/>
         <source>(C) 2019, Vladimir Rukavishnikov</source>
         <translation>(C) 2019, Владимир Рукавишников</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>New</source>
         <translation>Новый</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>Open</source>
         <translation>Открыть</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>Save</source>
         <translation>Сохранить</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>Save as ...</source>
         <translation>Сохранить как ...</translation>
     </message>
@@ -98,12 +99,12 @@
         <translation type="obsolete">Все файлы (*.*)</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="373"/>
+        <location filename="../../demoedit.py" line="453"/>
         <source>-- no --</source>
         <translation>-- нет --</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="370"/>
+        <location filename="../../demoedit.py" line="444"/>
         <source>Python files (*.py *.pyw)</source>
         <translation>Файлы python (*.py *.pyw)</translation>
     </message>
@@ -113,114 +114,164 @@
         <translation type="obsolete">SQL скрипты (*.sql)</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="373"/>
+        <location filename="../../demoedit.py" line="453"/>
         <source>Text files (*.txt)</source>
         <translation>Текстовые файлы (*.txt)</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="385"/>
+        <location filename="../../demoedit.py" line="465"/>
         <source>Syntax</source>
         <translation>Синтаксис</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="372"/>
+        <location filename="../../demoedit.py" line="446"/>
         <source>SQL scripts (*.sql)</source>
         <translation>SQL скрипты (*.sql)</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="242"/>
+        <location filename="../../demoedit.py" line="317"/>
         <source>The file</source>
         <translation>Файл</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="243"/>
+        <location filename="../../demoedit.py" line="318"/>
         <source>is changed</source>
         <translation>изменен</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="244"/>
+        <location filename="../../demoedit.py" line="319"/>
         <source>Save it ?</source>
         <translation>Сохранить его?</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>Only text</source>
         <translation>Только текст</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>HTML</source>
         <translation>HTML</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>--no--</source>
         <translation>--нет--</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>Python</source>
         <translation>Python</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>SQL</source>
         <translation>SQL</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>Show/hide invisible symbol</source>
         <translation>Показать/скрыть &quot;невидимые&quot; символы</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="139"/>
+        <location filename="../../demoedit.py" line="160"/>
         <source>&amp;View</source>
         <translation>Вид</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="161"/>
+        <location filename="../../demoedit.py" line="185"/>
         <source>&amp;Format</source>
         <translation>Формат</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="164"/>
+        <location filename="../../demoedit.py" line="188"/>
         <source>&amp;Syntax</source>
         <translation>Синтаксис</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>Read only</source>
         <translation>Только чтение</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>Word wrap</source>
         <translation>Перенос по словам</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="369"/>
+        <location filename="../../demoedit.py" line="443"/>
         <source>All files (*)</source>
         <translation>Все файлы (*)</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>User manual</source>
         <translation>Руководство пользователя</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>russian language</source>
         <translation>русский язык</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="44"/>
+        <location filename="../../demoedit.py" line="48"/>
         <source>english language</source>
         <translation>английский язык</translation>
     </message>
     <message>
-        <location filename="../../demoedit.py" line="168"/>
+        <location filename="../../demoedit.py" line="196"/>
         <source>&amp;Check spelling</source>
         <translation>Проверка орфографии</translation>
     </message>
+    <message>
+        <location filename="../../demoedit.py" line="48"/>
+        <source>Find in open documents</source>
+        <translation>Найти в открытых документах</translation>
+    </message>
+    <message>
+        <location filename="../../demoedit.py" line="48"/>
+        <source>Find in files</source>
+        <translation>Найти в файлах</translation>
+    </message>
+    <message>
+        <location filename="../../demoedit.py" line="48"/>
+        <source>JSON</source>
+        <translation>JSON</translation>
+    </message>
+    <message>
+        <location filename="../../demoedit.py" line="48"/>
+        <source>INI</source>
+        <translation>INI</translation>
+    </message>
+    <message>
+        <location filename="../../demoedit.py" line="48"/>
+        <source>XML/HTML</source>
+        <translation>XML/HTML</translation>
+    </message>
+    <message>
+        <location filename="../../demoedit.py" line="48"/>
+        <source>Shell</source>
+        <translation>Shell</translation>
+    </message>
+    <message>
+        <location filename="../../demoedit.py" line="447"/>
+        <source>JSON files (*.json)</source>
+        <translation>Файлы JSON (*.json)</translation>
+    </message>
+    <message>
+        <location filename="../../demoedit.py" line="448"/>
+        <source>INI files (*.ini *.cfg *.conf)</source>
+        <translation>Файлы INI (*.ini *.cfg *.conf)</translation>
+    </message>
+    <message>
+        <location filename="../../demoedit.py" line="450"/>
+        <source>XML files (*.xml)</source>
+        <translation>Файлы XML (*.xml)</translation>
+    </message>
+    <message>
+        <location filename="../../demoedit.py" line="451"/>
+        <source>Shell scripts (*.sh *.bash)</source>
+        <translation>Shell скрипты (*.sh *.bash)</translation>
+    </message>
 </context>
 </TS>
@@ -6,21 +6,27 @@
 
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 from PyQt5.Qt import QWidget, Qt, QVBoxLayout, pyqtSignal, QFileDialog
 from ligm.core.text import TextEditor
-from ligm.core.common import realpath
+from ligm.core.common import realpath, write_atomic
 from ligm.core.qt import TestableWidget
 
 
 TWidget = Union[QWidget, TestableWidget]
 
+_executor = ThreadPoolExecutor(max_workers=1)
+
 
 # =============================================================================
 class TabEdit(TestableWidget):
 
     enabled_save_signal = pyqtSignal(bool)     # for update status "Save"
 
+    async_size = 1_000_000  # the larger files are loaded in the background
+    read_size = 1 << 20     # bytes read at once in the background
+
     # -------------------------------------------------------------------------
     def __init__(self, parent: TWidget, file_path=None,
                  text_format="HTML", highlighter="", func_after_save=None,
@@ -33,6 +39,9 @@ class TabEdit(TestableWidget):
                                   format=text_format,
                                   load=self._load,
                                   save=self._save,
+                                  save_background=self._write,
+                                  load_async=self._load_async,
+                                  save_async=self._save_async,
                                   spell=spell)
         self._editor.enabled_save_signal.connect(self.set_enabled_save)
         self._func_after_save = func_after_save
@@ -49,7 +58,11 @@ class TabEdit(TestableWidget):
         self._highlighter = highlighter
         self._is_modified = False
         self._editor.set_option(highlighter=highlighter)
-        self._editor.load()
+        if file_path and os.path.isfile(file_path) and \
+                os.path.getsize(file_path) >= self.async_size:
+            self._editor.load_async()
+        else:
+            self._editor.load()
 
     # -------------------------------------------------------------------------
     def set_read_only(self, value):
@@ -78,6 +91,23 @@ class TabEdit(TestableWidget):
         self._highlighter = highlighter
         self._editor.set_option(highlighter=highlighter)
 
+    # -------------------------------------------------------------------------
+    def plain_text(self):
+        return self._editor.get_option("plain_text")
+
+    # -------------------------------------------------------------------------
+    def select(self, start, end):
+        self._editor.set_option(select=(start, end))
+        self._editor.setFocus()
+
+    # -------------------------------------------------------------------------
+    def select_in_line(self, line, column, length):
+        block = self._editor.doc.text.findBlockByNumber(line)
+        if not block.isValid():
+            block = self._editor.doc.text.lastBlock()
+        start = block.position() + column
+        self.select(start, start + length)
+
     # -------------------------------------------------------------------------
     def get_word_wrap(self):
         return self._editor.get_option("word-wrap")
@@ -103,6 +133,11 @@ class TabEdit(TestableWidget):
     def highlighter(self):
         return self._highlighter
 
+    # -------------------------------------------------------------------------
+    def has_syntax(self):
+        """The syntax highlighter of the language is set."""
+        return bool(self._editor.get_option("highlighter"))
+
     # -------------------------------------------------------------------------
     def set_enabled_save(self, is_enabled):
         self._is_modified = is_enabled
@@ -136,6 +171,39 @@ class TabEdit(TestableWidget):
         with open(self._file_path, encoding="utf-8") as file:
             return file.read()
 
+    # -------------------------------------------------------------------------
+    def _load_async(self, progress):
+        return _executor.submit(self._read, progress)
+
+    # -------------------------------------------------------------------------
+    def _read(self, progress):
+        """Called in the worker thread: the text of the file."""
+        if not self._file_path or not os.path.exists(self._file_path):
+            return ""
+        size, data = os.path.getsize(self._file_path), []
+        with open(self._file_path, "rb") as file:
+            while True:
+                chunk = file.read(self.read_size)
+                if not chunk:
+                    break
+                data.append(chunk)
+                if not progress(min(99, len(data) * self.read_size * 100 //
+                                    max(size, 1))):
+                    return ""  # the loading is cancelled
+        text = b"".join(data).decode("utf-8")
+        # the newlines as in the file read in the text mode (see _load)
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    # -------------------------------------------------------------------------
+    def _save_async(self, txt, progress):
+        if not self._file_path or self._func_after_save is not None:
+            return self._save(txt)  # in this thread (see _write)
+        return _executor.submit(self._write, txt)
+
+    # -------------------------------------------------------------------------
+    def is_busy(self):
+        return self._editor.is_busy()
+
     # -------------------------------------------------------------------------
     def save(self):  # pragma: no cover
         self._editor.save()
@@ -175,12 +243,19 @@ class TabEdit(TestableWidget):
             if not self.get_filename_for_save():
                 return False
         self._prev_text_format = self._text_format
-        with open(self._file_path, "w", encoding="utf-8") as file:
-            file.write(txt)
+        write_atomic(self._file_path, txt)
 
         if self._func_after_save is not None:
             self._func_after_save()
 
+    # -------------------------------------------------------------------------
+    def _write(self, txt):
+        """Called in the worker thread when the text is saved automatically."""
+        if not self._file_path or self._func_after_save is not None:
+            return False  # it is saved by _save()
+        self._prev_text_format = self._text_format
+        write_atomic(self._file_path, txt)
+
     # -------------------------------------------------------------------------
     def is_help_text(self):
         """
@@ -4,9 +4,12 @@
 
 """Tests for demo for embedded text editor."""
 
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
-from PyQt5.Qt import QMessageBox, QFileDialog, QTextOption, QPoint, Qt
+from PyQt5.Qt import (QMessageBox, QFileDialog, QTextOption, QPoint, Qt,
+                      QApplication)
 from ligm.demos.editor.tabedit import TabEdit
 from ligm.demos.editor.demoedit import MainWindow
 from ligm.core.qt import install_translators, QTestHelper
@@ -197,6 +200,26 @@ class DemoEditTest(unittest.TestCase):
         self.m.set_syntax("Python")
         self.assertEqual(w.highlighter(), "Python")
 
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_spell_menu")
+    def test_spell_menu(self):
+        cnt = self.m._tabs.count()
+        self.m.open_file()
+        menu = self.m._menus["spell"]
+        with patch.object(self.m._spell, "enabled", return_value=True):
+            self.m.change_tab(cnt)
+            self.assertTrue(menu.isEnabled())
+            with patch.object(QMessageBox, 'question',
+                              return_value=QMessageBox.Yes):
+                self.m.set_format("text")
+            self.assertFalse(menu.isEnabled())
+
+            # the code is spell checked in the text mode
+            self.m.set_syntax("Python")
+            self.assertTrue(menu.isEnabled())
+            self.m.set_syntax("--no--")
+            self.assertFalse(menu.isEnabled())
+
     # -------------------------------------------------------------------------
     @unittest.skipIf(DEBUG, "test_set_invisible_symbol")
     def test_set_invisible_symbol(self):
@@ -323,3 +346,70 @@ class DemoEditTest(unittest.TestCase):
 
         self.m.help()
         self.assertEqual(check_is_help(), True)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_find_in_tabs")
+    def test_find_in_tabs(self):
+        cnt = self.m._tabs.count()
+        for text in ("one\ntwo needle", "needle\nthree", "four"):
+            self.m.open_file()
+            self.m._tabs.widget(self.m._tabs.count() - 1)._editor.view.text\
+                .setPlainText(text)
+
+        self.m.find_in_tabs()
+        panel = self.m._find
+        panel.controls["search-edit"].setText("needle")
+        panel.find()
+        while panel.is_busy():
+            QApplication.processEvents()
+        results = panel.controls["results"]
+        self.assertEqual(results.count(), 2)
+
+        # the click on the match shows it in its tab
+        item = [results.item(i) for i in range(results.count())
+                if results.item(i).data(Qt.UserRole)[1] == 8][0]
+        self.assertIn(":2: two needle", item.text())
+        panel.controls["results"].itemClicked.emit(item)
+        self.assertEqual(self.m._tabs.currentIndex(), cnt)
+        cursor = self.m._tabs.widget(cnt)._editor.view.text.textCursor()
+        self.assertEqual(cursor.selectedText(), "needle")
+        self.assertEqual(cursor.selectionStart(), 8)
+
+        # the tab is closed after the search
+        with patch.object(QMessageBox, 'question',
+                          return_value=QMessageBox.No):
+            self.m.close_tab(cnt)
+        panel.controls["results"].itemClicked.emit(item)
+        self.assertEqual(self.m._tabs.count(), cnt + 2)
+        with patch.object(QMessageBox, 'question',
+                          return_value=QMessageBox.No):
+            self.m.close_tab(cnt + 1)
+            self.m.close_tab(cnt)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_find_in_files")
+    def test_find_in_files(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "test.txt")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("one\ntwo needle\n")
+
+            cnt = self.m._tabs.count()
+            self.m.find_in_files()
+            self.assertFalse(self.m._find_files.isHidden())
+            self.m._open_found(path, 1, 4, 6)
+            self.assertEqual(self.m._tabs.count(), cnt + 1)
+            w = self.m._tabs.widget(self.m._tabs.currentIndex())
+            self.assertEqual(w._editor.view.text.textCursor().selectedText(),
+                             "needle")
+
+            # the open file is not opened again
+            self.m._tabs.setCurrentIndex(0)
+            self.m._open_found(path, 0, 0, 3)
+            self.assertEqual(self.m._tabs.count(), cnt + 1)
+            self.assertEqual(w._editor.view.text.textCursor().selectedText(),
+                             "one")
+
+            self.m._open_found(os.path.join(folder, "no.txt"), 0, 0, 3)
+            self.assertEqual(self.m._tabs.count(), cnt + 1)
+            self.m.close_tab(cnt)
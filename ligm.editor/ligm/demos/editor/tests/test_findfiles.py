@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Tests for the panel of the search in the files."""
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from PyQt5.Qt import QApplication, Qt
+from ligm.demos.editor.findfiles import (FindInFilesPanel, compile_pattern,
+                                         search_file, walk)
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class FindInFilesTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        files = {
+            "a.txt": "one\r\nпривет needle\r\n",
+            "b.py": "needle = 1\n",
+            "empty.txt": "",
+            os.path.join("sub", "c.txt"): "x\n" * 1000 + "NEEDLE",
+            os.path.join(".git", "d.txt"): "needle",
+            "e.pyc": "needle",
+        }
+        for name, text in files.items():
+            path = os.path.join(self.root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8", newline="") as file:
+                file.write(text)
+        with open(os.path.join(self.root, "bin.dat"), "wb") as file:
+            file.write(b"needle\0\1")
+
+    # -------------------------------------------------------------------------
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_walk")
+    def test_walk(self):
+        names = [os.path.relpath(p, self.root)
+                 for p in walk(self.root, [".git", "*.pyc"])]
+        self.assertEqual(names, ["a.txt", "b.py", "bin.dat", "empty.txt",
+                                 os.path.join("sub", "c.txt")])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_search_file")
+    def test_search_file(self):
+        pattern, _ = compile_pattern("needle")
+        path = os.path.join(self.root, "a.txt")
+
+        # the columns and the lengths are in the characters
+        self.assertEqual(search_file(pattern, path),
+                         [(1, 7, 6, "привет needle")])
+        self.assertEqual(search_file(pattern, os.path.join(
+            self.root, "sub", "c.txt")), [(1000, 0, 6, "NEEDLE")])
+        self.assertEqual(search_file(pattern, os.path.join(
+            self.root, "bin.dat")), [])
+        self.assertEqual(search_file(pattern, os.path.join(
+            self.root, "empty.txt")), [])
+        self.assertEqual(search_file(pattern, os.path.join(
+            self.root, "nothing.txt")), [])
+
+        pattern, _ = compile_pattern("привет \\w+", True, True)
+        self.assertEqual(search_file(pattern, path),
+                         [(1, 0, 13, "привет needle")])
+        pattern, error = compile_pattern("(x", regex=True)
+        self.assertIsNone(pattern)
+        self.assertTrue(error)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_find")
+    def test_find(self):
+        panel = FindInFilesPanel()
+        panel.controls["folder-edit"].setText(self.root)
+        panel.controls["search-edit"].setText("needle")
+        found = []
+        panel.file_activated.connect(lambda *args: found.append(args))
+
+        panel.find()
+        self.assertTrue(panel.is_busy())
+        while panel.is_busy():
+            QApplication.processEvents()
+        results = panel.controls["results"]
+        items = sorted(results.item(i).data(Qt.UserRole)[0]
+                       for i in range(results.count()))
+        self.assertEqual([os.path.relpath(p, self.root) for p in items],
+                         ["a.txt", "b.py", os.path.join("sub", "c.txt")])
+        self.assertIn("Results found: 3", panel.controls["info"].text())
+
+        results.itemActivated.emit(results.item(0))
+        self.assertEqual(len(found), 1)
+
+        # the matches after max_hits of the file are not counted
+        panel.max_hits = 1
+        with open(os.path.join(self.root, "b.py"), "a") as file:
+            file.write("needle = 2\n")
+        panel.find()
+        while panel.is_busy():
+            QApplication.processEvents()
+        self.assertIn("Results found: 3+", panel.controls["info"].text())
+
+        panel.controls["folder-edit"].setText(
+            os.path.join(self.root, "nothing"))
+        panel.find()
+        self.assertFalse(panel.is_busy())
+        self.assertEqual(results.count(), 0)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_failed_batch")
+    def test_failed_batch(self):
+        panel = FindInFilesPanel()
+        panel.controls["folder-edit"].setText(self.root)
+        panel.controls["search-edit"].setText("needle")
+
+        # the failed batch is done, the search is finished
+        with ThreadPoolExecutor() as pool, \
+                patch("ligm.demos.editor.findfiles._pool",
+                      return_value=pool), \
+                patch("ligm.demos.editor.findfiles.search_files",
+                      side_effect=MemoryError):
+            panel.find()
+            while panel.is_busy():
+                QApplication.processEvents()
+        self.assertEqual(panel.controls["results"].count(), 0)
+        self.assertIn("Results found: 0", panel.controls["info"].text())
+        self.assertEqual(panel._futures, [])
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# (2.6.0)
+
+"""Tests for the panel of the search in the open documents."""
+
+import re
+import unittest
+from PyQt5.Qt import QApplication, Qt
+from ligm.demos.editor.findpanel import FindPanel, chunks, find_lines
+from ligm.core.qt import QTestHelper
+
+
+DEBUG = QTestHelper().start_tests()
+
+
+# =============================================================================
+class FindPanelTest(unittest.TestCase):
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_chunks")
+    def test_chunks(self):
+        text = "abc\ndef\nghi\njk"
+        pieces = list(chunks(text, 5))
+        self.assertEqual(pieces, [("abc\ndef\n", 0, 0), ("ghi\njk", 8, 2)])
+        self.assertEqual(list(chunks(text, 100)), [(text, 0, 0)])
+        self.assertEqual(list(chunks("")), [])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_find_lines")
+    def test_find_lines(self):
+        pattern = re.compile("ab", re.IGNORECASE)
+        text = "xab\nno\nAb ab"
+        self.assertEqual(find_lines(pattern, text, 10, 5),
+                         (3, [(11, 13, 5, "xab"), (17, 19, 7, "Ab ab"),
+                              (20, 22, 7, "Ab ab")]))
+        # the matches after the limit are only counted
+        count, hits = find_lines(pattern, text, limit=2)
+        self.assertEqual((count, len(hits)), (3, 2))
+        self.assertEqual(find_lines(re.compile("x*"), "ab"), (0, []))
+
+        # the lines of the pieces are the lines of the whole text
+        text = "ab\n" * 100
+        hits = [hit for piece in chunks(text, 50)
+                for hit in find_lines(pattern, *piece)[1]]
+        self.assertEqual(hits, find_lines(pattern, text)[1])
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_find")
+    def test_find(self):
+        panel = FindPanel()
+        texts = {"a": "x\n" * 100000 + "needle", "b": "needle " * 3}
+        panel.set_documents(lambda: [(k, k, v) for k, v in texts.items()])
+        panel.controls["search-edit"].setText("NEEDLE")
+
+        found = []
+        panel.activated.connect(lambda *args: found.append(args))
+        panel.find()
+        self.assertTrue(panel.is_busy())
+        while panel.is_busy():
+            QApplication.processEvents()
+        results = panel.controls["results"]
+        self.assertEqual(results.count(), 4)
+        self.assertIn("Results found: 4", panel.controls["info"].text())
+        items = sorted(results.item(i).data(Qt.UserRole)
+                       for i in range(results.count()))
+        self.assertEqual(items[0], ("a", 200000, 200006))
+
+        results.itemActivated.emit(results.item(0))
+        self.assertEqual(len(found), 1)
+
+        # the new search cancels the previous one
+        panel.controls["cs-box"].setChecked(True)
+        panel.find()
+        panel.controls["cs-box"].setChecked(False)
+        panel.controls["regex-box"].setChecked(True)
+        panel.controls["search-edit"].setText("needle$")
+        panel.find()
+        while panel.is_busy():
+            QApplication.processEvents()
+        for _ in range(10):
+            QApplication.processEvents()
+        self.assertEqual(results.count(), 1)
+
+        # the count of the matches is not limited by the list
+        texts["b"] = "needle " * 30000
+        panel.controls["regex-box"].setChecked(False)
+        panel.controls["search-edit"].setText("needle")
+        panel.find()
+        while panel.is_busy():
+            QApplication.processEvents()
+        self.assertEqual(results.count(), panel.max_hits)
+        self.assertIn("Results found: 30001", panel.controls["info"].text())
+
+        panel.controls["regex-box"].setChecked(True)
+        panel.controls["search-edit"].setText("(needle")
+        panel.find()
+        self.assertFalse(panel.is_busy())
+        self.assertEqual(results.count(), 0)
+        self.assertTrue(panel.controls["info"].text())
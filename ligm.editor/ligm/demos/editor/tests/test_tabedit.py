@@ -5,11 +5,13 @@
 """Tests for tab of editable file."""
 
 import os
+import tempfile
 import unittest
 from unittest.mock import patch
-from PyQt5.Qt import QMessageBox, QTextEdit, Qt
+from PyQt5.Qt import QMessageBox, QTextEdit, Qt, QApplication
 from ligm.demos.editor.tabedit import TabEdit
 from ligm.demos.editor import Config
+from ligm.core.text import TextEditor
 from ligm.core.qt import (install_translators, get_current_language, QTestHelper,
                      TestableWidget)
 
@@ -235,3 +237,29 @@ class TabEditTest(unittest.TestCase):
             self.fail()
         te = TabEdit(self.w, filepath)
         self.assertEqual(te.is_help_text(), True)
+
+    # -------------------------------------------------------------------------
+    @unittest.skipIf(DEBUG, "test_load_async")
+    def test_load_async(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "test.txt")
+            with open(path, "w", encoding="utf-8", newline="") as file:
+                file.write("line\r\n" * 1000)
+
+            # the large file is loaded in the background
+            with patch.object(TabEdit, "async_size", 1000), \
+                    patch.object(TabEdit, "read_size", 1000), \
+                    patch.object(TextEditor, "load") as load:
+                te = TabEdit(self.w, path, text_format="text")
+                while te.is_busy():
+                    QApplication.processEvents()
+            load.assert_not_called()
+            self.assertEqual(te.plain_text(), "line\n" * 1000)
+            self.assertFalse(te.is_modified())
+
+            te._editor.view.text.insertPlainText("new ")
+            te._editor.save_async()
+            while te.is_busy():
+                QApplication.processEvents()
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(file.read(), "new " + "line\n" * 1000)